@@ -0,0 +1,62 @@
+"""
+Vazão do roteamento em lote (carrinhos por segundo) comparada a um BFS por carrinho.
+
+Uso:
+    python benchmarks/bench_batch.py
+    python benchmarks/bench_batch.py --size 300 --carts 1000 100000
+
+Com NumPy instalado, também mede a frente de onda opcional (use_numpy=True). Ela
+varre o grid uma vez por nível de distância, O(D x N), e costuma ser várias vezes
+mais lenta que a BFS padrão; aparece aqui só para comparação.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.grid_graph import GridGraph
+from src.algorithms.bfs import bfs
+from src.algorithms import batch
+from src.algorithms.batch import batch_route
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--carts", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--bfs-sample", type=int, default=50,
+                        help="Carrinhos usados para estimar a vazão do BFS individual")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    size = args.size
+    rng = random.Random(args.seed)
+    corridors = {(i, j) for i in range(2, size - 3) for j in range(2, size - 2, 3)}
+    grid = GridGraph(size, size, blocked=corridors)
+    cashiers = [(size - 1, j) for j in range(1, size, max(2, size // 5))]
+    free = grid.get_vertices()
+
+    start_time = time.perf_counter()
+    for start in rng.sample(free, args.bfs_sample):
+        bfs(grid, start, cashiers)
+    bfs_rate = args.bfs_sample / (time.perf_counter() - start_time)
+    print(f"Grid {size}x{size}, BFS individual: {bfs_rate:,.0f} carrinhos/s")
+
+    backends = [False] + ([True] if batch.np is not None else [])
+    for use_numpy in backends:
+        name = "NumPy" if use_numpy else "Python"
+        for carts in args.carts:
+            starts = [rng.choice(free) for _ in range(carts)]
+            start_time = time.perf_counter()
+            batch_route(grid, starts, cashiers, use_numpy=use_numpy)
+            elapsed = time.perf_counter() - start_time
+            print(f"  lote ({name:>6}) {carts:>7} carrinhos: {elapsed * 1000:9.1f} ms, "
+                  f"{carts / elapsed:,.0f} carrinhos/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark do BFS com predecessores contra a implementação anterior com cópia de caminhos.
+
+Uso:
+    python benchmarks/bench_bfs.py
+    python benchmarks/bench_bfs.py --sizes 11 100 500 --legacy-max 200
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.market_graph import MarketGraph
+from src.algorithms.bfs import bfs
+
+
+def bfs_path_copy(graph, start, goals):
+    """Implementação anterior do BFS, que enfileira uma cópia do caminho por aresta."""
+    if not isinstance(goals, set):
+        goals = set(goals)
+
+    visited = set()
+    queue = deque([[start]])
+
+    while queue:
+        path = queue.popleft()
+        vertex = path[-1]
+
+        if vertex in goals:
+            return path, vertex
+
+        if vertex not in visited:
+            visited.add(vertex)
+            for neighbor in graph.graph[vertex]:
+                if neighbor not in visited:
+                    queue.append(path + [neighbor])
+
+    return None, None
+
+
+def build_grid(size):
+    """Cria um grid size x size totalmente livre, conectado nas 4 direções."""
+    graph = MarketGraph()
+    for i in range(size):
+        for j in range(size):
+            if i < size - 1:
+                graph.add_edge((i, j), (i + 1, j))
+            if j < size - 1:
+                graph.add_edge((i, j), (i, j + 1))
+    return graph
+
+
+def measure(function, *args, repeat=3):
+    """Retorna o melhor tempo (ms) e o resultado de `repeat` execuções."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = function(*args)
+        best = min(best, (time.perf_counter() - start_time) * 1000)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[11, 100, 500, 1000, 2000])
+    parser.add_argument("--legacy-max", type=int, default=300,
+                        help="Maior grid em que a implementação anterior é executada")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'grid':>11} | {'passos':>6} | {'predecessores (ms)':>18} | {'cópia de caminho (ms)':>21} | {'ganho':>7}")
+    for size in args.sizes:
+        graph = build_grid(size)
+        start = (0, 0)
+        # Objetivo no canto oposto para forçar a busca pelo grid inteiro
+        goals = {(size - 1, size - 1)}
+
+        new_ms, (path, _) = measure(bfs, graph, start, goals, repeat=args.repeat)
+        if size <= args.legacy_max:
+            old_ms, (old_path, _) = measure(bfs_path_copy, graph, start, goals, repeat=args.repeat)
+            assert len(old_path) == len(path)
+            old_text = f"{old_ms:21.2f}"
+            gain = f"{old_ms / new_ms:6.1f}x"
+        else:
+            old_text = f"{'(pulado)':>21}"
+            gain = f"{'-':>7}"
+        print(f"{size:>5}x{size:<5} | {len(path) - 1:>6} | {new_ms:18.2f} | {old_text} | {gain}")
+
+
+if __name__ == "__main__":
+    main()
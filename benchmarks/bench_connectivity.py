@@ -0,0 +1,66 @@
+"""
+Sorteio de obstáculos conectado e índice de conectividade (union-find) contra o sorteio simples.
+
+Uso:
+    python benchmarks/bench_connectivity.py
+    python benchmarks/bench_connectivity.py --sizes 100 500 1000 --density 0.3
+
+Para cada tamanho: tempo do sorteio simples (sample_obstacles) e quantas células
+ele isola dos caixas; tempo do sorteio conectado (modo "repair"); construção do
+ConnectivityIndex e custo médio de reaches_cashier.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.connectivity import ConnectivityIndex
+from src.data.layout import MarketLayout, forbidden_positions, sample_connected_obstacles, sample_obstacles
+
+
+def elapsed_ms(function, *args, **kwargs):
+    """Executa a função e retorna (tempo em ms, resultado)."""
+    start_time = time.perf_counter()
+    result = function(*args, **kwargs)
+    return (time.perf_counter() - start_time) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--density", type=float, default=0.3)
+    parser.add_argument("--queries", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'tamanho':>7} | {'simples (ms)':>12} | {'isoladas':>8} | {'conectado (ms)':>14} | "
+          f"{'isoladas':>8} | {'índice (ms)':>11} | {'consulta (µs)':>13}")
+    for size in args.sizes:
+        layout = MarketLayout(size, size)
+        allowed = size * size - len(forbidden_positions(size, size, layout.cashiers, layout.corridors, layout.start))
+        n_products = int(max(0, allowed - 2) * args.density)
+        sample_args = (size, size, layout.cashiers, layout.corridors, layout.start, n_products, 2)
+
+        plain_ms, (products, _) = elapsed_ms(sample_obstacles, *sample_args, rng=random.Random(args.seed))
+        layout.products = set(products)
+        plain_isolated = len(ConnectivityIndex.from_layout(layout).unreachable_cells())
+
+        connected_ms, (products, _) = elapsed_ms(sample_connected_obstacles, *sample_args,
+                                                 rng=random.Random(args.seed))
+        layout.products = set(products)
+        index_ms, index = elapsed_ms(ConnectivityIndex.from_layout, layout)
+        connected_isolated = len(index.unreachable_cells())
+
+        rng = random.Random(args.seed)
+        cells = [(rng.randrange(size), rng.randrange(size)) for _ in range(args.queries)]
+        query_ms, _ = elapsed_ms(lambda: [index.reaches_cashier(cell) for cell in cells])
+        print(f"{size:>7} | {plain_ms:12.1f} | {plain_isolated:8} | {connected_ms:14.1f} | "
+              f"{connected_isolated:8} | {index_ms:11.1f} | {query_ms * 1000 / args.queries:13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark do replanejamento incremental (D* Lite) contra um BFS novo a cada passo,
+com empilhadeiras andando enquanto o carrinho segue até o caixa.
+
+Uso:
+    python benchmarks/bench_dstar.py
+    python benchmarks/bench_dstar.py --sizes 100 300 --forklifts 2 20 100
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.layout import MarketLayout
+from src.algorithms.bfs import bfs
+from src.algorithms.dstar_lite import DStarLite
+
+
+def step_forklifts(graph, forklifts, cart, cashiers, rng):
+    """Move cada empilhadeira para uma célula vizinha livre aleatória."""
+    for index, (i, j) in enumerate(forklifts):
+        options = [cell for cell in ((i - 1, j), (i, j - 1), (i + 1, j), (i, j + 1))
+                   if cell in graph.graph and cell != cart and cell not in cashiers]
+        if options:
+            new = rng.choice(options)
+            if graph.move_obstacle((i, j), new):
+                forklifts[index] = new
+
+
+def run(size, n_forklifts, seed, replan):
+    """Leva o carrinho do canto superior esquerdo até um caixa; retorna (passos, ms, vértices expandidos)."""
+    rng = random.Random(seed)
+    layout = MarketLayout(size, size, cashiers=[(size - 1, j) for j in range(size // 10, size, size // 5)])
+    graph = layout.build_graph()
+    cart = layout.start
+    forklifts = rng.sample([cell for cell in layout.free_cells() if cell != cart], n_forklifts)
+    for cell in forklifts:
+        graph.block_cell(cell)
+    planner = DStarLite(graph, layout.cashiers, cart)
+    if replan == "dstar":
+        graph.subscribe(planner)
+
+    steps = 0
+    elapsed = 0.0
+    while True:
+        start_time = time.perf_counter()
+        if replan == "dstar":
+            planner.move_to(cart)
+            path, _ = planner.route()
+        else:
+            path, _ = bfs(graph, cart, layout.cashiers)
+        if path is None or len(path) == 1:
+            elapsed += time.perf_counter() - start_time
+            break
+        cart = path[1]
+        steps += 1
+        # Inclui no tempo a atualização do grafo, que notifica o planejador inscrito
+        step_forklifts(graph, forklifts, cart, layout.cashiers, rng)
+        elapsed += time.perf_counter() - start_time
+    return steps, elapsed * 1000, planner.expanded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200])
+    parser.add_argument("--forklifts", type=int, nargs="+", default=[2, 20, 100])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'grid':>11} | {'empilhadeiras':>13} | {'replanejamento':>14} | {'passos':>6} | "
+          f"{'ms/passo':>8} | {'expandidos/passo':>16}")
+    for size in args.sizes:
+        for n_forklifts in args.forklifts:
+            for replan in ("bfs", "dstar"):
+                steps, elapsed, expanded = run(size, n_forklifts, args.seed, replan)
+                per_step = max(steps, 1)
+                expanded_text = f"{expanded / per_step:16.1f}" if replan == "dstar" else f"{'-':>16}"
+                print(f"{size:>5}x{size:<5} | {n_forklifts:>13} | {replan:>14} | {steps:>6} | "
+                      f"{elapsed / per_step:8.3f} | {expanded_text}")
+
+
+if __name__ == "__main__":
+    main()
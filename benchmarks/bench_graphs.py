@@ -0,0 +1,69 @@
+"""
+Compara memória (bytes por célula) e tempo de construção de MarketGraph e GridGraph.
+
+Uso:
+    python benchmarks/bench_graphs.py
+    python benchmarks/bench_graphs.py --sizes 11 100 500
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.market_graph import MarketGraph
+from src.data.grid_graph import GridGraph
+
+
+def build_market_graph(size, blocked):
+    """Constrói o MarketGraph da mesma forma que MarketApp.generate_graph."""
+    graph = MarketGraph()
+    for i in range(size):
+        for j in range(size):
+            vertex = (i, j)
+            if vertex in blocked:
+                continue
+            if i < size - 1 and (i + 1, j) not in blocked:
+                graph.add_edge(vertex, (i + 1, j))
+            if j < size - 1 and (i, j + 1) not in blocked:
+                graph.add_edge(vertex, (i, j + 1))
+    return graph
+
+
+def build_grid_graph(size, blocked):
+    """Constrói o GridGraph equivalente."""
+    return GridGraph(size, size, blocked=blocked)
+
+
+def measure(builder, size, blocked):
+    """Retorna (tempo de construção em ms, bytes alocados) para um construtor."""
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    graph = builder(size, blocked)
+    elapsed = (time.perf_counter() - start_time) * 1000
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graph
+    return elapsed, allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[11, 100, 500, 1000])
+    args = parser.parse_args()
+
+    print(f"{'grid':>11} | {'grafo':>11} | {'construção (ms)':>15} | {'bytes/célula':>12}")
+    for size in args.sizes:
+        # Corredores como no layout padrão: colunas 2, 5, 8, ... nas linhas centrais
+        blocked = {(i, j) for i in range(2, size - 3) for j in range(2, size - 2, 3)}
+        cells = size * size
+        for name, builder in (("MarketGraph", build_market_graph), ("GridGraph", build_grid_graph)):
+            elapsed, allocated = measure(builder, size, blocked)
+            print(f"{size:>5}x{size:<5} | {name:>11} | {elapsed:15.2f} | {allocated / cells:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark do roteamento hierárquico (HPA*) contra o BFS em lojas grandes.
+
+Uso:
+    python benchmarks/bench_hierarchical.py
+    python benchmarks/bench_hierarchical.py --sizes 500 2000 --cluster-size 12 --queries 20
+
+Cenários:
+    mercado  layout gerado pelo MarketLayout.random (muitos carrinhos ficam em
+             bolsões perto dos caixas, então as rotas com caminho são curtas)
+    aberto   chão aberto sem corredores, produtos espalhados e 4 caixas (rotas longas)
+
+Para cada cenário mede a construção das entradas, as consultas com as tabelas dos
+blocos ainda vazias (fria) e já calculadas (quente), o custo de uma mudança de
+célula seguida de nova consulta e quanto o caminho fica maior que o do BFS.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.layout import MarketLayout
+from src.algorithms.bfs import bfs
+from src.algorithms.hierarchical import HierarchicalRouter
+
+
+def open_layout(size, density, rng):
+    """Cria um mercado de chão aberto, com 4 caixas na última linha e produtos aleatórios."""
+    cashiers = [(size - 1, j) for j in range(size // 8, size, size // 4)]
+    layout = MarketLayout(size, size, cashiers=cashiers, corridors=[])
+    free = layout.free_cells()
+    layout.products = set(rng.sample(free, int(density * len(free))))
+    return layout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--density", type=float, default=0.05)
+    parser.add_argument("--cluster-size", type=int, default=12)
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'grid':>11} | {'cenário':>8} | {'montagem ms':>11} | {'BFS ms':>8} | {'HPA fria ms':>11} | "
+          f"{'HPA quente ms':>13} | {'mudança ms':>10} | {'excesso':>7}")
+    for size in args.sizes:
+        for scenario in ("mercado", "aberto"):
+            rng = random.Random(f"{args.seed}:{size}:{scenario}")
+            if scenario == "mercado":
+                layout = MarketLayout.random(size, size, density=args.density, rng=rng)
+            else:
+                layout = open_layout(size, args.density, rng)
+            graph = layout.build_grid_graph()
+            free = layout.free_cells()
+
+            # Só consultas com caminho: carrinhos presos em bolsões não dizem nada sobre a hierarquia
+            starts, bfs_steps = [], []
+            bfs_time = 0.0
+            while len(starts) < args.queries:
+                start = rng.choice(free)
+                start_time = time.perf_counter()
+                path, _ = bfs(graph, start, layout.cashiers)
+                elapsed = time.perf_counter() - start_time
+                if path is not None and len(path) > 1:
+                    starts.append(start)
+                    bfs_steps.append(len(path) - 1)
+                    bfs_time += elapsed
+
+            start_time = time.perf_counter()
+            router = HierarchicalRouter.from_graph(graph, args.cluster_size)
+            build_time = time.perf_counter() - start_time
+
+            timings = []
+            for _ in range(2):
+                start_time = time.perf_counter()
+                hpa_steps = [len(router.route(start, layout.cashiers)[0]) - 1 for start in starts]
+                timings.append(time.perf_counter() - start_time)
+
+            # Uma célula livre de cada rota é bloqueada e liberada de novo
+            start_time = time.perf_counter()
+            for start in starts:
+                path, _ = router.route(start, layout.cashiers)
+                cell = path[len(path) // 2]
+                router.block(cell)
+                router.route(start, layout.cashiers)
+                router.unblock(cell)
+            change_time = time.perf_counter() - start_time
+
+            excess = sum(hpa_steps) / sum(bfs_steps) - 1
+            n = len(starts)
+            print(f"{size:>5}x{size:<5} | {scenario:>8} | {build_time * 1000:11.1f} | "
+                  f"{bfs_time * 1000 / n:8.2f} | {timings[0] * 1000 / n:11.2f} | {timings[1] * 1000 / n:13.2f} | "
+                  f"{change_time * 1000 / n:10.2f} | {excess:7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark de Jump Point Search contra o BFS: nós expandidos e tempo por consulta.
+
+Uso:
+    python benchmarks/bench_jps.py
+    python benchmarks/bench_jps.py --sizes 500 2000 --density 0.05 --queries 3
+
+Cenários:
+    mercado  layout gerado pelo MarketLayout.random (corredores a cada 3 colunas e
+             caixas em todas as colunas ímpares da última linha)
+    aberto   chão aberto sem corredores, produtos espalhados e 4 caixas
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.layout import MarketLayout
+from src.algorithms.bfs import bfs
+from src.algorithms.jps import jps_search
+
+
+class CountingGraph:
+    """Envolve um grafo e conta as expansões (chamadas a get_neighbors) do BFS."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.expanded = 0
+
+    def get_neighbors(self, vertex):
+        self.expanded += 1
+        return self.graph.get_neighbors(vertex)
+
+
+def open_layout(size, density, rng):
+    """Cria um mercado de chão aberto, com 4 caixas na última linha e produtos aleatórios."""
+    cashiers = [(size - 1, j) for j in range(size // 8, size, size // 4)]
+    layout = MarketLayout(size, size, cashiers=cashiers, corridors=[])
+    free = layout.free_cells()
+    layout.products = set(rng.sample(free, int(density * len(free))))
+    return layout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000])
+    parser.add_argument("--density", type=float, default=0.05)
+    parser.add_argument("--queries", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'grid':>11} | {'cenário':>8} | {'algoritmo':>9} | {'expandidos/consulta':>19} | "
+          f"{'ms/consulta':>11} | {'passos':>8}")
+    for size in args.sizes:
+        for scenario in ("mercado", "aberto"):
+            rng = random.Random(f"{args.seed}:{size}:{scenario}")
+            if scenario == "mercado":
+                layout = MarketLayout.random(size, size, density=args.density, rng=rng)
+            else:
+                layout = open_layout(size, args.density, rng)
+            graph = layout.build_grid_graph()
+            starts = [rng.choice(layout.free_cells()) for _ in range(args.queries)]
+
+            counting = CountingGraph(graph)
+            start_time = time.perf_counter()
+            bfs_steps = [len(bfs(counting, start, layout.cashiers)[0] or ()) - 1 for start in starts]
+            bfs_time = time.perf_counter() - start_time
+
+            jps_expanded = 0
+            jps_steps = []
+            start_time = time.perf_counter()
+            for start in starts:
+                path, _, expanded = jps_search(graph, start, layout.cashiers)
+                jps_expanded += expanded
+                jps_steps.append(len(path or ()) - 1)
+            jps_time = time.perf_counter() - start_time
+
+            if bfs_steps != jps_steps:
+                raise SystemExit(f"Passos diferentes em {size}x{size} ({scenario}): BFS {bfs_steps}, JPS {jps_steps}")
+            for name, expanded, elapsed in (("BFS", counting.expanded, bfs_time), ("JPS", jps_expanded, jps_time)):
+                print(f"{size:>5}x{size:<5} | {scenario:>8} | {name:>9} | {expanded / len(starts):19.0f} | "
+                      f"{elapsed * 1000 / len(starts):11.2f} | {sum(steps for steps in bfs_steps if steps > 0):>8}")
+
+if __name__ == "__main__":
+    main()
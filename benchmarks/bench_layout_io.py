@@ -0,0 +1,52 @@
+"""
+Tempo de gravação e carga de layouts nos formatos ASCII, CSV e binário (mmap).
+
+Uso:
+    python benchmarks/bench_layout_io.py
+    python benchmarks/bench_layout_io.py --sizes 300x400 2000x2000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.layout import MarketLayout
+from src.data.layout_io import CellLayout, load_layout, save_layout
+
+
+def elapsed_ms(function, *args):
+    """Executa a função e retorna (tempo em ms, resultado)."""
+    start_time = time.perf_counter()
+    result = function(*args)
+    return (time.perf_counter() - start_time) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["300x400", "1000x1000"])
+    args = parser.parse_args()
+
+    print(f"{'layout':>11} | {'formato':>7} | {'arquivo (KiB)':>13} | {'gravar (ms)':>11} | "
+          f"{'carregar (ms)':>13} | {'GridGraph (ms)':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            rows, cols = (int(value) for value in size.split("x"))
+            layout = CellLayout.from_market_layout(
+                MarketLayout.random(rows, cols, density=0.1, rng=random.Random(0)))
+            for extension in ("txt", "csv", "sqm"):
+                path = os.path.join(directory, f"loja.{extension}")
+                save_ms, _ = elapsed_ms(save_layout, layout, path)
+                load_ms, loaded = elapsed_ms(load_layout, path)
+                graph_ms, _ = elapsed_ms(loaded.to_grid_graph)
+                kib = os.path.getsize(path) / 1024
+                print(f"{size:>11} | {extension:>7} | {kib:13.1f} | {save_ms:11.2f} | "
+                      f"{load_ms:13.2f} | {graph_ms:14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Tempo de quadro do renderizador retido comparado ao redesenho completo anterior.
+
+Requer um display (o tkinter precisa abrir uma janela).
+
+Uso:
+    python benchmarks/bench_render.py
+    python benchmarks/bench_render.py --sizes 11 100 500 --frames 20
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tkinter as tk
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.layout import MarketLayout
+from src.utils.renderer import GridRenderer
+
+
+def legacy_draw(canvas, layout, cart, cell_size):
+    """Redesenho anterior: apaga tudo e recria um retângulo (e texto) por célula."""
+    canvas.delete("all")
+    styles = GridRenderer.STYLES
+    for i in range(layout.rows):
+        for j in range(layout.cols):
+            kind = kind_of(layout, cart, (i, j))
+            fill, outline, width, text = styles[kind]
+            x1, y1 = j * cell_size + 10, i * cell_size + 10
+            canvas.create_rectangle(x1, y1, x1 + cell_size, y1 + cell_size, fill=fill, outline=outline, width=width)
+            if text:
+                canvas.create_text(x1 + cell_size / 2, y1 + cell_size / 2, text=text, font=("Arial", 20))
+
+
+def kind_of(layout, cart, cell):
+    """Tipo de célula no mesmo critério do MarketApp."""
+    if cell == cart:
+        return "cart"
+    if cell in layout.cashiers:
+        return "cashier"
+    if cell in layout.products:
+        return "product"
+    if cell in layout.forklifts:
+        return "forklift"
+    if cell in layout.corridors:
+        return "corridor"
+    return "floor"
+
+
+def frame_ms(root, draw):
+    """Executa um quadro e espera o Tk processar o desenho."""
+    start_time = time.perf_counter()
+    draw()
+    root.update_idletasks()
+    return (time.perf_counter() - start_time) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[11, 100, 500])
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--cell-size", type=int, default=40)
+    parser.add_argument("--view", type=int, default=600, help="Tamanho do viewport em pixels")
+    parser.add_argument("--legacy-max", type=int, default=100,
+                        help="Maior grid em que o redesenho completo é medido")
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    rng = random.Random(0)
+    print(f"{'grid':>11} | {'1º quadro (ms)':>14} | {'carrinho (ms)':>13} | {'pan (ms)':>9} | {'completo (ms)':>13}")
+    for size in args.sizes:
+        layout = MarketLayout.random(size, size, density=0.1, rng=rng)
+        view = min(size * args.cell_size, args.view)
+        canvas = tk.Canvas(root, width=view + 20, height=view + 20)
+        canvas.pack()
+        cart = [layout.start]
+        renderer = GridRenderer(canvas, size, size, args.cell_size, view_width=view, view_height=view)
+
+        first = frame_ms(root, lambda: renderer.render(lambda cell: kind_of(layout, cart[0], cell)))
+        free = layout.free_cells()
+        moves = []
+        for _ in range(args.frames):
+            previous, cart[0] = cart[0], rng.choice(free)
+            moves.append(frame_ms(root, lambda: renderer.update_cells((previous, cart[0]))))
+        pans = [frame_ms(root, lambda: renderer.pan(1, 1)) for _ in range(args.frames)]
+
+        if size <= args.legacy_max:
+            legacy = [frame_ms(root, lambda: legacy_draw(canvas, layout, cart[0], args.cell_size))
+                      for _ in range(max(1, args.frames // 4))]
+            legacy_text = f"{sum(legacy) / len(legacy):13.2f}"
+        else:
+            legacy_text = f"{'(pulado)':>13}"
+        print(f"{size:>5}x{size:<5} | {first:14.2f} | {sum(moves) / len(moves):13.3f} | "
+              f"{sum(pans) / len(pans):9.2f} | {legacy_text}")
+        canvas.destroy()
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Gerador de carga do serviço de rotas: latência p50/p99 e consultas por segundo.
+
+Uso:
+    python benchmarks/bench_service.py
+    python benchmarks/bench_service.py --size 300 --connections 20 --requests 20000 --starts 500
+    python benchmarks/bench_service.py --host 127.0.0.1 --port 8765   (servidor já em execução)
+
+Sem --port, sobe o servidor (python -m src.service.server) em outro processo com um
+mercado gerado do tamanho pedido. Cada conexão mantém até --pipeline consultas em
+andamento; os inícios são sorteados entre --starts células livres, de modo que um
+conjunto pequeno exercita o agrupamento de consultas idênticas. Com --update-every,
+uma a cada N consultas é uma atualização do layout (bloqueia e libera uma célula).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from src.data.layout import MarketLayout
+from src.utils.instrumentation import percentile
+
+
+def start_server(size, window_ms):
+    """Sobe o servidor em outro processo, numa porta livre, e retorna (processo, porta)."""
+    process = subprocess.Popen([sys.executable, "-m", "src.service.server", "--size", str(size), "--port", "0",
+                                "--window-ms", str(window_ms)], cwd=ROOT, stderr=subprocess.PIPE, text=True)
+    line = process.stderr.readline()
+    if not line:
+        raise SystemExit("O servidor não iniciou.")
+    return process, int(line.split(":")[-1].split()[0])
+
+
+async def run_connection(host, port, requests, pipeline, latencies):
+    """Envia as requisições de uma conexão, com até `pipeline` em andamento, e mede cada uma."""
+    reader, writer = await asyncio.open_connection(host, port)
+    slots = asyncio.Semaphore(pipeline)
+    sent = {}
+    errors = 0
+
+    async def receive():
+        nonlocal errors
+        for _ in range(len(requests)):
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent.pop(response["id"]))
+            errors += "error" in response
+            slots.release()
+
+    receiver = asyncio.ensure_future(receive())
+    for request in requests:
+        await slots.acquire()
+        sent[request["id"]] = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+    await receiver
+    writer.close()
+    return errors
+
+
+async def stats(host, port):
+    """Consulta os contadores do servidor."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"id": 0, "op": "stats"}\n')
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    writer.close()
+    return response
+
+
+async def run_load(args, host, port):
+    rng = random.Random(args.seed)
+    layout = MarketLayout(args.size, args.size)
+    starts = rng.sample(layout.free_cells(), min(args.starts, len(layout.free_cells())))
+    per_connection = args.requests // args.connections
+    plans = []
+    request_id = 1
+    for _ in range(args.connections):
+        plan = []
+        for _ in range(per_connection):
+            if args.update_every and request_id % args.update_every == 0:
+                cell = list(rng.choice(starts))
+                plan.append({"id": request_id, "op": "update", "block": [cell]})
+                request_id += 1
+                plan.append({"id": request_id, "op": "update", "unblock": [cell]})
+            else:
+                plan.append({"id": request_id, "op": "route", "start": list(rng.choice(starts))})
+            request_id += 1
+        plans.append(plan)
+
+    latencies = []
+    start_time = time.perf_counter()
+    errors = await asyncio.gather(*(run_connection(host, port, plan, args.pipeline, latencies) for plan in plans))
+    elapsed = time.perf_counter() - start_time
+    return latencies, sum(errors), elapsed, await stats(host, port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="Servidor já em execução (padrão: sobe um)")
+    parser.add_argument("--size", type=int, default=200, help="Lado do mercado (deve ser o mesmo do servidor)")
+    parser.add_argument("--window-ms", type=float, default=1.0, help="Janela do servidor que é iniciado")
+    parser.add_argument("--connections", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--pipeline", type=int, default=8, help="Consultas em andamento por conexão")
+    parser.add_argument("--starts", type=int, default=200, help="Células distintas de início")
+    parser.add_argument("--update-every", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    process = None
+    port = args.port
+    if port is None:
+        process, port = start_server(args.size, args.window_ms)
+    try:
+        latencies, errors, elapsed, server_stats = asyncio.run(run_load(args, args.host, port))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    latencies_ms = [latency * 1000 for latency in latencies]
+    print(f"requisições: {len(latencies)} em {elapsed:.2f} s ({len(latencies) / elapsed:.0f} por segundo), "
+          f"erros: {errors}")
+    print(f"latência ms: p50 {percentile(latencies_ms, 0.5):.2f}, p99 {percentile(latencies_ms, 0.99):.2f}, "
+          f"máx {max(latencies_ms, default=0):.2f}")
+    print("servidor: " + ", ".join(f"{name} {server_stats.get(name, 0)}"
+                                   for name in ("queries", "coalesced", "batches", "computations", "updates")))
+
+
+if __name__ == "__main__":
+    main()
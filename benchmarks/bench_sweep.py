@@ -0,0 +1,55 @@
+"""
+Benchmark da varredura Monte Carlo: escalabilidade com o número de processos e
+tamanho da planta enviada a cada processo (buffer binário contra MarketGraph serializado).
+
+Uso:
+    python benchmarks/bench_sweep.py
+    python benchmarks/bench_sweep.py --size 50 --layouts 4000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.layout import MarketLayout
+from src.data.layout_io import CellLayout
+from src.simulation.sweep import run_sweep
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=30)
+    parser.add_argument("--layouts", type=int, default=2000)
+    parser.add_argument("--carts", type=int, default=20)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    layout = MarketLayout(args.size, args.size)
+    buffer = CellLayout.from_market_layout(layout).to_bytes()
+    pickled = pickle.dumps(layout.build_graph().graph)
+    print(f"Planta {args.size}x{args.size}: {len(buffer)} bytes em binário, "
+          f"{len(pickled)} bytes como MarketGraph serializado")
+    print(f"CPUs disponíveis: {os.cpu_count()}")
+
+    print(f"{'processos':>9} | {'tempo (s)':>9} | {'layouts/s':>10} | {'aceleração':>10}")
+    baseline = None
+    reference = None
+    for workers in args.workers:
+        start_time = time.perf_counter()
+        stats = run_sweep(layout, args.layouts, carts_per_layout=args.carts, workers=workers)
+        elapsed = time.perf_counter() - start_time
+        if reference is None:
+            reference = stats.as_dict()
+        elif stats.as_dict() != reference:
+            raise SystemExit(f"Resultado diferente com {workers} processos")
+        baseline = baseline or elapsed
+        print(f"{workers:>9} | {elapsed:9.2f} | {args.layouts / elapsed:10.0f} | {baseline / elapsed:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark de Dijkstra e A* (com espera nos caixas) contra o BFS em grids grandes.
+
+Uso:
+    python benchmarks/bench_weighted.py
+    python benchmarks/bench_weighted.py --sizes 100 500 --queries 20
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.market_graph import MarketGraph
+from src.algorithms.bfs import bfs
+from src.algorithms.weighted import dijkstra, astar
+
+
+def build_market(size):
+    """Cria um mercado size x size com corredores e caixas na última linha."""
+    corridors = {(i, j) for i in range(2, size - 3) for j in range(2, size - 2, 3)}
+    cashiers = [(size - 1, j) for j in range(1, size, max(2, size // 5))]
+    return MarketGraph.from_grid(size, size, corridors), cashiers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--queries", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'grid':>11} | {'algoritmo':>18} | {'ms/consulta':>11} | {'consultas/s':>11}")
+    for size in args.sizes:
+        graph, cashiers = build_market(size)
+        vertices = graph.get_vertices()
+        starts = [rng.choice(vertices) for _ in range(args.queries)]
+        waits = {cashier: rng.randrange(size) for cashier in cashiers}
+        engines = (
+            ("BFS", lambda s: bfs(graph, s, cashiers)),
+            ("Dijkstra", lambda s: dijkstra(graph, s, cashiers)),
+            ("A*", lambda s: astar(graph, s, cashiers)),
+            ("Dijkstra + filas", lambda s: dijkstra(graph, s, cashiers, wait_times=waits)),
+            ("A* + filas", lambda s: astar(graph, s, cashiers, wait_times=waits)),
+        )
+        for name, engine in engines:
+            start_time = time.perf_counter()
+            for start in starts:
+                engine(start)
+            elapsed = time.perf_counter() - start_time
+            per_query = elapsed * 1000 / len(starts)
+            print(f"{size:>5}x{size:<5} | {name:>18} | {per_query:11.2f} | {len(starts) / elapsed:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+from array import array
+
+from src.utils import instrumentation
+
+try:  # NumPy é opcional e só é usado quando pedido (use_numpy=True); o padrão é a BFS sobre arrays planos
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+
+# Ordem de preferência dos vizinhos: cima, esquerda, baixo, direita (igual ao MarketGraph)
+_OFFSETS = ((-1, 0), (0, -1), (1, 0), (0, 1))
+
+
+class BatchRoutes:
+    """Resultado de batch_route para um conjunto de carrinhos.
+
+    Attributes:
+        steps: Passos até o caixa mais próximo de cada carrinho (-1 = inalcançável)
+        target_index: Índice em `cashiers` do caixa escolhido (-1 = inalcançável)
+        next_cell: Id da célula do próximo movimento (-1 = já no caixa ou inalcançável)
+        cashiers: Lista de caixas usada na consulta
+        cols: Número de colunas do grid, para converter ids em (i, j)
+    """
+
+    __slots__ = ("steps", "target_index", "next_cell", "cashiers", "cols")
+
+    def __init__(self, steps, target_index, next_cell, cashiers, cols):
+        self.steps = steps
+        self.target_index = target_index
+        self.next_cell = next_cell
+        self.cashiers = cashiers
+        self.cols = cols
+
+    def __len__(self):
+        return len(self.steps)
+
+    def target(self, k):
+        """Retorna o caixa escolhido para o carrinho k, ou None se inalcançável."""
+        index = int(self.target_index[k])
+        return self.cashiers[index] if index >= 0 else None
+
+    def next_move(self, k):
+        """Retorna a próxima célula (i, j) do carrinho k, ou None se não houver movimento."""
+        cell_id = int(self.next_cell[k])
+        return divmod(cell_id, self.cols) if cell_id >= 0 else None
+
+
+def occupancy_grid(graph, grid_size=None):
+    """
+    Extrai o grid de ocupação (1 = livre, 0 = bloqueada) de um grafo.
+
+    Args:
+        graph: GridGraph, ou MarketGraph cujas arestas ligam células vizinhas do grid
+        grid_size: (linhas, colunas); se omitido, usa graph.grid_size ou o maior vértice
+
+    Returns:
+        tuple: (linhas, colunas, bytearray de ocupação)
+    """
+    cells = getattr(graph, "cells", None)
+    if cells is not None:
+        if graph.connectivity != 4:
+            raise ValueError("Apenas grids 4-conectados são suportados.")
+        return graph.rows, graph.cols, bytearray(cells)
+
+    if grid_size is None:
+        grid_size = getattr(graph, "grid_size", None)
+    vertices = graph.get_vertices()
+    if grid_size is None:
+        if not vertices:
+            raise ValueError("Não é possível inferir o tamanho do grid de um grafo vazio.")
+        grid_size = (max(i for i, _ in vertices) + 1, max(j for _, j in vertices) + 1)
+    rows, cols = grid_size
+    cells = bytearray(rows * cols)
+    for i, j in vertices:
+        cells[i * cols + j] = 1
+    return rows, cols, cells
+
+
+def _field_python(rows, cols, cells, sources):
+    """Campo de distâncias por BFS multi-origem sobre arrays planos."""
+    size = rows * cols
+    dist = array("i", [-1]) * size
+    owner = array("i", [-1]) * size
+    parent = array("i", [-1]) * size
+    queue = []
+    for index, cell in enumerate(sources):
+        if cells[cell] and dist[cell] < 0:
+            dist[cell] = 0
+            owner[cell] = index
+            queue.append(cell)
+
+    # A lista cresce enquanto é percorrida, funcionando como fila FIFO sem deque
+    for cell in queue:
+        next_distance = dist[cell] + 1
+        cashier = owner[cell]
+        j = cell % cols
+        for neighbor, valid in ((cell - cols, cell >= cols), (cell - 1, j > 0),
+                                (cell + cols, cell + cols < size), (cell + 1, j < cols - 1)):
+            if valid and cells[neighbor] and dist[neighbor] < 0:
+                dist[neighbor] = next_distance
+                owner[neighbor] = cashier
+                parent[neighbor] = cell
+                queue.append(neighbor)
+    return dist, owner, parent
+
+
+def _slices(delta):
+    """Fatias (destino, origem) de um eixo para um deslocamento de -1, 0 ou 1."""
+    if delta < 0:
+        return slice(1, None), slice(None, -1)
+    if delta > 0:
+        return slice(None, -1), slice(1, None)
+    return slice(None), slice(None)
+
+
+def _field_numpy(rows, cols, cells, sources):
+    """
+    Campo de distâncias por frente de onda vetorizada com NumPy.
+
+    Cada nível da frente varre o grid inteiro, então o custo é O(D x linhas x colunas),
+    com D a maior distância: em layouts com corredores longos fica bem mais lento
+    que a BFS O(linhas x colunas) de _field_python, por isso só é usado sob pedido.
+    """
+    free = np.frombuffer(bytes(cells), dtype=np.uint8).reshape(rows, cols).astype(bool)
+    dist = np.full((rows, cols), -1, dtype=np.int32)
+    owner = np.full((rows, cols), -1, dtype=np.int32)
+    parent = np.full((rows, cols), -1, dtype=np.int64)
+    ids = np.arange(rows * cols, dtype=np.int64).reshape(rows, cols)
+
+    for index, cell in enumerate(sources):
+        i, j = divmod(cell, cols)
+        if free[i, j] and dist[i, j] < 0:
+            dist[i, j] = 0
+            owner[i, j] = index
+
+    frontier = dist == 0
+    distance = 0
+    while frontier.any():
+        distance += 1
+        reached = np.zeros_like(frontier)
+        # A célula t é alcançada a partir de s = t + deslocamento, que vira seu próximo passo
+        for di, dj in _OFFSETS:
+            target_i, source_i = _slices(di)
+            target_j, source_j = _slices(dj)
+            candidates = (frontier[source_i, source_j] & free[target_i, target_j]
+                          & (dist[target_i, target_j] < 0) & ~reached[target_i, target_j])
+            reached[target_i, target_j] |= candidates
+            owner[target_i, target_j][candidates] = owner[source_i, source_j][candidates]
+            parent[target_i, target_j][candidates] = ids[source_i, source_j][candidates]
+        dist[reached] = distance
+        frontier = reached
+    return dist.ravel(), owner.ravel(), parent.ravel()
+
+
+def distance_field(graph, cashiers, grid_size=None, use_numpy=False):
+    """
+    Calcula, para todas as células, a distância, o caixa mais próximo e o próximo passo.
+
+    Args:
+        graph: GridGraph ou MarketGraph em grid
+        cashiers: Lista de caixas (i, j)
+        grid_size: (linhas, colunas), se não puder ser obtido do grafo
+        use_numpy: Usa a frente de onda do NumPy (O(D x N), mais lenta que a BFS padrão)
+
+    Returns:
+        tuple: (linhas, colunas, distâncias, índices dos caixas, próximos passos),
+        com os três últimos indexados pelo id da célula
+    """
+    if use_numpy and np is None:
+        raise ImportError("NumPy não está instalado.")
+    rows, cols, cells = occupancy_grid(graph, grid_size)
+    sources = []
+    for i, j in cashiers:
+        if not (0 <= i < rows and 0 <= j < cols):
+            raise ValueError(f"Caixa {(i, j)} fora do grid {rows}x{cols}.")
+        sources.append(i * cols + j)
+    field = _field_numpy if use_numpy else _field_python
+    with instrumentation.ACTIVE.phase("distance_field"):
+        return (rows, cols) + field(rows, cols, cells, sources)
+
+
+def batch_route(graph, starts, cashiers, grid_size=None, use_numpy=False):
+    """
+    Calcula de uma só vez as rotas de vários carrinhos até o caixa mais próximo.
+
+    O campo de distâncias é calculado uma única vez para o layout; cada carrinho é
+    respondido por indexação no campo, sem busca por carrinho.
+
+    Args:
+        graph: GridGraph ou MarketGraph em grid
+        starts: Sequência de células (i, j) dos carrinhos, ou array NumPy N x 2
+        cashiers: Lista de caixas (i, j)
+        grid_size: (linhas, colunas), se não puder ser obtido do grafo
+        use_numpy: Usa a frente de onda do NumPy (O(D x N), mais lenta que a BFS padrão)
+
+    Returns:
+        BatchRoutes: Passos, caixa alvo e próximo movimento de cada carrinho
+    """
+    cashiers = list(cashiers)
+    rows, cols, dist, owner, parent = distance_field(graph, cashiers, grid_size, use_numpy)
+
+    if use_numpy:
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1, 2)
+        inside = (starts[:, 0] >= 0) & (starts[:, 0] < rows) & (starts[:, 1] >= 0) & (starts[:, 1] < cols)
+        ids = np.where(inside, starts[:, 0] * cols + starts[:, 1], 0)
+        steps = np.where(inside, dist[ids], -1)
+        target_index = np.where(inside, owner[ids], -1)
+        next_cell = np.where(inside, parent[ids], -1)
+        return BatchRoutes(steps, target_index, next_cell, cashiers, cols)
+
+    ids = [i * cols + j if 0 <= i < rows and 0 <= j < cols else -1 for i, j in starts]
+    steps = array("i", [dist[cell] if cell >= 0 else -1 for cell in ids])
+    target_index = array("i", [owner[cell] if cell >= 0 else -1 for cell in ids])
+    next_cell = array("i", [parent[cell] if cell >= 0 else -1 for cell in ids])
+    return BatchRoutes(steps, target_index, next_cell, cashiers, cols)
@@ -1,34 +1,143 @@
 from collections import deque
 
+from src.utils import instrumentation
+
+
+def _search(graph, start, goals, limit=None):
+    """
+    Núcleo da Busca em Largura com um único predecessor por vértice.
+
+    Cada vértice é marcado como visitado no momento em que entra na fila, de modo
+    que nunca é enfileirado mais de uma vez, e nenhum caminho é copiado durante a
+    busca: apenas o predecessor e a distância de cada vértice são guardados.
+
+    Args:
+        graph: Instância de MarketGraph (ou qualquer grafo com get_neighbors)
+        start: Vértice inicial
+        goals: Conjunto de vértices de destino
+        limit: Número de objetivos após o qual a busca é interrompida (None = todos)
+
+    Returns:
+        tuple: (predecessores, distâncias, objetivos encontrados em ordem de distância)
+    """
+    parents = {start: None}
+    distances = {start: 0}
+    found = []
+
+    if start in goals:
+        found.append(start)
+        if limit is not None and len(found) >= limit:
+            return parents, distances, found
+
+    remaining = len(goals) - len(found)
+    if remaining == 0:
+        return parents, distances, found
+
+    get_neighbors = graph.get_neighbors
+    queue = deque([start])
+    probe = instrumentation.ACTIVE
+    if probe.enabled:
+        probe.count("bfs.searches")
+        get_neighbors = probe.counting_neighbors("bfs", get_neighbors, queue.__len__)
+
+    while queue:
+        vertex = queue.popleft()
+        next_distance = distances[vertex] + 1
+        for neighbor in get_neighbors(vertex):
+            if neighbor in parents:
+                continue
+            parents[neighbor] = vertex
+            distances[neighbor] = next_distance
+            if neighbor in goals:
+                found.append(neighbor)
+                remaining -= 1
+                if remaining == 0 or (limit is not None and len(found) >= limit):
+                    return parents, distances, found
+            queue.append(neighbor)
+
+    return parents, distances, found
+
+
+def reconstruct_path(parents, goal):
+    """
+    Reconstrói o caminho de start até goal a partir do mapa de predecessores.
+
+    Args:
+        parents: Dicionário vértice -> predecessor (None para o vértice inicial)
+        goal: Vértice final do caminho
+
+    Returns:
+        list: Caminho do vértice inicial até goal
+    """
+    path = []
+    vertex = goal
+    while vertex is not None:
+        path.append(vertex)
+        vertex = parents[vertex]
+    path.reverse()
+    return path
+
+
 def bfs(graph, start, goals):
     """
     Executa a Busca em Largura para encontrar o caminho mais curto de start até um dos goals.
-    
+
     Args:
         graph: Instância de MarketGraph
         start: Vértice inicial
         goals: Lista ou conjunto de vértices de destino
-        
+
     Returns:
         tuple: (caminho, vértice de destino) ou (None, None) se não encontrar caminho
     """
     if not isinstance(goals, set):
         goals = set(goals)
-        
-    visited = set()
-    queue = deque([[start]])
-    
-    while queue:
-        path = queue.popleft()
-        vertex = path[-1]
-        
-        if vertex in goals:
-            return path, vertex
-            
-        if vertex not in visited:
-            visited.add(vertex)
-            for neighbor in graph.graph[vertex]:
-                if neighbor not in visited:
-                    queue.append(path + [neighbor])
-                    
-    return None, None
\ No newline at end of file
+
+    parents, _, found = _search(graph, start, goals, limit=1)
+    if not found:
+        return None, None
+
+    goal = found[0]
+    return reconstruct_path(parents, goal), goal
+
+
+def bfs_nearest_goals(graph, start, goals, limit=None):
+    """
+    Encontra os caminhos até os `limit` objetivos mais próximos, parando assim que
+    esse número de objetivos é alcançado.
+
+    Args:
+        graph: Instância de MarketGraph
+        start: Vértice inicial
+        goals: Lista ou conjunto de vértices de destino
+        limit: Quantidade máxima de objetivos (None = todos os alcançáveis)
+
+    Returns:
+        list: Lista de tuplas (caminho, vértice de destino) em ordem de distância
+    """
+    if not isinstance(goals, set):
+        goals = set(goals)
+
+    parents, _, found = _search(graph, start, goals, limit=limit)
+    return [(reconstruct_path(parents, goal), goal) for goal in found]
+
+
+def bfs_distances(graph, start, goals):
+    """
+    Calcula a distância (em passos) de start até cada objetivo alcançável.
+
+    A busca termina assim que todos os objetivos forem encontrados.
+
+    Args:
+        graph: Instância de MarketGraph
+        start: Vértice inicial
+        goals: Lista ou conjunto de vértices de destino
+
+    Returns:
+        dict: Objetivo -> número de passos; objetivos inalcançáveis são omitidos
+    """
+    if not isinstance(goals, set):
+        goals = set(goals)
+
+    _, distances, found = _search(graph, start, goals)
+    return {goal: distances[goal] for goal in found}
@@ -0,0 +1,203 @@
+import heapq
+from itertools import count
+
+INF = float("inf")
+
+
+class DStarLite:
+    """Replanejamento incremental (D* Lite) do carrinho até o caixa mais próximo.
+
+    A busca é feita de trás para frente, com todos os caixas como objetivo, e guarda
+    seu estado (valores g/rhs e a fila de prioridade) entre as consultas. Quando o
+    carrinho anda, só a constante `km` é ajustada; quando algumas células são
+    bloqueadas ou liberadas (ex.: uma empilhadeira se movendo), apenas os vértices
+    afetados são reavaliados e a busca continua de onde parou, em vez de recomeçar.
+
+    Recebe as mudanças como ouvinte do MarketGraph (`graph.subscribe(planner)`). Se o
+    grafo mudar sem avisar (versão diferente), o estado é recalculado do zero.
+    """
+
+    def __init__(self, graph, cashiers, start):
+        """
+        Inicializa o planejador.
+
+        Args:
+            graph: Instância de MarketGraph (ou grafo com get_neighbors e version)
+            cashiers: Lista de vértices dos caixas
+            start: Posição atual do carrinho
+        """
+        self.graph = graph
+        self.cashiers = list(cashiers)
+        self.start = start
+        self.expanded = 0  # Total de vértices expandidos, útil para medir o reaproveitamento
+        self.rebuild()
+
+    def rebuild(self):
+        """Descarta o estado da busca e recomeça a partir dos caixas."""
+        self.g = {}
+        self.rhs = {}
+        self.km = 0
+        self._last = self.start
+        self._open = []
+        self._open_key = {}
+        self._counter = count()
+        self._goals = set(self.cashiers)
+        for cashier in self._goals:
+            if cashier in self.graph.graph:
+                self.rhs[cashier] = 0
+                self._push(cashier)
+        self._version = getattr(self.graph, "version", None)
+        self._path = None  # Último caminho calculado, reaproveitado enquanto nada mudar
+        self._position = {}  # Vértice -> índice no último caminho
+
+    def _heuristic(self, vertex):
+        """Distância de Manhattan entre o carrinho e o vértice."""
+        return abs(vertex[0] - self.start[0]) + abs(vertex[1] - self.start[1])
+
+    def _key(self, vertex):
+        best = min(self.g.get(vertex, INF), self.rhs.get(vertex, INF))
+        return best + self._heuristic(vertex) + self.km, best
+
+    def _push(self, vertex):
+        key = self._key(vertex)
+        self._open_key[vertex] = key
+        heapq.heappush(self._open, (key, next(self._counter), vertex))
+
+    def _top_key(self):
+        """Chave do topo da fila, descartando entradas obsoletas."""
+        open_list = self._open
+        while open_list and self._open_key.get(open_list[0][2]) != open_list[0][0]:
+            heapq.heappop(open_list)
+        return open_list[0][0] if open_list else (INF, INF)
+
+    def _update_vertex(self, vertex):
+        """Recalcula rhs a partir dos vizinhos e recoloca o vértice na fila se ficou inconsistente."""
+        if vertex not in self.graph.graph:
+            rhs = INF
+        elif vertex in self._goals:
+            rhs = 0
+        else:
+            g = self.g
+            rhs = min((g.get(neighbor, INF) for neighbor in self.graph.get_neighbors(vertex)), default=INF) + 1
+        if rhs == INF:
+            self.rhs.pop(vertex, None)
+        else:
+            self.rhs[vertex] = rhs
+        if self._open_key.pop(vertex, None) is not None:
+            self._path = None
+        if self.g.get(vertex, INF) != rhs:
+            self._push(vertex)
+            self._path = None
+
+    def _advance(self):
+        """Compensa as chaves já na fila pelo deslocamento do carrinho desde a última atualização."""
+        if self.start != self._last:
+            self.km += abs(self.start[0] - self._last[0]) + abs(self.start[1] - self._last[1])
+            self._last = self.start
+
+    def _compute(self):
+        """Expande vértices até que a distância do carrinho esteja correta."""
+        g, rhs = self.g, self.rhs
+        start = self.start
+        get_neighbors = self.graph.get_neighbors
+        while (self._top_key() < self._key(start)
+               or rhs.get(start, INF) != g.get(start, INF)):
+            key, _, vertex = heapq.heappop(self._open)
+            del self._open_key[vertex]
+            new_key = self._key(vertex)
+            if key < new_key:
+                self._push(vertex)
+                continue
+            self.expanded += 1
+            if g.get(vertex, INF) > rhs.get(vertex, INF):
+                g[vertex] = rhs[vertex]
+                for neighbor in get_neighbors(vertex):
+                    self._update_vertex(neighbor)
+            else:
+                g.pop(vertex, None)
+                self._update_vertex(vertex)
+                for neighbor in get_neighbors(vertex):
+                    self._update_vertex(neighbor)
+
+    def move_to(self, vertex):
+        """Atualiza a posição do carrinho (normalmente o próximo passo do caminho)."""
+        self.start = vertex
+
+    def route(self):
+        """
+        Calcula (ou atualiza) o caminho do carrinho até o caixa mais próximo.
+
+        Returns:
+            tuple: (caminho, caixa) ou (None, None) se não houver caminho
+        """
+        if getattr(self.graph, "version", None) != self._version:
+            self.rebuild()
+        if self.start not in self.graph.graph:
+            return None, None
+        self._advance()
+        # Sem mudanças desde o último cálculo, o restante do caminho continua ótimo
+        if self._path is not None and self.start in self._position:
+            path = self._path[self._position[self.start]:]
+            return path, path[-1]
+        self._compute()
+        g = self.g
+        if g.get(self.start, INF) == INF:
+            return None, None
+
+        path = [self.start]
+        vertex = self.start
+        while vertex not in self._goals:
+            vertex = min(self.graph.get_neighbors(vertex), key=lambda neighbor: g.get(neighbor, INF))
+            path.append(vertex)
+        self._path = path
+        self._position = {vertex: index for index, vertex in enumerate(path)}
+        return path, vertex
+
+    def next_step(self):
+        """Retorna a próxima célula do caminho, ou None se o carrinho já está no caixa ou não há caminho."""
+        path, _ = self.route()
+        if path is None or len(path) < 2:
+            return None
+        return path[1]
+
+    # ------------------------------------------------------------------ ouvinte do MarketGraph
+
+    def _accept_change(self):
+        """Aceita uma notificação se ela é a mudança seguinte à última conhecida.
+
+        Se alguma mudança foi perdida (ex.: o planejador não estava inscrito), nada é
+        reparado e a diferença de versão faz a próxima consulta recomeçar do zero.
+        """
+        version = getattr(self.graph, "version", None)
+        if version is None or self._version is None or version != self._version + 1:
+            return False
+        self._version = version
+        self._advance()
+        return True
+
+    def cell_blocked(self, vertex, neighbors):
+        """Reavalia os vizinhos de uma célula que foi bloqueada."""
+        if not self._accept_change():
+            return
+        if vertex not in self.g and vertex not in self.rhs:
+            return  # A busca nunca alcançou a célula: nenhum valor depende dela
+        if vertex in self._position:
+            self._path = None
+        self.g.pop(vertex, None)
+        self.rhs.pop(vertex, None)
+        self._open_key.pop(vertex, None)
+        for neighbor in neighbors:
+            self._update_vertex(neighbor)
+
+    def cell_unblocked(self, vertex):
+        """Reavalia uma célula liberada e seus vizinhos."""
+        if not self._accept_change():
+            return
+        neighbors = self.graph.get_neighbors(vertex)
+        if vertex in self._goals:
+            self._update_vertex(vertex)  # Caixa liberado volta a ser origem (rhs = 0) mesmo sem vizinhos alcançados
+        elif not any(neighbor in self.g for neighbor in neighbors):
+            return  # Nenhum vizinho alcançado: a célula continua fora da busca
+        self._update_vertex(vertex)
+        for neighbor in neighbors:
+            self._update_vertex(neighbor)
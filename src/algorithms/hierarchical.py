@@ -0,0 +1,498 @@
+from bisect import bisect_left
+from collections import deque
+
+from src.algorithms.batch import occupancy_grid
+from src.algorithms.weighted import LazyPriorityQueue
+from src.data.grid_graph import GridGraph
+
+INF = float("inf")
+
+# Marcadores do início e do destino na busca abstrata
+_START = "start"
+_GOAL = "goal"
+
+
+def _nearest_manhattan(points):
+    """
+    Cria uma função com a distância de Manhattan até o ponto (i, j) mais próximo.
+
+    As colunas são agrupadas por linha e consultadas com busca binária, para que
+    centenas de caixas não sejam percorridos a cada vértice.
+    """
+    by_row = {}
+    for i, j in points:
+        by_row.setdefault(i, []).append(j)
+    by_row = [(i, sorted(columns)) for i, columns in by_row.items()]
+
+    def distance(i, j):
+        best = INF
+        for row, columns in by_row:
+            k = bisect_left(columns, j)
+            if k == len(columns):
+                horizontal = j - columns[-1]
+            elif k == 0:
+                horizontal = columns[0] - j
+            else:
+                horizontal = min(columns[k] - j, j - columns[k - 1])
+            best = min(best, abs(i - row) + horizontal)
+        return best
+
+    return distance
+
+
+class HierarchicalRouter:
+    """Roteamento hierárquico (HPA*) para lojas muito grandes e com vários andares.
+
+    Cada andar é dividido em blocos (clusters) de `cluster_size` células. Nas bordas
+    entre dois blocos vizinhos, cada trecho contínuo de células livres dos dois lados
+    vira uma entrada (uma no meio do trecho, ou duas nas pontas se ele for longo).
+    As distâncias entre as entradas de um mesmo bloco são calculadas com BFS restrito
+    ao bloco e guardadas. Uma consulta busca primeiro nesse grafo abstrato pequeno
+    (entradas, passagens entre blocos e elevadores/escadas rolantes entre andares) e
+    depois refina só os blocos por onde a rota passa.
+
+    Os vértices são (andar, i, j); em lojas de um andar também podem ser usados
+    vértices (i, j), e os caminhos são devolvidos no mesmo formato do início. Os
+    caminhos sempre são válidos e o caixa é alcançado sempre que houver caminho, mas
+    o comprimento pode ser um pouco maior que o do BFS (a rota passa pelas entradas).
+
+    Quando uma célula muda (`block`/`unblock` ou como ouvinte do MarketGraph), só o
+    bloco dela é recalculado, e um bloco vizinho apenas se as entradas da borda em
+    comum mudarem. As tabelas de distância são calculadas sob demanda, então blocos
+    que nenhuma consulta alcança nunca são processados.
+    """
+
+    # Trechos de borda a partir deste tamanho ganham duas entradas (nas pontas)
+    LONG_ENTRANCE = 6
+
+    def __init__(self, floors, cluster_size=12, lifts=()):
+        """
+        Inicializa o roteador.
+
+        Args:
+            floors: Lista de GridGraph 4-conectados, um por andar
+            cluster_size: Lado dos blocos, em células (o padrão é múltiplo do
+                espaçamento de 3 colunas dos corredores do MarketLayout)
+            lifts: Ligações entre andares, como pares ((andar, i, j), (andar, i, j))
+                ou triplas com o custo da ligação (padrão 1)
+        """
+        if not floors:
+            raise ValueError("A loja precisa de pelo menos um andar.")
+        if cluster_size < 2:
+            raise ValueError("Os blocos devem ter pelo menos 2 células de lado.")
+        for grid in floors:
+            if getattr(grid, "connectivity", 4) != 4:
+                raise ValueError("Apenas grids 4-conectados são suportados.")
+        self.floors = list(floors)
+        self.cluster_size = cluster_size
+        self.lifts = []
+        self._borders = {}  # (andar, bi, bj, "E" ou "S") -> pares de entradas na borda
+        self._links = {}  # Entrada -> {vértice do outro lado: custo}
+        self._tables = {}  # Bloco -> {entrada: [(outra entrada, distância)]}
+        self._goal_cache = {}  # (bloco, caixas do bloco) -> distância de cada entrada ao caixa mais próximo
+        self.clusters_built = 0  # Tabelas de bloco calculadas (inclusive recálculos)
+
+        for lift in lifts:
+            a, b = lift[0], lift[1]
+            cost = lift[2] if len(lift) > 2 else 1
+            for vertex in (a, b):
+                floor, i, j = vertex
+                if not (0 <= floor < len(self.floors) and 0 <= i < self.floors[floor].rows
+                        and 0 <= j < self.floors[floor].cols):
+                    raise ValueError(f"Ligação {lift} fora da loja.")
+            self.lifts.append((a, b, cost))
+            self._links.setdefault(a, {})[b] = cost
+            self._links.setdefault(b, {})[a] = cost
+
+        size = cluster_size
+        for floor, grid in enumerate(self.floors):
+            for bi in range((grid.rows + size - 1) // size):
+                for bj in range((grid.cols + size - 1) // size):
+                    self._compute_border((floor, bi, bj, "E"))
+                    self._compute_border((floor, bi, bj, "S"))
+
+    @classmethod
+    def from_graph(cls, graph, cluster_size=12, grid_size=None):
+        """Cria um roteador de um andar a partir de um GridGraph ou MarketGraph em grid.
+
+        O roteador guarda uma cópia da ocupação; para acompanhar um MarketGraph,
+        inscreva-o como ouvinte (`graph.subscribe(router)`).
+        """
+        rows, cols, cells = occupancy_grid(graph, grid_size)
+        return cls([GridGraph.from_cells(rows, cols, cells)], cluster_size)
+
+    @classmethod
+    def from_layouts(cls, layouts, lifts=(), cluster_size=12):
+        """Cria um roteador de vários andares a partir de plantas CellLayout (uma por andar)."""
+        return cls([layout.to_grid_graph() for layout in layouts], cluster_size, lifts)
+
+    # ------------------------------------------------------------------ blocos e entradas
+
+    def cluster_of(self, vertex):
+        """Retorna o bloco (andar, bi, bj) de um vértice (andar, i, j)."""
+        floor, i, j = vertex
+        return floor, i // self.cluster_size, j // self.cluster_size
+
+    def _bounds(self, cluster):
+        """Limites (topo, esquerda, base, direita) do bloco, com base e direita exclusivas."""
+        floor, bi, bj = cluster
+        grid = self.floors[floor]
+        top, left = bi * self.cluster_size, bj * self.cluster_size
+        return top, left, min(top + self.cluster_size, grid.rows), min(left + self.cluster_size, grid.cols)
+
+    def _is_open(self, vertex):
+        floor, i, j = vertex
+        grid = self.floors[floor]
+        return grid.cells[i * grid.cols + j] == 1
+
+    def _compute_border(self, border):
+        """Recalcula as entradas de uma borda (leste ou sul do bloco) e suas passagens.
+
+        Returns:
+            bool: True se as entradas mudaram
+        """
+        floor, bi, bj, side = border
+        grid = self.floors[floor]
+        cells, cols, size = grid.cells, grid.cols, self.cluster_size
+        if side == "E":
+            column = (bj + 1) * size - 1
+            if column + 1 >= cols:
+                return False
+            first, last = bi * size, min((bi + 1) * size, grid.rows)
+            open_pairs = [cells[i * cols + column] and cells[i * cols + column + 1] for i in range(first, last)]
+
+            def pair(k):
+                return (floor, k, column), (floor, k, column + 1)
+        else:
+            row = (bi + 1) * size - 1
+            if row + 1 >= grid.rows:
+                return False
+            first, last = bj * size, min((bj + 1) * size, cols)
+            open_pairs = [cells[row * cols + j] and cells[(row + 1) * cols + j] for j in range(first, last)]
+
+            def pair(k):
+                return (floor, row, k), (floor, row + 1, k)
+
+        pairs = []
+        k = 0
+        while k < len(open_pairs):
+            if not open_pairs[k]:
+                k += 1
+                continue
+            end = k
+            while end + 1 < len(open_pairs) and open_pairs[end + 1]:
+                end += 1
+            if end - k + 1 >= self.LONG_ENTRANCE:
+                pairs.append(pair(first + k))
+                pairs.append(pair(first + end))
+            else:
+                pairs.append(pair(first + (k + end) // 2))
+            k = end + 1
+
+        old = self._borders.get(border, [])
+        if old == pairs:
+            return False
+        for a, b in old:
+            self._unlink(a, b)
+        for a, b in pairs:
+            self._links.setdefault(a, {})[b] = 1
+            self._links.setdefault(b, {})[a] = 1
+        if pairs:
+            self._borders[border] = pairs
+        else:
+            self._borders.pop(border, None)
+        return True
+
+    def _unlink(self, a, b):
+        for source, target in ((a, b), (b, a)):
+            links = self._links.get(source)
+            if links is not None:
+                links.pop(target, None)
+                if not links:
+                    del self._links[source]
+        # Elevadores e escadas rolantes são permanentes, mesmo que coincidam com uma borda
+        for lift_a, lift_b, cost in self.lifts:
+            if {lift_a, lift_b} == {a, b}:
+                self._links.setdefault(lift_a, {})[lift_b] = cost
+                self._links.setdefault(lift_b, {})[lift_a] = cost
+
+    def _cluster_borders(self, cluster):
+        """Bordas que envolvem o bloco: leste e sul dele, leste do vizinho à esquerda e sul do de cima."""
+        floor, bi, bj = cluster
+        borders = [((floor, bi, bj, "E"), (floor, bi, bj + 1)), ((floor, bi, bj, "S"), (floor, bi + 1, bj))]
+        if bj > 0:
+            borders.append(((floor, bi, bj - 1, "E"), (floor, bi, bj - 1)))
+        if bi > 0:
+            borders.append(((floor, bi - 1, bj, "S"), (floor, bi - 1, bj)))
+        return borders
+
+    def _entrances(self, cluster):
+        """Entradas livres do bloco: pontas das passagens e dos elevadores dentro dele."""
+        entrances = set()
+        for border, _ in self._cluster_borders(cluster):
+            for a, b in self._borders.get(border, ()):
+                entrances.add(a if self.cluster_of(a) == cluster else b)
+        for a, b, _ in self.lifts:
+            for vertex in (a, b):
+                if self.cluster_of(vertex) == cluster and self._is_open(vertex):
+                    entrances.add(vertex)
+        return entrances
+
+    def _local_bfs(self, cluster, sources, targets=None):
+        """
+        BFS de múltiplas origens restrito a um bloco.
+
+        Args:
+            cluster: Bloco (andar, bi, bj)
+            sources: Vértices (andar, i, j) de origem, todos dentro do bloco
+            targets: Vértices que, uma vez alcançados todos, encerram a busca
+
+        Returns:
+            tuple: (distância, pai), dicionários indexados pelo id i * cols + j
+        """
+        floor = cluster[0]
+        grid = self.floors[floor]
+        cells, cols = grid.cells, grid.cols
+        top, left, bottom, right = self._bounds(cluster)
+        dist = {}
+        parent = {}
+        queue = deque()
+        for _, i, j in sources:
+            cell = i * cols + j
+            if cells[cell] and cell not in dist:
+                dist[cell] = 0
+                parent[cell] = None
+                queue.append(cell)
+        remaining = None
+        if targets is not None:
+            remaining = {i * cols + j for _, i, j in targets}
+            remaining.difference_update(dist)
+            if not remaining:
+                return dist, parent
+        while queue:
+            cell = queue.popleft()
+            i, j = divmod(cell, cols)
+            following = dist[cell] + 1
+            for neighbor, inside in ((cell - cols, i > top), (cell - 1, j > left),
+                                     (cell + cols, i < bottom - 1), (cell + 1, j < right - 1)):
+                if inside and cells[neighbor] and neighbor not in dist:
+                    dist[neighbor] = following
+                    parent[neighbor] = cell
+                    if remaining is not None:
+                        remaining.discard(neighbor)
+                        if not remaining:
+                            return dist, parent
+                    queue.append(neighbor)
+        return dist, parent
+
+    def _table(self, cluster):
+        """Distâncias entre as entradas do bloco, calculadas na primeira vez que são usadas."""
+        table = self._tables.get(cluster)
+        if table is None:
+            cols = self.floors[cluster[0]].cols
+            entrances = self._entrances(cluster)
+            table = {}
+            for entrance in entrances:
+                others = [other for other in entrances if other != entrance]
+                dist, _ = self._local_bfs(cluster, [entrance], others)
+                table[entrance] = [(other, dist[other[1] * cols + other[2]]) for other in others
+                                   if other[1] * cols + other[2] in dist]
+            self._tables[cluster] = table
+            self.clusters_built += 1
+        return table
+
+    def _goal_distances(self, cluster, goals):
+        """Distância de cada entrada do bloco até o caixa mais próximo dentro dele, e qual caixa."""
+        key = (cluster, goals)
+        cached = self._goal_cache.get(key)
+        if cached is None:
+            cols = self.floors[cluster[0]].cols
+            dist, parent = self._local_bfs(cluster, goals)
+            cached = {}
+            for entrance in self._table(cluster):
+                cell = entrance[1] * cols + entrance[2]
+                if cell in dist:
+                    origin = cell
+                    while parent[origin] is not None:
+                        origin = parent[origin]
+                    cached[entrance] = (dist[cell], (cluster[0],) + divmod(origin, cols))
+            self._goal_cache[key] = cached
+        return cached
+
+    def _local_path(self, cluster, source, target):
+        """Caminho mais curto entre dois vértices sem sair do bloco."""
+        floor = cluster[0]
+        cols = self.floors[floor].cols
+        _, parent = self._local_bfs(cluster, [target], [source])
+        cell = source[1] * cols + source[2]
+        path = []
+        while cell is not None:
+            path.append((floor,) + divmod(cell, cols))
+            cell = parent[cell]
+        return path
+
+    # ------------------------------------------------------------------ consultas
+
+    def _vertex(self, vertex):
+        return vertex if len(vertex) == 3 else (0,) + tuple(vertex)
+
+    def _inside(self, vertex):
+        floor, i, j = vertex
+        return (0 <= floor < len(self.floors) and 0 <= i < self.floors[floor].rows
+                and 0 <= j < self.floors[floor].cols)
+
+    def _heuristic(self, goals):
+        """
+        Estimativa admissível da distância até um caixa, usada pelo A* no grafo abstrato.
+
+        No mesmo andar é a distância de Manhattan até o caixa mais próximo; sair do
+        andar exige chegar a um elevador e pagar pelo menos a ligação mais barata.
+        """
+        to_goal = {}
+        to_lift = {}
+        for floor, i, j in goals:
+            to_goal.setdefault(floor, []).append((i, j))
+        for a, b, _ in self.lifts:
+            for floor, i, j in (a, b):
+                to_lift.setdefault(floor, []).append((i, j))
+        to_goal = {floor: _nearest_manhattan(points) for floor, points in to_goal.items()}
+        to_lift = {floor: _nearest_manhattan(points) for floor, points in to_lift.items()}
+        lift_cost = min((cost for _, _, cost in self.lifts), default=INF)
+
+        def heuristic(vertex):
+            floor, i, j = vertex
+            goal = to_goal.get(floor)
+            lift = to_lift.get(floor)
+            best = goal(i, j) if goal else INF
+            if lift:
+                best = min(best, lift(i, j) + lift_cost)
+            return best
+
+        return heuristic
+
+    def route(self, start, goals):
+        """
+        Encontra um caminho do início até o caixa mais próximo pelo grafo abstrato.
+
+        Args:
+            start: Vértice inicial, (andar, i, j) ou (i, j) no andar 0
+            goals: Lista de vértices de destino, no mesmo formato
+
+        Returns:
+            tuple: (caminho, vértice de destino) ou (None, None) se não houver caminho
+        """
+        flat = len(start) == 2
+        start = self._vertex(start)
+        goals = [goal for goal in map(self._vertex, goals) if self._inside(goal) and self._is_open(goal)]
+        if not goals or not self._inside(start) or not self._is_open(start):
+            return None, None
+
+        by_cluster = {}
+        for goal in goals:
+            by_cluster.setdefault(self.cluster_of(goal), []).append(goal)
+        goal_clusters = {cluster: tuple(sorted(set(group))) for cluster, group in by_cluster.items()}
+
+        heuristic = self._heuristic(goals)
+        queue = LazyPriorityQueue()
+        cost = {}
+        parent = {}  # Vértice -> (anterior, True se chegou por uma passagem/elevador)
+        reached = None  # Caixa do melhor candidato a destino
+
+        start_cluster = self.cluster_of(start)
+        cols = self.floors[start[0]].cols
+        start_dist, _ = self._local_bfs(start_cluster, [start])
+        for entrance in self._table(start_cluster):
+            d = start_dist.get(entrance[1] * cols + entrance[2])
+            if d is not None:
+                cost[entrance] = d
+                parent[entrance] = (_START, False)
+                queue.push(entrance, d + heuristic(entrance))
+        for goal in goal_clusters.get(start_cluster, ()):
+            d = start_dist.get(goal[1] * cols + goal[2])
+            if d is not None and d < cost.get(_GOAL, INF):
+                cost[_GOAL] = d
+                parent[_GOAL] = (_START, False)
+                reached = goal
+                queue.push(_GOAL, d)
+
+        while queue:
+            vertex, _ = queue.pop()
+            if vertex == _GOAL:
+                break
+            d = cost[vertex]
+            cluster = self.cluster_of(vertex)
+            if cluster in goal_clusters:
+                exit_to = self._goal_distances(cluster, goal_clusters[cluster]).get(vertex)
+                if exit_to is not None and d + exit_to[0] < cost.get(_GOAL, INF):
+                    if queue.push(_GOAL, d + exit_to[0]):
+                        cost[_GOAL] = d + exit_to[0]
+                        parent[_GOAL] = (vertex, False)
+                        reached = exit_to[1]
+            edges = [(other, w, False) for other, w in self._table(cluster).get(vertex, ())]
+            edges.extend((other, w, True) for other, w in self._links.get(vertex, {}).items())
+            for other, w, link in edges:
+                if link and not self._is_open(other):
+                    continue
+                new_cost = d + w
+                if new_cost < cost.get(other, INF) and queue.push(other, new_cost + heuristic(other)):
+                    cost[other] = new_cost
+                    parent[other] = (vertex, link)
+        else:
+            return None, None
+
+        # Refinamento: só os blocos da rota abstrata são percorridos de novo
+        chain = []
+        vertex = _GOAL
+        while vertex != _START:
+            previous, link = parent[vertex]
+            chain.append((previous, vertex, link))
+            vertex = previous
+        chain.reverse()
+        path = [start]
+        for previous, vertex, link in chain:
+            source = start if previous == _START else previous
+            target = reached if vertex == _GOAL else vertex
+            if link:
+                path.append(target)
+            else:
+                path.extend(self._local_path(self.cluster_of(source), source, target)[1:])
+        if flat:
+            return [(i, j) for _, i, j in path], reached[1:]
+        return path, reached
+
+    # ------------------------------------------------------------------ mudanças
+
+    def _refresh(self, vertex):
+        """Recalcula as entradas em volta do bloco da célula e descarta as tabelas afetadas."""
+        cluster = self.cluster_of(vertex)
+        stale = {cluster}
+        for border, other in self._cluster_borders(cluster):
+            if self._compute_border(border):
+                stale.add(other)
+        for block in stale:
+            self._tables.pop(block, None)
+        self._goal_cache = {key: value for key, value in self._goal_cache.items() if key[0] not in stale}
+
+    def block(self, vertex):
+        """Bloqueia uma célula e recalcula apenas o bloco dela (e vizinhos cujas entradas mudaram)."""
+        vertex = self._vertex(vertex)
+        floor, i, j = vertex
+        self.floors[floor].block((i, j))
+        self._refresh(vertex)
+
+    def unblock(self, vertex):
+        """Libera uma célula e recalcula apenas o bloco dela (e vizinhos cujas entradas mudaram)."""
+        vertex = self._vertex(vertex)
+        floor, i, j = vertex
+        self.floors[floor].unblock((i, j))
+        self._refresh(vertex)
+
+    # ------------------------------------------------------------------ ouvinte do MarketGraph
+
+    def cell_blocked(self, vertex, neighbors):
+        """Acompanha uma célula bloqueada no andar 0."""
+        self.block(vertex)
+
+    def cell_unblocked(self, vertex):
+        """Acompanha uma célula liberada no andar 0."""
+        self.unblock(vertex)
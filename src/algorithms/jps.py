@@ -0,0 +1,212 @@
+import weakref
+from bisect import bisect_left
+
+from src.algorithms.batch import occupancy_grid
+from src.algorithms.weighted import LazyPriorityQueue
+from src.utils import instrumentation
+
+
+def _padded(rows, cols, cells):
+    """Copia a ocupação para um grid com uma borda bloqueada, eliminando testes de limite."""
+    width = cols + 2
+    padded = bytearray((rows + 2) * width)
+    for i in range(rows):
+        start = (i + 1) * width + 1
+        padded[start:start + cols] = cells[i * cols:(i + 1) * cols]
+    return padded, width
+
+
+# Ocupação com borda de cada grafo, reaproveitada entre consultas enquanto graph.version não muda
+_PADDED_CACHE = weakref.WeakKeyDictionary()
+
+
+def _padded_occupancy(graph, grid_size=None):
+    """
+    Ocupação com borda do grafo, calculada uma vez por versão do layout.
+
+    Extrair e copiar a ocupação percorre o grid inteiro (O(linhas x colunas)), o que
+    custaria mais que o próprio salto; grafos sem `version` são recalculados sempre.
+
+    Returns:
+        tuple: (linhas, colunas, ocupação com borda, largura com borda)
+    """
+    version = getattr(graph, "version", None)
+    key = (version, grid_size)
+    if version is not None:
+        try:
+            cached = _PADDED_CACHE.get(graph)
+        except TypeError:  # Grafo sem suporte a weakref
+            cached = None
+        if cached is not None and cached[0] == key:
+            return cached[1]
+    rows, cols, cells = occupancy_grid(graph, grid_size)
+    result = (rows, cols) + _padded(rows, cols, cells)
+    if version is not None:
+        try:
+            _PADDED_CACHE[graph] = (key, result)
+        except TypeError:
+            pass
+    return result
+
+
+def jps_search(graph, start, goals, grid_size=None):
+    """
+    Jump Point Search (4-conectado) com A* sobre a ocupação do grid.
+
+    Em vez de expandir cada célula, a busca "salta" em linha reta e só para em
+    pontos de salto: células com vizinhos forçados (onde um obstáculo cria um
+    desvio obrigatório) ou objetivos. Caminhos simétricos pelo espaço aberto são
+    descartados, e os passos retornados são os mesmos do BFS.
+
+    Args:
+        graph: GridGraph 4-conectado ou MarketGraph em grid
+        start: Vértice inicial
+        goals: Lista ou conjunto de vértices de destino
+        grid_size: (linhas, colunas), se não puder ser obtido do grafo
+
+    Returns:
+        tuple: (caminho, objetivo, nós expandidos); caminho e objetivo são None se
+        não houver caminho
+    """
+    rows, cols, cells, width = _padded_occupancy(graph, grid_size)
+
+    def pid(vertex):
+        return (vertex[0] + 1) * width + vertex[1] + 1
+
+    def vertex_of(p):
+        r, c = divmod(p, width)
+        return r - 1, c - 1
+
+    goal_ids = {pid(goal) for goal in goals if 0 <= goal[0] < rows and 0 <= goal[1] < cols}
+    if not (0 <= start[0] < rows and 0 <= start[1] < cols) or not goal_ids:
+        return None, None, 0
+    source = pid(start)
+    if not cells[source]:
+        return None, None, 0
+
+    # Colunas dos objetivos agrupadas por linha: a heurística (Manhattan até o objetivo
+    # mais próximo) usa busca binária em vez de percorrer todos os caixas
+    goal_rows = {}
+    for goal in goal_ids:
+        r, c = divmod(goal, width)
+        goal_rows.setdefault(r, []).append(c)
+    goal_rows = [(r, sorted(columns)) for r, columns in goal_rows.items()]
+
+    def heuristic(p):
+        r, c = divmod(p, width)
+        best = None
+        for goal_row, columns in goal_rows:
+            k = bisect_left(columns, c)
+            if k == len(columns):
+                horizontal = c - columns[-1]
+            elif k == 0:
+                horizontal = columns[0] - c
+            else:
+                horizontal = min(columns[k] - c, c - columns[k - 1])
+            estimate = abs(r - goal_row) + horizontal
+            if best is None or estimate < best:
+                best = estimate
+        return best
+
+    def jump_horizontal(p, d):
+        while cells[p]:
+            if p in goal_ids:
+                return p
+            # Vizinho forçado acima ou abaixo: a célula anterior tinha uma parede ali
+            if (cells[p - width] and not cells[p - d - width]) or (cells[p + width] and not cells[p - d + width]):
+                return p
+            p += d
+        return -1
+
+    def jump_vertical(p, d):
+        while cells[p]:
+            if p in goal_ids:
+                return p
+            if (cells[p - 1] and not cells[p - 1 - d]) or (cells[p + 1] and not cells[p + 1 - d]):
+                return p
+            # Ao andar na vertical, é preciso verificar pontos de salto em cada linha
+            if jump_horizontal(p + 1, 1) >= 0 or jump_horizontal(p - 1, -1) >= 0:
+                return p
+            p += d
+        return -1
+
+    all_directions = (-width, -1, width, 1)
+    cost = {source: 0}
+    parent = {source: None}
+    direction = {source: 0}
+    queue = LazyPriorityQueue()
+    queue.push(source, heuristic(source))
+    expanded = 0
+    found = -1
+
+    while queue:
+        p, _ = queue.pop()
+        expanded += 1
+        if p in goal_ids:
+            found = p
+            break
+        came = direction[p]
+        if came == 0:
+            candidates = all_directions
+        elif came in (1, -1):
+            candidates = (-width, width, came)
+        else:
+            candidates = (-1, 1, came)
+        base = cost[p]
+        for d in candidates:
+            if not cells[p + d]:
+                continue
+            if d in (1, -1):
+                jump_point = jump_horizontal(p + d, d)
+                steps = abs(jump_point - p)
+            else:
+                jump_point = jump_vertical(p + d, d)
+                steps = abs(jump_point - p) // width
+            if jump_point < 0:
+                continue
+            new_cost = base + steps
+            if new_cost < cost.get(jump_point, float("inf")) and queue.push(jump_point, new_cost + heuristic(jump_point)):
+                cost[jump_point] = new_cost
+                parent[jump_point] = p
+                direction[jump_point] = d
+
+    probe = instrumentation.ACTIVE
+    if probe.enabled:
+        probe.count("jps.searches")
+        probe.count("jps.expanded", expanded)
+        probe.count("jps.duplicates", queue.pushes - len(cost))
+    if found < 0:
+        return None, None, expanded
+
+    # Reconstrói os pontos de salto e preenche os trechos retos entre eles
+    jump_points = []
+    p = found
+    while p is not None:
+        jump_points.append(p)
+        p = parent[p]
+    jump_points.reverse()
+    path = [jump_points[0]]
+    for previous, current in zip(jump_points, jump_points[1:]):
+        step = direction[current]
+        p = previous
+        while p != current:
+            p += step
+            path.append(p)
+    return [vertex_of(p) for p in path], vertex_of(found), expanded
+
+
+def jps(graph, start, goals, grid_size=None):
+    """
+    Encontra o caminho mais curto com Jump Point Search, no mesmo formato do bfs.
+
+    Args:
+        graph: GridGraph 4-conectado ou MarketGraph em grid
+        start: Vértice inicial
+        goals: Lista ou conjunto de vértices de destino
+        grid_size: (linhas, colunas), se não puder ser obtido do grafo
+
+    Returns:
+        tuple: (caminho, vértice de destino) ou (None, None) se não encontrar caminho
+    """
+    path, goal, _ = jps_search(graph, start, goals, grid_size)
+    return path, goal
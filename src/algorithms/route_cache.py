@@ -0,0 +1,127 @@
+from array import array
+from collections import OrderedDict
+
+
+class RouteCache:
+    """Cache LRU de rotas indexado por (início, conjunto de objetivos, versão do layout).
+
+    Os caminhos são guardados de forma compacta, como `array('i')` de ids de célula
+    (`i * cols + j`), em vez de listas de tuplas. Quando a versão do layout muda,
+    todas as entradas antigas são descartadas, pois nunca mais poderiam ser usadas.
+    """
+
+    def __init__(self, cols, maxsize=256):
+        """
+        Inicializa o cache vazio.
+
+        Args:
+            cols: Número de colunas do grid, usado para converter (i, j) em ids
+            maxsize: Quantidade máxima de rotas guardadas
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize deve ser positivo.")
+        self.cols = cols
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def encode(self, path):
+        """Converte um caminho de tuplas (i, j) em um array compacto de ids."""
+        cols = self.cols
+        return array("i", [i * cols + j for i, j in path])
+
+    def decode(self, cells):
+        """Converte um array de ids de volta em uma lista de tuplas (i, j)."""
+        cols = self.cols
+        return [divmod(cell, cols) for cell in cells]
+
+    def _check_version(self, version):
+        """Descarta todas as entradas se a versão do layout mudou."""
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def invalidate(self):
+        """Descarta todas as rotas (ex.: mudança de corredores ou caixas fora do grafo)."""
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self._version = None
+
+    def get(self, start, goals, version):
+        """
+        Procura uma rota no cache.
+
+        Args:
+            start: Vértice inicial
+            goals: Conjunto de objetivos
+            version: Versão atual do layout
+
+        Returns:
+            tuple: (encontrado, (caminho, objetivo)); caminho é None se a rota em cache
+            registrou que não há caminho
+        """
+        self._check_version(version)
+        key = (start, frozenset(goals))
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, (None, None)
+        self._entries.move_to_end(key)
+        self.hits += 1
+        cells, goal = entry
+        if cells is None:
+            return True, (None, None)
+        return True, (self.decode(cells), goal)
+
+    def put(self, start, goals, version, path, goal):
+        """Guarda uma rota (ou a ausência de rota, com path=None), removendo a menos usada se cheio."""
+        self._check_version(version)
+        key = (start, frozenset(goals))
+        self._entries[key] = (self.encode(path) if path is not None else None, goal)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_compute(self, start, goals, version, compute):
+        """
+        Retorna a rota do cache ou a calcula com `compute()` e a guarda.
+
+        Args:
+            start: Vértice inicial
+            goals: Conjunto de objetivos
+            version: Versão atual do layout
+            compute: Função sem argumentos que retorna (caminho, objetivo)
+
+        Returns:
+            tuple: (caminho, objetivo) ou (None, None)
+        """
+        found, result = self.get(start, goals, version)
+        if found:
+            return result
+        path, goal = compute()
+        self.put(start, goals, version, path, goal)
+        return path, goal
+
+    def stats(self):
+        """Retorna os contadores do cache para análise de dimensionamento."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,235 @@
+import heapq
+from collections import deque
+
+from src.utils import instrumentation
+
+
+class RoutingIndex:
+    """Campo de distâncias pré-calculado a partir de todos os caixas.
+
+    Uma única Busca em Largura reversa, com todos os caixas como origem, guarda para
+    cada vértice alcançável a distância até o caixa mais próximo, o próximo passo
+    nessa direção e qual é esse caixa. Uma rota passa a ser apenas uma sequência de
+    consultas a dicionários, sem busca no momento da consulta.
+
+    O índice reconstrói o campo sozinho quando o grafo (ou sua versão) ou a lista de
+    caixas mudam, e repara apenas a região afetada quando uma única célula é
+    bloqueada ou liberada através de `cell_blocked` e `cell_unblocked`.
+    """
+
+    def __init__(self, graph, cashiers):
+        """
+        Inicializa o índice e calcula o campo de distâncias.
+
+        Args:
+            graph: Instância de MarketGraph (ou grafo com get_neighbors e version)
+            cashiers: Lista de vértices dos caixas
+        """
+        self.graph = graph
+        self.cashiers = list(cashiers)
+        self.distance = {}
+        self.next_hop = {}
+        self.nearest = {}
+        self._state = None
+        self.rebuild()
+
+    def _layout_state(self):
+        """Identifica o estado do layout usado para construir o campo."""
+        return id(self.graph), getattr(self.graph, "version", None), tuple(self.cashiers)
+
+    def _can_repair(self):
+        """Indica se o campo atual pode ser reparado localmente (mesmo grafo e mesmos caixas)."""
+        state = self._layout_state()
+        return self._state is not None and self._state[0] == state[0] and self._state[2] == state[2]
+
+    def rebuild(self):
+        """Recalcula o campo inteiro com uma BFS multi-origem a partir dos caixas."""
+        with instrumentation.ACTIVE.phase("routing_index.rebuild"):
+            self._rebuild()
+
+    def _rebuild(self):
+        distance = {}
+        next_hop = {}
+        nearest = {}
+        get_neighbors = self.graph.get_neighbors
+        queue = deque()
+        probe = instrumentation.ACTIVE
+        if probe.enabled:
+            get_neighbors = probe.counting_neighbors("routing_index", get_neighbors, queue.__len__)
+
+        for cashier in self.cashiers:
+            if cashier in distance or cashier not in self.graph.graph:
+                continue
+            distance[cashier] = 0
+            next_hop[cashier] = None
+            nearest[cashier] = cashier
+            queue.append(cashier)
+
+        while queue:
+            vertex = queue.popleft()
+            next_distance = distance[vertex] + 1
+            owner = nearest[vertex]
+            for neighbor in get_neighbors(vertex):
+                if neighbor not in distance:
+                    distance[neighbor] = next_distance
+                    next_hop[neighbor] = vertex
+                    nearest[neighbor] = owner
+                    queue.append(neighbor)
+
+        self.distance = distance
+        self.next_hop = next_hop
+        self.nearest = nearest
+        self._state = self._layout_state()
+
+    def sync(self, graph=None, cashiers=None):
+        """
+        Garante que o campo corresponde ao layout atual, reconstruindo-o se necessário.
+
+        Args:
+            graph: Novo grafo a ser usado (opcional)
+            cashiers: Nova lista de caixas (opcional)
+
+        Returns:
+            bool: True se o campo foi reconstruído
+        """
+        if graph is not None:
+            self.graph = graph
+        if cashiers is not None:
+            self.cashiers = list(cashiers)
+        if self._state == self._layout_state():
+            return False
+        self.rebuild()
+        return True
+
+    def nearest_cashier(self, vertex):
+        """Retorna o caixa mais próximo de vertex, ou None se nenhum for alcançável."""
+        return self.nearest.get(vertex)
+
+    def steps_to_cashier(self, vertex):
+        """Retorna o número de passos até o caixa mais próximo, ou None se inalcançável."""
+        return self.distance.get(vertex)
+
+    def route(self, start):
+        """
+        Segue os ponteiros de próximo passo de start até o caixa mais próximo.
+
+        Args:
+            start: Vértice inicial
+
+        Returns:
+            tuple: (caminho, vértice do caixa) ou (None, None) se não houver caminho
+        """
+        self.sync()
+        if start not in self.distance:
+            return None, None
+        next_hop = self.next_hop
+        path = [start]
+        vertex = next_hop[start]
+        while vertex is not None:
+            path.append(vertex)
+            vertex = next_hop[vertex]
+        return path, path[-1]
+
+    def cell_blocked(self, vertex, neighbors):
+        """
+        Repara o campo depois que vertex foi removido do grafo.
+
+        Apenas os vértices cujo caminho até o caixa passava por vertex são
+        recalculados, a partir da fronteira com a região que não foi afetada.
+
+        Args:
+            vertex: Vértice que acabou de ser bloqueado
+            neighbors: Vizinhos que vertex tinha antes de ser removido
+        """
+        if not self._can_repair() or vertex in self.cashiers:
+            self.rebuild()
+            return
+
+        distance = self.distance
+        next_hop = self.next_hop
+        nearest = self.nearest
+        if vertex not in distance:
+            self._state = self._layout_state()
+            return
+        del distance[vertex], next_hop[vertex], nearest[vertex]
+        instrumentation.ACTIVE.count("routing_index.repairs")
+
+        # Subárvore de vértices que dependiam de vertex para chegar a um caixa
+        get_neighbors = self.graph.get_neighbors
+        affected = set()
+        stack = [u for u in neighbors if next_hop.get(u) == vertex]
+        while stack:
+            current = stack.pop()
+            if current in affected:
+                continue
+            affected.add(current)
+            for neighbor in get_neighbors(current):
+                if next_hop.get(neighbor) == current:
+                    stack.append(neighbor)
+        for current in affected:
+            del distance[current], next_hop[current], nearest[current]
+
+        # Propaga as distâncias a partir da fronteira com a região intacta
+        heap = []
+        for current in affected:
+            for neighbor in get_neighbors(current):
+                if neighbor in distance:
+                    heapq.heappush(heap, (distance[neighbor] + 1, current, neighbor))
+        while heap:
+            dist, current, parent = heapq.heappop(heap)
+            if current in distance:
+                continue
+            distance[current] = dist
+            next_hop[current] = parent
+            nearest[current] = nearest[parent]
+            for neighbor in get_neighbors(current):
+                if neighbor in affected and neighbor not in distance:
+                    heapq.heappush(heap, (dist + 1, neighbor, current))
+
+        self._state = self._layout_state()
+
+    def cell_unblocked(self, vertex):
+        """
+        Repara o campo depois que vertex foi (re)inserido no grafo com suas arestas.
+
+        Apenas os vértices cuja distância diminui com o novo atalho são atualizados.
+
+        Args:
+            vertex: Vértice que acabou de ser liberado
+        """
+        if not self._can_repair():
+            self.rebuild()
+            return
+
+        distance = self.distance
+        next_hop = self.next_hop
+        nearest = self.nearest
+        get_neighbors = self.graph.get_neighbors
+
+        if vertex in self.cashiers:
+            distance[vertex] = 0
+            next_hop[vertex] = None
+            nearest[vertex] = vertex
+        else:
+            reachable = [n for n in get_neighbors(vertex) if n in distance]
+            if not reachable:
+                self._state = self._layout_state()
+                return
+            parent = min(reachable, key=distance.__getitem__)
+            distance[vertex] = distance[parent] + 1
+            next_hop[vertex] = parent
+            nearest[vertex] = nearest[parent]
+        instrumentation.ACTIVE.count("routing_index.repairs")
+
+        queue = deque([vertex])
+        while queue:
+            current = queue.popleft()
+            next_distance = distance[current] + 1
+            for neighbor in get_neighbors(current):
+                if neighbor not in distance or next_distance < distance[neighbor]:
+                    distance[neighbor] = next_distance
+                    next_hop[neighbor] = current
+                    nearest[neighbor] = nearest[current]
+                    queue.append(neighbor)
+
+        self._state = self._layout_state()
@@ -0,0 +1,188 @@
+import heapq
+import itertools
+
+from src.algorithms.bfs import reconstruct_path
+from src.utils import instrumentation
+
+
+class LazyPriorityQueue:
+    """Fila de prioridade (heap) com remoção preguiçosa.
+
+    Diminuir a prioridade de um item apenas insere uma nova entrada no heap; as
+    entradas antigas ficam lá e são descartadas quando chegam ao topo. Itens já
+    removidos com pop não voltam a ser inseridos.
+    """
+
+    def __init__(self):
+        """Inicializa a fila vazia."""
+        self._heap = []
+        self._best = {}
+        self._done = set()
+        self._counter = itertools.count()
+        self.pushes = 0  # Inserções no heap, incluindo as que só diminuem a prioridade
+
+    def push(self, item, priority):
+        """
+        Insere item ou diminui sua prioridade.
+
+        Args:
+            item: Item a ser inserido (deve ser hashable)
+            priority: Prioridade (menor sai primeiro)
+
+        Returns:
+            bool: True se a prioridade do item foi melhorada
+        """
+        if item in self._done or priority >= self._best.get(item, float("inf")):
+            return False
+        self._best[item] = priority
+        self.pushes += 1
+        heapq.heappush(self._heap, (priority, next(self._counter), item))
+        return True
+
+    def pop(self):
+        """
+        Remove e retorna o item de menor prioridade, ignorando entradas obsoletas.
+
+        Returns:
+            tuple: (item, prioridade)
+
+        Raises:
+            IndexError: Se a fila estiver vazia
+        """
+        heap = self._heap
+        while heap:
+            priority, _, item = heapq.heappop(heap)
+            if item in self._done or priority != self._best[item]:
+                continue
+            self._done.add(item)
+            del self._best[item]
+            return item, priority
+        raise IndexError("pop de uma fila de prioridade vazia")
+
+    def __bool__(self):
+        """Indica se ainda há itens válidos na fila."""
+        return bool(self._best)
+
+    def __len__(self):
+        """Número de itens válidos (não removidos) na fila."""
+        return len(self._best)
+
+
+def manhattan_heuristic(goals, wait_times=None, min_cost=1):
+    """
+    Cria a heurística admissível (e consistente) para o A* com múltiplos caixas.
+
+    Para cada vértice, estima o menor tempo total como a distância de Manhattan até
+    o caixa vezes o menor custo de célula, mais a espera estimada naquele caixa.
+
+    Args:
+        goals: Vértices dos caixas
+        wait_times: Dicionário caixa -> tempo de espera estimado (padrão 0)
+        min_cost: Menor custo possível para entrar em uma célula
+
+    Returns:
+        function: h(vertex) -> limite inferior do custo restante
+    """
+    wait_times = wait_times or {}
+    targets = [(gi, gj, wait_times.get((gi, gj), 0)) for gi, gj in goals]
+
+    def heuristic(vertex):
+        i, j = vertex
+        return min(min_cost * (abs(i - gi) + abs(j - gj)) + wait for gi, gj, wait in targets)
+
+    return heuristic
+
+
+def _weighted_search(graph, start, goals, cell_costs, wait_times, heuristic):
+    """
+    Busca de menor custo total (caminhada + espera no caixa) com heap.
+
+    Com heuristic=None é o algoritmo de Dijkstra; caso contrário, A*.
+
+    Returns:
+        tuple: (caminho, caixa, custo total) ou (None, None, None)
+    """
+    if not isinstance(goals, set):
+        goals = set(goals)
+    if not goals:
+        return None, None, None
+    cell_costs = cell_costs or {}
+    wait_times = wait_times or {}
+
+    parents = {start: None}
+    cost = {start: 0}
+    queue = LazyPriorityQueue()
+    queue.push(start, heuristic(start) if heuristic else 0)
+    get_neighbors = graph.get_neighbors
+    probe = instrumentation.ACTIVE if instrumentation.ACTIVE.enabled else None
+    if probe is not None:
+        name = "astar" if heuristic else "dijkstra"
+        probe.count(name + ".searches")
+        get_neighbors = probe.counting_neighbors(name, get_neighbors, queue.__len__)
+    best_goal = None
+    best_total = float("inf")
+
+    while queue:
+        vertex, priority = queue.pop()
+        # Nenhum vértice restante pode levar a um total menor que o melhor já encontrado
+        if priority >= best_total:
+            break
+        current = cost[vertex]
+        if vertex in goals:
+            total = current + wait_times.get(vertex, 0)
+            if total < best_total:
+                best_total = total
+                best_goal = vertex
+        for neighbor in get_neighbors(vertex):
+            new_cost = current + cell_costs.get(neighbor, 1)
+            if new_cost < cost.get(neighbor, float("inf")):
+                estimate = new_cost + (heuristic(neighbor) if heuristic else 0)
+                if queue.push(neighbor, estimate):
+                    cost[neighbor] = new_cost
+                    parents[neighbor] = vertex
+
+    if probe is not None:
+        # Vértices inseridos mais de uma vez (prioridade diminuída) deixam entradas obsoletas no heap
+        probe.count(name + ".duplicates", queue.pushes - len(cost))
+    if best_goal is None:
+        return None, None, None
+    return reconstruct_path(parents, best_goal), best_goal, best_total
+
+
+def dijkstra(graph, start, goals, cell_costs=None, wait_times=None):
+    """
+    Encontra a rota com menor tempo total até ser atendido: caminhada + espera no caixa.
+
+    Args:
+        graph: Instância de MarketGraph
+        start: Vértice inicial
+        goals: Lista ou conjunto de caixas
+        cell_costs: Dicionário vértice -> custo para entrar na célula (padrão 1),
+            por exemplo para corredores congestionados. Custos devem ser >= 0.
+        wait_times: Dicionário caixa -> tempo de espera estimado na fila (padrão 0)
+
+    Returns:
+        tuple: (caminho, caixa, custo total) ou (None, None, None) se não houver caminho
+    """
+    return _weighted_search(graph, start, goals, cell_costs, wait_times, None)
+
+
+def astar(graph, start, goals, cell_costs=None, wait_times=None, heuristic=None):
+    """
+    Mesmo resultado de dijkstra, guiado pela heurística de Manhattan.
+
+    Args:
+        graph: Instância de MarketGraph
+        start: Vértice inicial
+        goals: Lista ou conjunto de caixas
+        cell_costs: Dicionário vértice -> custo para entrar na célula (padrão 1)
+        wait_times: Dicionário caixa -> tempo de espera estimado na fila (padrão 0)
+        heuristic: Função h(vertex) admissível; padrão manhattan_heuristic
+
+    Returns:
+        tuple: (caminho, caixa, custo total) ou (None, None, None) se não houver caminho
+    """
+    if heuristic is None and goals:
+        min_cost = min([1] + list((cell_costs or {}).values()))
+        heuristic = manhattan_heuristic(goals, wait_times, min_cost)
+    return _weighted_search(graph, start, goals, cell_costs, wait_times, heuristic)
@@ -0,0 +1,246 @@
+"""
+Suíte de benchmark do núcleo de roteamento, sem interface gráfica.
+
+Gera mercados de tamanhos e densidades de obstáculos configuráveis (com as mesmas
+regras de corredores e caixas do MarketApp), mede a construção dos grafos e cada
+mecanismo de busca com perf_counter, aquecimento e repetições, e emite JSON ou CSV.
+
+Uso:
+    python -m src.benchmark --sizes 11 100 500 --densities 0.1 0.3 --format csv
+    python -m src.benchmark --output atual.json --baseline anterior.json --threshold 1.25
+"""
+import argparse
+import csv
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from src.data.layout import MarketLayout
+from src.algorithms.bfs import bfs
+from src.algorithms.weighted import dijkstra, astar
+from src.algorithms.routing_index import RoutingIndex
+from src.algorithms.batch import batch_route
+from src.algorithms.jps import jps
+
+
+def _builders():
+    """Construções de grafo medidas: nome -> função(layout)."""
+    return {
+        "market_graph": lambda layout: layout.build_graph(),
+        "grid_graph": lambda layout: layout.build_grid_graph(),
+    }
+
+
+def _engines():
+    """Mecanismos de busca medidos: nome -> função(grafo, inícios, caixas) -> passos totais.
+
+    Cada função responde a todas as consultas de uma rodada e retorna a soma dos passos,
+    usada como verificação de que os resultados não mudaram entre execuções.
+    """
+    def total(results):
+        return sum(len(path) - 1 for path in results if path)
+
+    def run_bfs(graph, starts, cashiers):
+        return total(bfs(graph, start, cashiers)[0] for start in starts)
+
+    def run_dijkstra(graph, starts, cashiers):
+        return total(dijkstra(graph, start, cashiers)[0] for start in starts)
+
+    def run_astar(graph, starts, cashiers):
+        return total(astar(graph, start, cashiers)[0] for start in starts)
+
+    def run_jps(graph, starts, cashiers):
+        return total(jps(graph, start, cashiers)[0] for start in starts)
+
+    def run_routing_index(graph, starts, cashiers):
+        index = RoutingIndex(graph, cashiers)
+        return total(index.route(start)[0] for start in starts)
+
+    def run_batch(graph, starts, cashiers):
+        routes = batch_route(graph, starts, cashiers)
+        return sum(steps for steps in routes.steps if steps > 0)
+
+    return {
+        "bfs": run_bfs,
+        "dijkstra": run_dijkstra,
+        "astar": run_astar,
+        "jps": run_jps,
+        "routing_index": run_routing_index,
+        "batch": run_batch,
+    }
+
+
+def time_call(function, args, warmup, repeat):
+    """
+    Mede uma função com perf_counter.
+
+    Args:
+        function: Função a ser medida
+        args: Argumentos posicionais
+        warmup: Execuções descartadas antes da medição
+        repeat: Execuções medidas
+
+    Returns:
+        tuple: (lista de tempos em ms, resultado da última execução)
+    """
+    result = None
+    for _ in range(warmup):
+        result = function(*args)
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = function(*args)
+        timings.append((time.perf_counter() - start_time) * 1000)
+    return timings, result
+
+
+def _record(size, density, kind, name, timings, **extra):
+    """Monta um registro de resultado com estatísticas dos tempos."""
+    record = {
+        "rows": size,
+        "cols": size,
+        "density": density,
+        "kind": kind,
+        "name": name,
+        "repeat": len(timings),
+        "min_ms": round(min(timings), 4),
+        "median_ms": round(statistics.median(timings), 4),
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "max_ms": round(max(timings), 4),
+    }
+    record.update(extra)
+    return record
+
+
+def run_suite(sizes, densities, engines=None, queries=20, warmup=1, repeat=5, seed=0, graph_type="market_graph"):
+    """
+    Executa a suíte completa.
+
+    Args:
+        sizes: Tamanhos de grid (quadrados) a medir
+        densities: Frações de posições livres ocupadas por produtos
+        engines: Nomes dos mecanismos (padrão: todos)
+        queries: Consultas (carrinhos) por rodada
+        warmup: Rodadas de aquecimento
+        repeat: Rodadas medidas
+        seed: Semente do gerador de layouts e consultas
+        graph_type: Grafo usado nas buscas ("market_graph" ou "grid_graph")
+
+    Returns:
+        list: Registros (dicionários) com os tempos de cada medição
+    """
+    available = _engines()
+    engines = engines or list(available)
+    unknown = set(engines) - set(available)
+    if unknown:
+        raise ValueError(f"Mecanismos desconhecidos: {', '.join(sorted(unknown))}")
+
+    builders = _builders()
+    records = []
+    for size in sizes:
+        for density in densities:
+            rng = random.Random(f"{seed}:{size}:{density}")
+            layout = MarketLayout.random(size, size, density=density, rng=rng)
+            starts = [rng.choice(layout.free_cells()) for _ in range(queries)]
+            graphs = {}
+            for name, builder in builders.items():
+                timings, graphs[name] = time_call(builder, (layout,), warmup, repeat)
+                records.append(_record(size, density, "build", name, timings, cells=size * size))
+            graph = graphs[graph_type]
+            for name in engines:
+                timings, steps = time_call(available[name], (graph, starts, layout.cashiers), warmup, repeat)
+                records.append(_record(size, density, "search", name, timings, queries=queries, total_steps=steps))
+    return records
+
+
+def to_csv(records):
+    """Converte os registros em texto CSV."""
+    fields = []
+    for record in records:
+        fields.extend(key for key in record if key not in fields)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    writer.writerows(records)
+    return buffer.getvalue()
+
+
+def compare(records, baseline, threshold):
+    """
+    Compara medianas com uma execução anterior.
+
+    Args:
+        records: Registros atuais
+        baseline: Registros de referência
+        threshold: Razão atual/referência a partir da qual há regressão
+
+    Returns:
+        list: Mensagens de regressão (vazia se nada piorou)
+    """
+    def key(record):
+        return record["rows"], record["cols"], record["density"], record["kind"], record["name"]
+
+    reference = {key(record): record for record in baseline}
+    regressions = []
+    for record in records:
+        previous = reference.get(key(record))
+        if previous is None:
+            continue
+        if previous.get("total_steps") != record.get("total_steps"):
+            regressions.append(f"{key(record)}: passos mudaram de {previous.get('total_steps')} "
+                               f"para {record.get('total_steps')}")
+        if previous["median_ms"] > 0 and record["median_ms"] / previous["median_ms"] > threshold:
+            regressions.append(f"{key(record)}: mediana {previous['median_ms']:.3f}ms -> "
+                               f"{record['median_ms']:.3f}ms")
+    return regressions
+
+
+def main(argv=None):
+    """Ponto de entrada de linha de comando."""
+    parser = argparse.ArgumentParser(prog="python -m src.benchmark",
+                                     description="Benchmark do núcleo de roteamento (sem interface gráfica).")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[11, 100, 300])
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.1])
+    parser.add_argument("--engines", nargs="+", choices=sorted(_engines()), default=None)
+    parser.add_argument("--graph", choices=sorted(_builders()), default="market_graph",
+                        help="Grafo usado pelas buscas")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--output", help="Arquivo de saída (padrão: saída padrão)")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Razão de mediana considerada regressão")
+    args = parser.parse_args(argv)
+
+    records = run_suite(args.sizes, args.densities, args.engines, args.queries,
+                        args.warmup, args.repeat, args.seed, args.graph)
+    if args.format == "json":
+        text = json.dumps({"python": platform.python_version(), "results": records}, indent=2)
+    else:
+        text = to_csv(records)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text + ("\n" if not text.endswith("\n") else ""))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(records, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESSÃO {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+Índice de conectividade do grid (union-find) para saber, em tempo quase O(1), se
+uma célula livre está ligada a algum caixa.
+
+As células livres vizinhas (4-conectadas) são unidas em componentes; cada raiz
+guarda se o componente contém um caixa. Liberar uma célula é uma união barata.
+Bloquear não pode separar componentes num union-find, então:
+    - se a célula é "segura" (seus vizinhos livres continuam ligados pelo anel de
+      8 células em volta), nenhum componente se divide e ela só é marcada bloqueada;
+    - caso contrário, o índice é reconstruído na próxima consulta.
+"""
+from array import array
+
+
+def safe_to_block(cells, rows, cols, cell_id):
+    """
+    Indica se bloquear a célula mantém ligados entre si todos os seus vizinhos livres.
+
+    Olha apenas o anel de 8 células em volta: os vizinhos livres (cima, direita,
+    baixo, esquerda) precisam formar um único grupo, ligados pelos cantos livres do
+    anel. A condição é suficiente, mas conservadora: se vale, qualquer caminho que
+    passava pela célula pode contorná-la pelo anel, então nenhuma região é isolada.
+
+    Args:
+        cells: Grid de ocupação (1 = livre, 0 = bloqueada), indexado por i * cols + j
+        rows: Número de linhas do grid
+        cols: Número de colunas do grid
+        cell_id: Id da célula (i * cols + j)
+
+    Returns:
+        bool: True se o bloqueio não desconecta nenhuma célula livre
+    """
+    i, j = divmod(cell_id, cols)
+
+    def free(a, b):
+        return 0 <= a < rows and 0 <= b < cols and cells[a * cols + b] != 0
+
+    # Anel em sentido horário a partir de cima: lados nas posições pares, cantos nas ímpares
+    ring = (free(i - 1, j), free(i - 1, j + 1), free(i, j + 1), free(i + 1, j + 1),
+            free(i + 1, j), free(i + 1, j - 1), free(i, j - 1), free(i - 1, j - 1))
+    sides = ring[0::2]
+    count = sum(sides)
+    if count <= 1:
+        return True
+    links = sum(1 for k in range(4) if sides[k] and sides[(k + 1) % 4] and ring[2 * k + 1])
+    return count - links <= 1
+
+
+class ConnectivityIndex:
+    """Componentes conexos das células livres, com a marca de quais alcançam um caixa."""
+
+    def __init__(self, rows, cols, cells, cashiers=()):
+        """
+        Inicializa o índice e calcula os componentes.
+
+        Args:
+            rows: Número de linhas do grid
+            cols: Número de colunas do grid
+            cells: Grid de ocupação (1 = livre, 0 = bloqueada); é copiado
+            cashiers: Lista de caixas (i, j)
+        """
+        self.rows = rows
+        self.cols = cols
+        self.cells = bytearray(cells)
+        self.cashiers = list(cashiers)
+        self._cashier_ids = {i * cols + j for i, j in self.cashiers}
+        self.rebuilds = 0
+        self.rebuild()
+
+    @classmethod
+    def from_graph(cls, graph, cashiers, grid_size=None):
+        """
+        Cria o índice a partir de um GridGraph ou MarketGraph.
+
+        Args:
+            graph: GridGraph (4-conectado), ou MarketGraph cujos vértices são células do grid
+            cashiers: Lista de caixas
+            grid_size: (linhas, colunas); se omitido, usa o tamanho do grafo
+
+        Returns:
+            ConnectivityIndex: Novo índice
+        """
+        cells = getattr(graph, "cells", None)
+        if cells is not None:
+            if graph.connectivity != 4:
+                raise ValueError("Apenas grids 4-conectados são suportados.")
+            return cls(graph.rows, graph.cols, cells, cashiers)
+        if grid_size is None:
+            grid_size = getattr(graph, "grid_size", None)
+        if grid_size is None:
+            raise ValueError("Informe grid_size para grafos que não foram criados com from_grid.")
+        rows, cols = grid_size
+        cells = bytearray(rows * cols)
+        for i, j in graph.get_vertices():
+            cells[i * cols + j] = 1
+        return cls(rows, cols, cells, cashiers)
+
+    @classmethod
+    def from_layout(cls, layout, include_forklifts=True):
+        """
+        Cria o índice a partir de um MarketLayout.
+
+        Args:
+            layout: MarketLayout
+            include_forklifts: Se as empilhadeiras contam como bloqueios (elas se movem)
+
+        Returns:
+            ConnectivityIndex: Novo índice
+        """
+        rows, cols = layout.rows, layout.cols
+        cells = bytearray(b"\x01") * (rows * cols)
+        blocked = layout.obstacles() if include_forklifts else layout.corridors | layout.products
+        for i, j in blocked:
+            cells[i * cols + j] = 0
+        return cls(rows, cols, cells, layout.cashiers)
+
+    # ------------------------------------------------------------------ union-find
+
+    def _find(self, k):
+        """Raiz do componente de k, com compressão de caminho pela metade."""
+        parent = self.parent
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    def _union(self, a, b):
+        """Une os componentes de a e b (o menor vai para baixo do maior)."""
+        a = self._find(a)
+        b = self._find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        if self.has_cashier[b]:
+            self.has_cashier[a] = 1
+
+    def rebuild(self):
+        """Recalcula todos os componentes a partir do grid de ocupação."""
+        rows, cols, cells = self.rows, self.cols, self.cells
+        n = rows * cols
+        self.parent = array("i", range(n))
+        self.size = array("i", [1]) * n
+        self.has_cashier = bytearray(n)
+        self._ghost = bytearray(n)  # Bloqueadas com segurança, ainda presas ao componente antigo
+        union = self._union
+        for i in range(rows):
+            base = i * cols
+            for k in range(base, base + cols):
+                if not cells[k]:
+                    continue
+                if k > base and cells[k - 1]:
+                    union(k - 1, k)
+                if k >= cols and cells[k - cols]:
+                    union(k - cols, k)
+        for k in self._cashier_ids:
+            if cells[k]:
+                self.has_cashier[self._find(k)] = 1
+        self._dirty = False
+        self.rebuilds += 1
+
+    def _ensure(self):
+        if self._dirty:
+            self.rebuild()
+
+    def _id(self, cell):
+        i, j = cell
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            return -1
+        return i * self.cols + j
+
+    # ------------------------------------------------------------------ consultas
+
+    def is_free(self, cell):
+        """Indica se a célula está dentro do grid e livre."""
+        k = self._id(cell)
+        return k >= 0 and self.cells[k] != 0
+
+    def connected(self, a, b):
+        """Indica se duas células livres estão no mesmo componente."""
+        if not (self.is_free(a) and self.is_free(b)):
+            return False
+        self._ensure()
+        return self._find(self._id(a)) == self._find(self._id(b))
+
+    def reaches_cashier(self, cell):
+        """Indica se existe caminho da célula livre até algum caixa."""
+        if not self.is_free(cell):
+            return False
+        self._ensure()
+        return self.has_cashier[self._find(self._id(cell))] != 0
+
+    def reachable_cells(self):
+        """Células livres (exceto os caixas) ligadas a algum caixa."""
+        self._ensure()
+        cells, has_cashier, find, cols = self.cells, self.has_cashier, self._find, self.cols
+        return [divmod(k, cols) for k in range(self.rows * cols)
+                if cells[k] and k not in self._cashier_ids and has_cashier[find(k)]]
+
+    def unreachable_cells(self):
+        """Células livres sem nenhum caminho até um caixa (bolsões isolados)."""
+        self._ensure()
+        cells, has_cashier, find, cols = self.cells, self.has_cashier, self._find, self.cols
+        return [divmod(k, cols) for k in range(self.rows * cols) if cells[k] and not has_cashier[find(k)]]
+
+    # ------------------------------------------------------------------ mudanças
+
+    def block(self, cell):
+        """
+        Bloqueia uma célula.
+
+        Returns:
+            bool: True se a célula estava livre
+        """
+        k = self._id(cell)
+        if k < 0 or not self.cells[k]:
+            return False
+        self.cells[k] = 0
+        if self._dirty:
+            return True
+        if k not in self._cashier_ids and safe_to_block(self.cells, self.rows, self.cols, k):
+            self._ghost[k] = 1
+        else:
+            self._dirty = True  # Union-find não separa componentes: recalcula na próxima consulta
+        return True
+
+    def unblock(self, cell):
+        """
+        Libera uma célula, unindo-a aos componentes vizinhos.
+
+        Returns:
+            bool: True se a célula estava bloqueada
+        """
+        k = self._id(cell)
+        if k < 0 or self.cells[k]:
+            return False
+        self.cells[k] = 1
+        if self._dirty:
+            return True
+        rows, cols, cells = self.rows, self.cols, self.cells
+        i, j = divmod(k, cols)
+        neighbors = [a * cols + b for a, b in ((i - 1, j), (i, j - 1), (i + 1, j), (i, j + 1))
+                     if 0 <= a < rows and 0 <= b < cols and cells[a * cols + b]]
+        if self._ghost[k]:
+            # Ainda presa ao componente de quando foi bloqueada: só é válido se algum vizinho está nele
+            self._ghost[k] = 0
+            root = self._find(k)
+            if all(self._find(n) != root for n in neighbors):
+                self._dirty = True
+                return True
+        elif k in self._cashier_ids:
+            self.has_cashier[k] = 1
+        for n in neighbors:
+            self._union(k, n)
+        return True
+
+    def cell_blocked(self, vertex, neighbors):
+        """Ouvinte do MarketGraph: célula bloqueada."""
+        self.block(vertex)
+
+    def cell_unblocked(self, vertex):
+        """Ouvinte do MarketGraph: célula liberada."""
+        self.unblock(vertex)
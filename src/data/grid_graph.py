@@ -0,0 +1,162 @@
+class GridGraph:
+    """Grafo do mercado representado como um grid compacto.
+
+    A ocupação de cada célula é guardada em um `bytearray` (1 = livre, 0 = bloqueada)
+    e cada célula é identificada pelo inteiro `i * cols + j`. Os vizinhos são
+    calculados sob demanda, então não há listas de adjacência em memória.
+
+    Expõe a mesma interface de leitura de MarketGraph (`graph[vertex]`,
+    `get_neighbors` e `get_vertices`), podendo ser usado diretamente pelo BFS.
+    """
+
+    # Ordem dos vizinhos igual à produzida por MarketApp.generate_graph:
+    # cima, esquerda, baixo, direita
+    ORTHOGONAL = ((-1, 0), (0, -1), (1, 0), (0, 1))
+    DIAGONAL = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+    def __init__(self, rows, cols, connectivity=4, blocked=()):
+        """Inicializa um grid rows x cols com todas as células livres.
+
+        Args:
+            rows: Número de linhas do grid.
+            cols: Número de colunas do grid.
+            connectivity: 4 (movimentos ortogonais) ou 8 (inclui diagonais).
+            blocked: Vértices (i, j) que começam bloqueados.
+        """
+        if connectivity not in (4, 8):
+            raise ValueError("Conectividade deve ser 4 ou 8.")
+        if rows <= 0 or cols <= 0:
+            raise ValueError("O grid deve ter pelo menos uma linha e uma coluna.")
+        self.rows = rows
+        self.cols = cols
+        self.connectivity = connectivity
+        self.cells = bytearray(b"\x01") * (rows * cols)
+        self.version = 0
+        for vertex in blocked:
+            self.cells[self.vertex_id(vertex)] = 0
+
+    @classmethod
+    def from_cells(cls, rows, cols, cells, connectivity=4):
+        """Cria o grafo a partir de um buffer de ocupação já pronto (1 = livre, 0 = bloqueada).
+
+        Args:
+            rows: Número de linhas do grid.
+            cols: Número de colunas do grid.
+            cells: Objeto bytes-like com rows * cols bytes.
+            connectivity: 4 ou 8.
+
+        Returns:
+            GridGraph: Novo grafo que usa uma cópia de `cells`.
+        """
+        if len(cells) != rows * cols:
+            raise ValueError("O buffer de ocupação deve ter rows * cols bytes.")
+        grid = cls(rows, cols, connectivity)
+        grid.cells[:] = cells
+        return grid
+
+    @property
+    def graph(self):
+        """Permite que algoritmos escritos para MarketGraph acessem `graph.graph[vertex]`."""
+        return self
+
+    def vertex_id(self, vertex):
+        """Converte um vértice (i, j) no id inteiro da célula.
+
+        Raises:
+            ValueError: Se o vértice estiver fora do grid.
+        """
+        i, j = vertex
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise ValueError(f"Vértice {vertex} fora do grid {self.rows}x{self.cols}.")
+        return i * self.cols + j
+
+    def vertex_of(self, cell_id):
+        """Converte o id inteiro de uma célula de volta para o vértice (i, j)."""
+        return divmod(cell_id, self.cols)
+
+    def is_open(self, vertex):
+        """Indica se o vértice está dentro do grid e livre."""
+        i, j = vertex
+        return 0 <= i < self.rows and 0 <= j < self.cols and self.cells[i * self.cols + j] == 1
+
+    def block(self, vertex):
+        """Marca o vértice como bloqueado, removendo implicitamente suas arestas."""
+        self.cells[self.vertex_id(vertex)] = 0
+        self.version += 1
+
+    def unblock(self, vertex):
+        """Marca o vértice como livre, recriando implicitamente suas arestas."""
+        self.cells[self.vertex_id(vertex)] = 1
+        self.version += 1
+
+    def neighbor_ids(self, cell_id):
+        """Retorna os ids das células vizinhas livres de uma célula.
+
+        Args:
+            cell_id: Id inteiro da célula.
+
+        Returns:
+            list: Ids dos vizinhos livres, na mesma ordem de get_neighbors.
+        """
+        cells = self.cells
+        cols = self.cols
+        i, j = divmod(cell_id, cols)
+        result = []
+        if i > 0 and cells[cell_id - cols]:
+            result.append(cell_id - cols)
+        if j > 0 and cells[cell_id - 1]:
+            result.append(cell_id - 1)
+        if i < self.rows - 1 and cells[cell_id + cols]:
+            result.append(cell_id + cols)
+        if j < cols - 1 and cells[cell_id + 1]:
+            result.append(cell_id + 1)
+        if self.connectivity == 8:
+            for di, dj in self.DIAGONAL:
+                ni, nj = i + di, j + dj
+                # Diagonais só são permitidas sem "cortar quina" de células bloqueadas
+                if (0 <= ni < self.rows and 0 <= nj < cols and cells[ni * cols + nj]
+                        and cells[ni * cols + j] and cells[i * cols + nj]):
+                    result.append(ni * cols + nj)
+        return result
+
+    def get_vertices(self):
+        """Retorna a lista de todos os vértices livres do grafo.
+
+        Returns:
+            list: Lista de tuplas (i, j) das células livres.
+        """
+        return list(self)
+
+    def get_neighbors(self, vertex):
+        """Retorna a lista de vizinhos livres de um vértice.
+
+        Args:
+            vertex: O vértice cujos vizinhos serão retornados.
+
+        Returns:
+            list: Lista de vizinhos do vértice. Retorna uma lista vazia se o vértice
+            não existir ou estiver bloqueado.
+        """
+        if not self.is_open(vertex):
+            return []
+        cols = self.cols
+        return [divmod(cell_id, cols) for cell_id in self.neighbor_ids(vertex[0] * cols + vertex[1])]
+
+    def __getitem__(self, vertex):
+        if not self.is_open(vertex):
+            raise KeyError(vertex)
+        return self.get_neighbors(vertex)
+
+    def __contains__(self, vertex):
+        return isinstance(vertex, tuple) and len(vertex) == 2 and self.is_open(vertex)
+
+    def __iter__(self):
+        cols = self.cols
+        cells = self.cells
+        cell_id = cells.find(1)
+        while cell_id != -1:
+            yield divmod(cell_id, cols)
+            cell_id = cells.find(1, cell_id + 1)
+
+    def __len__(self):
+        return self.cells.count(1)
@@ -0,0 +1,219 @@
+"""
+Regras de layout do mercado (corredores, caixas e obstáculos), independentes da interface gráfica.
+"""
+import random
+
+from src.data.market_graph import MarketGraph
+from src.data.grid_graph import GridGraph
+from src.data.connectivity import ConnectivityIndex, safe_to_block
+
+
+def default_corridors(rows, cols):
+    """Corredores marrons: colunas 2, 5, 8, ... entre a linha 2 e a linha rows - 4.
+
+    Para o grid padrão 11x11 são as colunas 2, 5 e 8, linhas 2 a 7.
+    """
+    return {(i, j) for i in range(2, rows - 3) for j in range(2, cols - 2, 3)}
+
+
+def default_cashiers(rows, cols):
+    """Caixas na última linha, nas colunas ímpares (1, 3, 5, ...)."""
+    return [(rows - 1, j) for j in range(1, cols - 1, 2)]
+
+
+def forbidden_positions(rows, cols, cashiers, corridors, start):
+    """Posições onde não podem ser colocados produtos nem empilhadeiras.
+
+    Inclui os caixas, suas células adjacentes (espaço de segurança), o carrinho e
+    os corredores.
+
+    Returns:
+        set: Conjunto de células (i, j) proibidas.
+    """
+    forbidden = set()
+    for i, j in cashiers:
+        for pos in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+            if 0 <= pos[0] < rows and 0 <= pos[1] < cols:
+                forbidden.add(pos)
+    forbidden.update(cashiers)
+    forbidden.add(start)
+    forbidden |= set(corridors)
+    return forbidden
+
+
+def sample_obstacles(rows, cols, cashiers, corridors, start, n_products=10, n_forklifts=2, rng=random):
+    """Sorteia posições de produtos e empilhadeiras respeitando as posições proibidas.
+
+    Segue a regra do MarketApp: se não houver espaço para todos os obstáculos,
+    nenhum é colocado.
+
+    Args:
+        rows: Número de linhas do grid.
+        cols: Número de colunas do grid.
+        cashiers: Lista de caixas.
+        corridors: Conjunto de células de corredor.
+        start: Posição do carrinho.
+        n_products: Quantidade de produtos (📦).
+        n_forklifts: Quantidade de empilhadeiras (🚜).
+        rng: Gerador de números aleatórios (módulo random ou random.Random).
+
+    Returns:
+        tuple: (lista de produtos, lista de empilhadeiras)
+    """
+    forbidden = forbidden_positions(rows, cols, cashiers, corridors, start)
+    possible = [(i, j) for i in range(rows) for j in range(cols) if (i, j) not in forbidden]
+    if len(possible) < n_products + n_forklifts:
+        return [], []
+    products = rng.sample(possible, n_products)
+    taken = set(products)
+    forklifts = rng.sample([pos for pos in possible if pos not in taken], n_forklifts)
+    return products, forklifts
+
+
+def _occupancy(rows, cols, blocked):
+    """Grid de ocupação (1 = livre) com as células de `blocked` bloqueadas."""
+    cells = bytearray(b"\x01") * (rows * cols)
+    for i, j in blocked:
+        cells[i * cols + j] = 0
+    return cells
+
+
+def sample_connected_obstacles(rows, cols, cashiers, corridors, start, n_products=10, n_forklifts=2,
+                               rng=random, mode="repair", max_attempts=20):
+    """Sorteia produtos e empilhadeiras sem isolar nenhuma célula que alcançava um caixa.
+
+    Modos:
+        "repair": sorteia uma célula por vez num bitmap das posições permitidas e só a
+                  bloqueia se for segura (safe_to_block); senão descarta e sorteia outra.
+        "reject": sorteia tudo com sample_obstacles e confere com um ConnectivityIndex,
+                  repetindo o sorteio (até max_attempts vezes) se algo ficou isolado.
+
+    Como em sample_obstacles, se não couberem todos os obstáculos, nenhum é colocado.
+
+    Args:
+        rows: Número de linhas do grid.
+        cols: Número de colunas do grid.
+        cashiers: Lista de caixas.
+        corridors: Conjunto de células de corredor.
+        start: Posição do carrinho.
+        n_products: Quantidade de produtos (📦).
+        n_forklifts: Quantidade de empilhadeiras (🚜).
+        rng: Gerador de números aleatórios (módulo random ou random.Random).
+        mode: "repair" ou "reject".
+        max_attempts: Sorteios completos tentados no modo "reject".
+
+    Returns:
+        tuple: (lista de produtos, lista de empilhadeiras)
+    """
+    total = n_products + n_forklifts
+    cells = _occupancy(rows, cols, corridors)
+    if mode == "reject":
+        base = ConnectivityIndex(rows, cols, cells, cashiers)
+        reachable = len(base.reachable_cells())
+        for _ in range(max_attempts):
+            products, forklifts = sample_obstacles(rows, cols, cashiers, corridors, start, n_products,
+                                                   n_forklifts, rng)
+            if total and not products and not forklifts:
+                return [], []
+            placed = products + forklifts
+            index = ConnectivityIndex(rows, cols, _occupancy(rows, cols, set(corridors) | set(placed)), cashiers)
+            lost = sum(1 for cell in placed if base.reaches_cashier(cell))
+            if len(index.reachable_cells()) == reachable - lost:
+                return products, forklifts
+        return [], []
+    if mode != "repair":
+        raise ValueError(f"Modo desconhecido: {mode!r}")
+
+    allowed = bytearray(cells)
+    for i, j in forbidden_positions(rows, cols, cashiers, corridors, start):
+        allowed[i * cols + j] = 0
+    candidates = [k for k in range(rows * cols) if allowed[k]]
+    placed = []
+    remaining = len(candidates)
+    while len(placed) < total and remaining:
+        # Fisher-Yates parcial: cada candidata é sorteada no máximo uma vez
+        position = rng.randrange(remaining)
+        k = candidates[position]
+        remaining -= 1
+        candidates[position] = candidates[remaining]
+        if safe_to_block(cells, rows, cols, k):
+            cells[k] = 0
+            placed.append(divmod(k, cols))
+    if len(placed) < total:
+        return [], []
+    return placed[:n_products], placed[n_products:]
+
+
+class MarketLayout:
+    """Descrição completa de um mercado: dimensões, corredores, caixas, carrinho e obstáculos."""
+
+    def __init__(self, rows, cols, cashiers=None, corridors=None, start=(0, 0)):
+        """Inicializa o layout com corredores e caixas padrão, sem obstáculos.
+
+        Args:
+            rows: Número de linhas do grid.
+            cols: Número de colunas do grid.
+            cashiers: Lista de caixas (padrão: default_cashiers).
+            corridors: Conjunto de corredores (padrão: default_corridors).
+            start: Posição inicial do carrinho.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.cashiers = list(cashiers) if cashiers is not None else default_cashiers(rows, cols)
+        self.corridors = set(corridors) if corridors is not None else default_corridors(rows, cols)
+        self.start = start
+        self.products = set()
+        self.forklifts = set()
+
+    @classmethod
+    def random(cls, rows, cols, density=0.1, n_forklifts=2, rng=random, connected=False):
+        """Cria um layout padrão com obstáculos aleatórios.
+
+        Args:
+            rows: Número de linhas do grid.
+            cols: Número de colunas do grid.
+            density: Fração das posições permitidas ocupadas por produtos.
+            n_forklifts: Quantidade de empilhadeiras.
+            rng: Gerador de números aleatórios.
+            connected: Usa sample_connected_obstacles, sem isolar células dos caixas.
+
+        Returns:
+            MarketLayout: Novo layout.
+        """
+        layout = cls(rows, cols)
+        allowed = rows * cols - len(forbidden_positions(rows, cols, layout.cashiers, layout.corridors, layout.start))
+        n_products = int(max(0, allowed - n_forklifts) * density)
+        sampler = sample_connected_obstacles if connected else sample_obstacles
+        products, forklifts = sampler(rows, cols, layout.cashiers, layout.corridors, layout.start,
+                                      n_products, n_forklifts, rng)
+        layout.products = set(products)
+        layout.forklifts = set(forklifts)
+        return layout
+
+    def obstacles(self):
+        """Retorna todas as células bloqueadas (corredores, produtos e empilhadeiras)."""
+        return self.corridors | self.products | self.forklifts
+
+    def free_cells(self):
+        """Retorna as células livres onde um carrinho pode estar (exclui os caixas)."""
+        blocked = self.obstacles() | set(self.cashiers)
+        return [(i, j) for i in range(self.rows) for j in range(self.cols) if (i, j) not in blocked]
+
+    def reachable_cells(self, include_forklifts=False):
+        """Retorna as células livres com caminho até algum caixa (sem bolsões isolados).
+
+        Args:
+            include_forklifts: Se as empilhadeiras contam como bloqueio (padrão: não,
+                pois elas se movem).
+        """
+        index = ConnectivityIndex.from_layout(self, include_forklifts)
+        forklifts = self.forklifts
+        return [cell for cell in index.reachable_cells() if cell not in forklifts]
+
+    def build_graph(self):
+        """Constrói o MarketGraph do layout."""
+        return MarketGraph.from_grid(self.rows, self.cols, self.obstacles())
+
+    def build_grid_graph(self):
+        """Constrói o GridGraph (4-conectado) do layout."""
+        return GridGraph(self.rows, self.cols, blocked=self.obstacles())
@@ -0,0 +1,238 @@
+"""
+Leitura e gravação de layouts de loja em mapas ASCII/CSV editáveis e em formato binário compacto.
+
+Formato binário (.sqm):
+    cabeçalho de 16 bytes, little-endian: b"SQML", versão (uint16), reservado (uint16),
+    linhas (uint32), colunas (uint32); seguido de linhas * colunas bytes com o tipo de
+    cada célula, linha por linha.
+
+Mapas ASCII usam um caractere por célula; mapas CSV usam os mesmos caracteres
+separados por vírgula:
+    .  chão          #  corredor/prateleira   P  produto
+    F  empilhadeira  C  caixa                 S  posição inicial do carrinho
+"""
+import mmap
+import os
+import struct
+
+from src.data.grid_graph import GridGraph
+from src.data.market_graph import MarketGraph
+from src.data.layout import MarketLayout
+
+FLOOR, CORRIDOR, PRODUCT, FORKLIFT, CASHIER, START = range(6)
+
+SYMBOLS = ".#PFCS"
+_CODE_OF = {symbol: code for code, symbol in enumerate(SYMBOLS)}
+
+MAGIC = b"SQML"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+
+# Tipo de célula -> ocupação (1 = livre, 0 = bloqueada), aplicado com bytes.translate
+_OCCUPANCY = bytes([1, 0, 0, 0, 1, 1]) + bytes(250)
+# Tipo de célula -> caractere ASCII
+_TO_ASCII = SYMBOLS.encode("ascii") + b"?" * 250
+_FROM_ASCII = bytes(_CODE_OF.get(chr(byte), 255) for byte in range(256))
+
+
+class CellLayout:
+    """Layout como um array compacto de tipos de célula (um byte por célula)."""
+
+    def __init__(self, rows, cols, cells=None):
+        """
+        Inicializa o layout.
+
+        Args:
+            rows: Número de linhas
+            cols: Número de colunas
+            cells: Objeto bytes-like com rows * cols tipos de célula (padrão: só chão)
+        """
+        if rows <= 0 or cols <= 0:
+            raise ValueError("O layout deve ter pelo menos uma linha e uma coluna.")
+        if cells is None:
+            cells = bytearray(rows * cols)
+        if len(cells) != rows * cols:
+            raise ValueError(f"Esperados {rows * cols} tipos de célula, recebidos {len(cells)}.")
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+
+    def __eq__(self, other):
+        if not isinstance(other, CellLayout):
+            return NotImplemented
+        return (self.rows, self.cols) == (other.rows, other.cols) and bytes(self.cells) == bytes(other.cells)
+
+    def positions(self, cell_type):
+        """Retorna as células (i, j) de um tipo, em ordem de linha."""
+        cells = bytes(self.cells)
+        code = bytes([cell_type])
+        result = []
+        index = cells.find(code)
+        while index != -1:
+            result.append(divmod(index, self.cols))
+            index = cells.find(code, index + 1)
+        return result
+
+    def occupancy(self):
+        """Retorna o grid de ocupação (1 = livre, 0 = bloqueada) sem percorrer célula por célula em Python."""
+        return bytes(self.cells).translate(_OCCUPANCY)
+
+    def to_grid_graph(self, connectivity=4):
+        """Constrói um GridGraph diretamente do array de células."""
+        return GridGraph.from_cells(self.rows, self.cols, self.occupancy(), connectivity)
+
+    def to_market_graph(self):
+        """Constrói um MarketGraph em grid com os obstáculos do layout."""
+        occupancy = self.occupancy()
+        obstacles = set()
+        index = occupancy.find(0)
+        while index != -1:
+            obstacles.add(divmod(index, self.cols))
+            index = occupancy.find(0, index + 1)
+        return MarketGraph.from_grid(self.rows, self.cols, obstacles)
+
+    def to_market_layout(self):
+        """Converte para um MarketLayout (conjuntos de corredores, produtos, etc.)."""
+        starts = self.positions(START)
+        layout = MarketLayout(self.rows, self.cols, cashiers=self.positions(CASHIER),
+                              corridors=self.positions(CORRIDOR), start=starts[0] if starts else (0, 0))
+        layout.products = set(self.positions(PRODUCT))
+        layout.forklifts = set(self.positions(FORKLIFT))
+        return layout
+
+    @classmethod
+    def from_market_layout(cls, layout):
+        """Cria o array de células a partir de um MarketLayout."""
+        result = cls(layout.rows, layout.cols)
+        cells = result.cells
+        cols = layout.cols
+        for cell_type, positions in ((CORRIDOR, layout.corridors), (PRODUCT, layout.products),
+                                     (FORKLIFT, layout.forklifts), (CASHIER, layout.cashiers),
+                                     (START, (layout.start,))):
+            for i, j in positions:
+                cells[i * cols + j] = cell_type
+        return result
+
+    # ------------------------------------------------------------------ binário
+
+    def to_bytes(self):
+        """Serializa no formato binário (cabeçalho + tipos de célula)."""
+        return HEADER.pack(MAGIC, FORMAT_VERSION, 0, self.rows, self.cols) + bytes(self.cells)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Lê o formato binário de um objeto bytes-like (bytes, memoryview, mmap).
+
+        Raises:
+            ValueError: Se o cabeçalho ou o tamanho forem inválidos
+        """
+        if len(data) < HEADER.size:
+            raise ValueError("Arquivo de layout binário truncado.")
+        magic, version, _, rows, cols = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Arquivo não é um layout binário SQML.")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Versão de layout binário não suportada: {version}.")
+        end = HEADER.size + rows * cols
+        if len(data) < end:
+            raise ValueError("Arquivo de layout binário truncado.")
+        return cls(rows, cols, bytearray(data[HEADER.size:end]))
+
+    # ------------------------------------------------------------------ texto
+
+    def to_ascii(self):
+        """Formata como mapa ASCII, uma linha de texto por linha do grid."""
+        text = bytes(self.cells).translate(_TO_ASCII).decode("ascii")
+        cols = self.cols
+        return "\n".join(text[start:start + cols] for start in range(0, len(text), cols)) + "\n"
+
+    def to_csv(self):
+        """Formata como CSV, um caractere por célula."""
+        return "".join(",".join(line) + "\n" for line in self.to_ascii().splitlines())
+
+    @classmethod
+    def from_ascii(cls, text):
+        """
+        Lê um mapa ASCII; linhas vazias e espaços nas pontas são ignorados.
+
+        Raises:
+            ValueError: Se as linhas tiverem larguras diferentes ou houver símbolos desconhecidos
+        """
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        return cls._from_lines(lines)
+
+    @classmethod
+    def from_csv(cls, text):
+        """Lê um mapa CSV com um caractere por célula."""
+        lines = ["".join(value.strip() for value in line.split(",")) for line in text.splitlines() if line.strip()]
+        return cls._from_lines(lines)
+
+    @classmethod
+    def _from_lines(cls, lines):
+        if not lines:
+            raise ValueError("Mapa de layout vazio.")
+        cols = len(lines[0])
+        for number, line in enumerate(lines, 1):
+            if len(line) != cols:
+                raise ValueError(f"Linha {number} tem {len(line)} células; esperadas {cols}.")
+        cells = bytearray("".join(lines).encode("ascii", "replace").translate(_FROM_ASCII))
+        if 255 in cells:
+            index = cells.index(255)
+            symbol = lines[index // cols][index % cols]
+            raise ValueError(f"Símbolo desconhecido {symbol!r} na linha {index // cols + 1}.")
+        return cls(len(lines), cols, cells)
+
+
+def load_binary(path):
+    """
+    Carrega um layout binário mapeando o arquivo em memória com mmap.
+
+    Args:
+        path: Caminho do arquivo .sqm
+
+    Returns:
+        CellLayout: Layout carregado
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise ValueError("Arquivo de layout binário vazio.")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return CellLayout.from_bytes(mapped)
+
+
+def load_layout(path):
+    """
+    Carrega um layout escolhendo o formato pela extensão (.sqm, .csv ou texto ASCII).
+
+    Returns:
+        CellLayout: Layout carregado
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".sqm":
+        return load_binary(path)
+    with open(path, encoding="utf-8") as file:
+        text = file.read()
+    if extension == ".csv":
+        return CellLayout.from_csv(text)
+    return CellLayout.from_ascii(text)
+
+
+def save_layout(layout, path):
+    """
+    Salva um layout (CellLayout ou MarketLayout) escolhendo o formato pela extensão.
+
+    Args:
+        layout: Layout a ser salvo
+        path: Caminho de destino (.sqm, .csv ou qualquer outra para ASCII)
+    """
+    if isinstance(layout, MarketLayout):
+        layout = CellLayout.from_market_layout(layout)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".sqm":
+        with open(path, "wb") as file:
+            file.write(layout.to_bytes())
+        return
+    text = layout.to_csv() if extension == ".csv" else layout.to_ascii()
+    with open(path, "w", encoding="utf-8", newline="\n") as file:
+        file.write(text)
@@ -4,6 +4,46 @@ class MarketGraph:
     def __init__(self):
         """Inicializa o grafo como um dicionário vazio."""
         self.graph = {}
+        # Incrementado a cada alteração, permite que índices derivados detectem mudanças
+        self.version = 0
+        # Dimensões (linhas, colunas) quando o grafo representa um grid; ver from_grid
+        self.grid_size = None
+        # Células do grid que estão bloqueadas (corredores, produtos, empilhadeiras)
+        self.obstacles = set()
+        # Objetos notificados a cada bloqueio/liberação (ex.: RoutingIndex)
+        self._listeners = []
+
+    @classmethod
+    def from_grid(cls, rows, cols, obstacles=()):
+        """Cria o grafo de um grid rows x cols, 4-conectado, sem as células bloqueadas.
+
+        Cada célula livre vira um vértice e é ligada às células livres acima, à
+        esquerda, abaixo e à direita, nessa ordem. A construção é O(células).
+
+        Args:
+            rows: Número de linhas do grid.
+            cols: Número de colunas do grid.
+            obstacles: Células (i, j) bloqueadas.
+
+        Returns:
+            MarketGraph: Novo grafo com grid_size e obstacles preenchidos.
+        """
+        graph = cls()
+        graph.grid_size = (rows, cols)
+        graph.obstacles = set(obstacles)
+        blocked = graph.obstacles
+        adjacency = graph.graph
+        for i in range(rows):
+            for j in range(cols):
+                if (i, j) in blocked:
+                    continue
+                neighbors = []
+                for neighbor in ((i - 1, j), (i, j - 1), (i + 1, j), (i, j + 1)):
+                    if 0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols and neighbor not in blocked:
+                        neighbors.append(neighbor)
+                adjacency[(i, j)] = neighbors
+        graph.version = 1
+        return graph
 
     def add_vertex(self, vertex):
         """Adiciona um vértice ao grafo se ele não existir e for uma tupla válida.
@@ -15,6 +55,7 @@ class MarketGraph:
             raise ValueError("Vértice deve ser uma tupla (i, j) com inteiros.")
         if vertex not in self.graph:
             self.graph[vertex] = []
+            self.version += 1
 
     def add_edge(self, v1, v2):
         """Adiciona uma aresta bidirecional entre v1 e v2.
@@ -27,9 +68,112 @@ class MarketGraph:
         self.add_vertex(v2)
         if v2 not in self.graph[v1]:  # Evita duplicatas
             self.graph[v1].append(v2)
+            self.version += 1
         if v1 not in self.graph[v2]:  # Evita duplicatas
             self.graph[v2].append(v1)
+            self.version += 1
+
+    def remove_vertex(self, vertex):
+        """Remove um vértice e todas as suas arestas.
+
+        Args:
+            vertex: O vértice a ser removido (tupla (i, j)).
+
+        Returns:
+            list: Vizinhos que o vértice tinha antes da remoção (vazia se não existia).
+        """
+        neighbors = self._detach(vertex)
+        if neighbors is None:
+            return []
+        self.version += 1
+        return neighbors
+
+    def _detach(self, vertex):
+        """Remove o vértice e suas arestas sem alterar a versão; retorna os vizinhos antigos ou None."""
+        neighbors = self.graph.pop(vertex, None)
+        if neighbors is None:
+            return None
+        for neighbor in neighbors:
+            self.graph[neighbor].remove(vertex)
+        return neighbors
     
+    def subscribe(self, listener):
+        """Registra um objeto a ser notificado quando células forem bloqueadas ou liberadas.
+
+        O objeto deve implementar `cell_blocked(vertex, neighbors)` e `cell_unblocked(vertex)`.
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Remove um objeto registrado com subscribe."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _grid_neighbors(self, vertex):
+        """Retorna as células do grid adjacentes a vertex que estão livres."""
+        if self.grid_size is None:
+            raise ValueError("Operação disponível apenas para grafos criados com from_grid.")
+        rows, cols = self.grid_size
+        i, j = vertex
+        return [neighbor for neighbor in ((i - 1, j), (i, j - 1), (i + 1, j), (i, j + 1))
+                if 0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols and neighbor not in self.obstacles]
+
+    def block_cell(self, vertex):
+        """Bloqueia uma célula do grid, removendo apenas o vértice e suas arestas.
+
+        Args:
+            vertex: Célula (i, j) a ser bloqueada.
+
+        Returns:
+            bool: True se a célula estava livre e foi bloqueada.
+        """
+        if vertex in self.obstacles:
+            return False
+        self.obstacles.add(vertex)
+        neighbors = self._detach(vertex) or []
+        self.version += 1  # Exatamente uma versão por mudança notificada
+        for listener in self._listeners:
+            listener.cell_blocked(vertex, neighbors)
+        return True
+
+    def unblock_cell(self, vertex):
+        """Libera uma célula do grid, recriando apenas o vértice e as arestas para vizinhos livres.
+
+        Args:
+            vertex: Célula (i, j) a ser liberada.
+
+        Returns:
+            bool: True se a célula estava bloqueada e foi liberada.
+        """
+        if vertex not in self.obstacles:
+            return False
+        neighbors = self._grid_neighbors(vertex)
+        self.obstacles.discard(vertex)
+        self.graph[vertex] = neighbors
+        for neighbor in neighbors:
+            self.graph[neighbor].append(vertex)
+        self.version += 1
+        for listener in self._listeners:
+            listener.cell_unblocked(vertex)
+        return True
+
+    def move_obstacle(self, old, new):
+        """Move um obstáculo de old para new (ex.: uma empilhadeira andando uma célula).
+
+        Args:
+            old: Célula bloqueada atual.
+            new: Célula livre de destino.
+
+        Returns:
+            bool: True se o obstáculo foi movido.
+        """
+        if old not in self.obstacles or new in self.obstacles or new not in self.graph:
+            return False
+        self.unblock_cell(old)
+        self.block_cell(new)
+        return True
+
     def get_vertices(self):
         """Retorna a lista de todos os vértices do grafo.
         
@@ -1,10 +1,24 @@
 import sys
 import os
+import argparse
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import tkinter as tk
+from src.data.layout_io import load_layout
+from src.utils import instrumentation
 from src.utils.visualization import MarketApp
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mercado Inteligente - Navegação Otimizada")
+    parser.add_argument("--layout", help="Mapa da loja (.sqm binário, .csv ou ASCII)")
+    parser.add_argument("--no-instrumentation", action="store_true",
+                        help="Não coleta contadores e tempos de fase das buscas")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Mede a memória de cada fase com tracemalloc (mais lento)")
+    args = parser.parse_args()
+    if not args.no_instrumentation:
+        instrumentation.enable(trace_memory=args.trace_memory)
+    layout = load_layout(args.layout).to_market_layout() if args.layout else None
+
     root = tk.Tk()
-    app = MarketApp(root)
-    root.mainloop()
\ No newline at end of file
+    app = MarketApp(root, layout)
+    root.mainloop()
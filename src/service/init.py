@@ -0,0 +1,3 @@
+"""
+Módulo do serviço local de rotas para os coletores da loja (asyncio, JSON por linha sobre TCP).
+"""
@@ -0,0 +1,464 @@
+"""
+Serviço local de rotas para os coletores da loja, sem interface gráfica.
+
+Um servidor asyncio recebe consultas em JSON (um objeto por linha, sobre TCP) e
+responde com a rota até o caixa mais próximo. Consultas idênticas feitas ao mesmo
+tempo são respondidas por um único cálculo, e as que chegam na mesma janela de
+1 ms são resolvidas juntas: com o mecanismo padrão ("field"), um único campo de
+distâncias multi-origem (batch.distance_field) atende o lote inteiro e fica
+guardado para as próximas consultas da mesma versão. Os cálculos rodam em um
+executor, de modo que o loop de eventos continua aceitando conexões.
+
+O layout é um instantâneo imutável com número de versão. Uma atualização monta o
+novo instantâneo à parte e o publica com uma única atribuição: as consultas já em
+andamento terminam na versão antiga, as novas usam a nova, e cada resposta informa
+a versão usada.
+
+Protocolo (cada resposta traz o mesmo "id" da requisição):
+    {"id": 1, "op": "route", "start": [i, j]}
+        -> {"id": 1, "version": 0, "path": [[i, j], ...], "cashier": [i, j], "steps": 12}
+    {"id": 2, "op": "route", "start": [i, j], "engine": "astar", "cashiers": [[i, j]]}
+    {"id": 3, "op": "update", "block": [[i, j]], "unblock": [], "expected_version": 0}
+        -> {"id": 3, "version": 1}
+    {"id": 4, "op": "layout", "ascii": "....\\n.C.."}  (substitui a planta inteira)
+    {"id": 5, "op": "stats"}
+    Erros: {"id": ..., "error": "mensagem"}
+
+Uso:
+    python -m src.service.server --size 200 --port 8765
+    python -m src.service.server --layout loja.sqm --host 0.0.0.0
+"""
+import argparse
+import asyncio
+import json
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from src.data.grid_graph import GridGraph
+from src.data.layout import MarketLayout
+from src.data.layout_io import CASHIER, CellLayout, load_layout
+from src.algorithms.batch import distance_field, occupancy_grid
+from src.algorithms.bfs import bfs
+from src.algorithms.jps import jps
+from src.algorithms.weighted import astar
+
+# Mecanismos de busca individuais; "field" (padrão) usa o campo multi-origem em lote
+ENGINES = {
+    "bfs": bfs,
+    "astar": lambda graph, start, goals: astar(graph, start, goals)[:2],
+    "jps": jps,
+}
+FIELD = "field"
+
+
+class LayoutSnapshot:
+    """Layout em uma versão. Nunca é alterado depois de publicado."""
+
+    # Campos de distância guardados por instantâneo (um por conjunto de caixas)
+    MAX_FIELDS = 8
+
+    def __init__(self, version, grid, cashiers):
+        """
+        Args:
+            version: Número da versão
+            grid: GridGraph 4-conectado com a ocupação desta versão
+            cashiers: Lista de caixas (i, j) padrão
+        """
+        self.version = version
+        self.grid = grid
+        self.cashiers = list(cashiers)
+        self._fields = {}
+
+    def checked_cell(self, vertex):
+        """Valida uma célula vinda do cliente: par [i, j] de inteiros dentro do grid (sem conversões)."""
+        if (not isinstance(vertex, (list, tuple)) or len(vertex) != 2
+                or not all(isinstance(value, int) and not isinstance(value, bool) for value in vertex)):
+            raise ValueError(f"Célula inválida: {vertex!r} (esperado [i, j] com inteiros).")
+        i, j = vertex
+        if not (0 <= i < self.grid.rows and 0 <= j < self.grid.cols):
+            raise ValueError(f"Célula {(i, j)} fora do grid {self.grid.rows}x{self.grid.cols}.")
+        return i, j
+
+    def field(self, cashiers):
+        """Campo (distâncias, índices dos caixas, próximos passos), calculado uma vez por conjunto de caixas."""
+        key = tuple(cashiers)
+        cached = self._fields.get(key)
+        if cached is None:
+            _, _, dist, owner, parent = distance_field(self.grid, cashiers)
+            cached = dist, owner, parent
+            if len(self._fields) >= self.MAX_FIELDS:
+                del self._fields[next(iter(self._fields))]
+            self._fields[key] = cached
+        return cached
+
+    def routes_from_field(self, starts, cashiers):
+        """Rotas de vários inícios lidas de um único campo de distâncias."""
+        dist, owner, parent = self.field(cashiers)
+        cols = self.grid.cols
+        routes = []
+        for i, j in starts:
+            cell = i * cols + j
+            if dist[cell] < 0:
+                routes.append((None, None))
+                continue
+            path = [(i, j)]
+            while dist[cell] > 0:
+                cell = int(parent[cell])
+                path.append(divmod(cell, cols))
+            routes.append((path, cashiers[int(owner[cell])]))
+        return routes
+
+    def apply(self, block=(), unblock=()):
+        """
+        Monta a versão seguinte com as células bloqueadas/liberadas (tudo ou nada).
+
+        Raises:
+            ValueError: Se alguma célula for inválida ou se um caixa fosse bloqueado
+        """
+        block = [self.checked_cell(vertex) for vertex in block]
+        unblock = [self.checked_cell(vertex) for vertex in unblock]
+        cashiers = set(self.cashiers)
+        for vertex in block:
+            if vertex in cashiers:
+                raise ValueError(f"Não é possível bloquear o caixa {vertex}.")
+        grid = GridGraph.from_cells(self.grid.rows, self.grid.cols, self.grid.cells)
+        cols = grid.cols
+        for i, j in block:
+            grid.cells[i * cols + j] = 0
+        for i, j in unblock:
+            grid.cells[i * cols + j] = 1
+        return LayoutSnapshot(self.version + 1, grid, self.cashiers)
+
+
+class RouteService:
+    """Consultas de rota com agrupamento, sobre instantâneos versionados do layout."""
+
+    def __init__(self, graph, cashiers, grid_size=None, window=0.001, executor=None):
+        """
+        Inicializa o serviço.
+
+        Args:
+            graph: MarketGraph em grid ou GridGraph (a ocupação é copiada)
+            cashiers: Lista de caixas (i, j)
+            grid_size: (linhas, colunas), se não puder ser obtido do grafo
+            window: Janela de agrupamento das consultas, em segundos
+            executor: Executor dos cálculos (padrão: ThreadPoolExecutor com 1 thread)
+        """
+        rows, cols, cells = occupancy_grid(graph, grid_size)
+        self._snapshot = LayoutSnapshot(0, GridGraph.from_cells(rows, cols, cells), cashiers)
+        self.window = window
+        self._executor = executor or ThreadPoolExecutor(max_workers=1)
+        self._own_executor = executor is None
+        self._pending = {}  # Chave -> (instantâneo, future), aguardando o fim da janela
+        self._inflight = {}  # Chave -> future, da chegada até a resposta
+        self._flush_handle = None
+        self._update_lock = None
+        self.stats = Counter()
+
+    @classmethod
+    def from_layout(cls, layout, **options):
+        """Cria o serviço a partir de um MarketLayout ou CellLayout."""
+        if isinstance(layout, MarketLayout):
+            return cls(layout.build_grid_graph(), layout.cashiers, **options)
+        return cls(layout.to_grid_graph(), layout.positions(CASHIER), **options)
+
+    @property
+    def version(self):
+        """Versão do layout publicado."""
+        return self._snapshot.version
+
+    def close(self):
+        """Libera o executor criado pelo serviço."""
+        if self._own_executor:
+            self._executor.shutdown(wait=False)
+
+    # ------------------------------------------------------------------ consultas
+
+    async def route(self, start, cashiers=None, engine=FIELD):
+        """
+        Calcula a rota até o caixa mais próximo na versão atual do layout.
+
+        Args:
+            start: Célula (i, j) do carrinho
+            cashiers: Caixas a considerar (padrão: todos os do layout)
+            engine: "field" (campo em lote) ou um dos mecanismos em ENGINES
+
+        Returns:
+            tuple: (versão, caminho, caixa); caminho e caixa são None sem caminho
+        """
+        if engine != FIELD and engine not in ENGINES:
+            raise ValueError(f"Mecanismo desconhecido: {engine}.")
+        snapshot = self._snapshot
+        start = snapshot.checked_cell(start)
+        if cashiers is not None:
+            cashiers = tuple(snapshot.checked_cell(cashier) for cashier in cashiers)
+        key = (snapshot.version, engine, start, cashiers)
+        self.stats["queries"] += 1
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._inflight[key] = future
+            self._pending[key] = (snapshot, future)
+            if self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.window, self._flush, loop)
+        # shield: um cliente que desiste não cancela a resposta de quem pediu a mesma rota
+        path, cashier = await asyncio.shield(future)
+        return snapshot.version, path, cashier
+
+    def _flush(self, loop):
+        """Fim da janela: envia o lote acumulado para o executor."""
+        self._flush_handle = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        self.stats["batches"] += 1
+        work = loop.run_in_executor(self._executor, self._solve, batch)
+        work.add_done_callback(lambda done: self._deliver(batch, done))
+
+    def _solve(self, batch):
+        """Resolve um lote (no executor): um campo ou uma busca por grupo de consultas iguais."""
+        groups = {}
+        for key, (snapshot, _) in batch.items():
+            _, engine, _, cashiers = key
+            groups.setdefault((snapshot, engine, cashiers), []).append(key)
+        results = {}
+        for (snapshot, engine, cashiers), keys in groups.items():
+            goals = list(cashiers) if cashiers is not None else snapshot.cashiers
+            starts = [key[2] for key in keys]
+            if engine == FIELD:
+                routes = snapshot.routes_from_field(starts, goals)
+            else:
+                search = ENGINES[engine]
+                routes = [search(snapshot.grid, start, goals) for start in starts]
+            results.update(zip(keys, routes))
+        return results, len(groups)
+
+    def _deliver(self, batch, done):
+        """Entrega os resultados (ou o erro) do lote a todos que esperam por eles."""
+        error = done.exception()
+        if error is None:
+            results, computations = done.result()
+            self.stats["computations"] += computations
+        for key, (_, future) in batch.items():
+            self._inflight.pop(key, None)
+            if future.done():
+                continue
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(results[key])
+
+    # ------------------------------------------------------------------ atualizações
+
+    async def _publish(self, build, expected_version):
+        """Monta a nova versão no executor e a publica, uma atualização por vez."""
+        if self._update_lock is None:
+            self._update_lock = asyncio.Lock()
+        async with self._update_lock:
+            current = self._snapshot
+            if expected_version is not None and expected_version != current.version:
+                raise ValueError(f"Versão esperada {expected_version}, mas a atual é {current.version}.")
+            snapshot = await asyncio.get_running_loop().run_in_executor(self._executor, build, current)
+            self._snapshot = snapshot  # Troca atômica: uma única atribuição no loop de eventos
+            self.stats["updates"] += 1
+            return snapshot.version
+
+    async def update(self, block=(), unblock=(), expected_version=None):
+        """
+        Bloqueia e libera células de uma só vez, criando uma nova versão do layout.
+
+        Args:
+            block: Células (i, j) a bloquear
+            unblock: Células (i, j) a liberar
+            expected_version: Se informada, a atualização só é aplicada sobre essa versão
+
+        Returns:
+            int: Nova versão
+        """
+        return await self._publish(lambda current: current.apply(block, unblock), expected_version)
+
+    async def replace_layout(self, layout, expected_version=None):
+        """Substitui a planta inteira (MarketLayout ou CellLayout) por uma nova versão."""
+        if isinstance(layout, MarketLayout):
+            graph, cashiers = layout.build_grid_graph(), layout.cashiers
+        else:
+            graph, cashiers = layout.to_grid_graph(), layout.positions(CASHIER)
+        return await self._publish(lambda current: LayoutSnapshot(current.version + 1, graph, cashiers),
+                                   expected_version)
+
+    # ------------------------------------------------------------------ protocolo
+
+    async def handle(self, request):
+        """
+        Atende uma requisição do protocolo JSON já decodificada.
+
+        Returns:
+            dict: Resposta com o mesmo "id" (ou "error" se a requisição for inválida)
+        """
+        response = {"id": request.get("id")} if isinstance(request, dict) else {"id": None}
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("A requisição deve ser um objeto JSON.")
+            op = request.get("op", "route")
+            if op == "route":
+                version, path, cashier = await self.route(request["start"], request.get("cashiers"),
+                                                          request.get("engine", FIELD))
+                response.update(version=version, path=[list(vertex) for vertex in path] if path else None,
+                                cashier=list(cashier) if cashier else None,
+                                steps=len(path) - 1 if path else -1)
+            elif op == "update":
+                response["version"] = await self.update(request.get("block", ()), request.get("unblock", ()),
+                                                        request.get("expected_version"))
+            elif op == "layout":
+                if not isinstance(request["ascii"], str):
+                    raise ValueError("O campo ascii deve ser o mapa em texto.")
+                response["version"] = await self.replace_layout(CellLayout.from_ascii(request["ascii"]),
+                                                                request.get("expected_version"))
+            elif op == "stats":
+                response.update(self.stats, version=self.version)
+            else:
+                raise ValueError(f"Operação desconhecida: {op}.")
+        except KeyError as error:
+            response["error"] = f"Campo obrigatório ausente: {error.args[0]}."
+        except (ValueError, TypeError) as error:
+            response["error"] = str(error)
+        except Exception as error:  # Qualquer outra falha ainda responde ao cliente, que não pode ficar esperando
+            response["error"] = f"Erro interno: {type(error).__name__}: {error}"
+        return response
+
+
+class RouteServer:
+    """Servidor TCP (JSON por linha) sobre um RouteService."""
+
+    # Tamanho máximo de uma requisição; o padrão do asyncio (64 KiB) não comporta plantas a partir de ~256x256
+    MAX_LINE = 64 * 1024 * 1024
+
+    def __init__(self, service, host="127.0.0.1", port=8765, limit=MAX_LINE):
+        """
+        Args:
+            service: RouteService atendido
+            host: Endereço de escuta
+            port: Porta (0 escolhe uma porta livre, disponível em `port` após start)
+            limit: Bytes máximos de uma linha (requisição); linhas maiores recebem erro
+        """
+        self.service = service
+        self.host = host
+        self.port = port
+        self.limit = limit
+        self._server = None
+
+    async def start(self):
+        """Começa a aceitar conexões."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, limit=self.limit)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Inicia (se preciso) e atende até ser cancelado."""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Para de aceitar conexões."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    @staticmethod
+    async def _read_line(reader):
+        """
+        Lê a próxima linha da conexão.
+
+        Returns:
+            bytes ou None: A linha (b"" no fim da conexão), ou None se ela passou do
+            limite; nesse caso a linha inteira é descartada e a conexão continua utilizável
+        """
+        try:
+            return await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as error:
+            return error.partial  # Fim da conexão: última linha sem quebra (ou vazia)
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+        while True:
+            try:
+                await reader.readexactly(consumed)
+                await reader.readuntil(b"\n")
+                return None
+            except asyncio.IncompleteReadError:
+                return None
+            except asyncio.LimitOverrunError as error:
+                consumed = error.consumed
+
+    async def _handle_connection(self, reader, writer):
+        """Lê requisições de uma conexão e responde cada uma assim que fica pronta (fora de ordem)."""
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(line):
+            if line is None:
+                response = {"id": None, "error": f"Requisição maior que o limite de {self.limit} bytes."}
+            else:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"id": None, "error": "JSON inválido."}
+                else:
+                    response = await self.service.handle(request)
+            async with lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                line = await self._read_line(reader)
+                if line == b"":
+                    break
+                if line is None or line.strip():
+                    task = asyncio.ensure_future(respond(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def main(argv=None):
+    """Ponto de entrada de linha de comando: serve rotas até ser interrompido."""
+    parser = argparse.ArgumentParser(prog="python -m src.service.server",
+                                     description="Serviço local de rotas (JSON por linha sobre TCP).")
+    parser.add_argument("--layout", help="Planta da loja (.sqm, .csv ou ASCII); padrão: mercado gerado")
+    parser.add_argument("--size", type=int, default=11, help="Lado do mercado gerado (sem --layout)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--window-ms", type=float, default=1.0, help="Janela de agrupamento das consultas")
+    args = parser.parse_args(argv)
+
+    layout = load_layout(args.layout) if args.layout else MarketLayout(args.size, args.size)
+    service = RouteService.from_layout(layout, window=args.window_ms / 1000)
+    server = RouteServer(service, args.host, args.port)
+
+    async def serve():
+        await server.start()
+        print(f"Servindo rotas em {server.host}:{server.port} (versão {service.version})", file=sys.stderr)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
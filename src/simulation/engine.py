@@ -0,0 +1,342 @@
+"""
+Núcleo da simulação do mercado, sem interface gráfica.
+
+Muitos carrinhos (estado em arrays compactos), empilhadeiras andando e caixas
+atendendo em fila, avançados em passos fixos (ticks). Cada tick move todos os
+carrinhos de uma vez usando o campo de distâncias do RoutingIndex, que é reparado
+localmente quando uma empilhadeira se move. Estatísticas de vazão e latência por
+tick ficam disponíveis em `summary()`, e observadores (ex.: o MarketApp) recebem
+instantâneos do estado com `subscribe`.
+
+Uso:
+    python -m src.simulation.engine --size 100 --ticks 2000 --arrival-rate 2 --service-time 6
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from array import array
+from collections import deque
+
+from src.data.layout import MarketLayout
+from src.algorithms.routing_index import RoutingIndex
+from src.utils.instrumentation import percentile
+
+# Estados de um carrinho
+FREE, WALKING, QUEUED, SERVING = range(4)
+
+
+class TickStats:
+    """Contadores de um tick."""
+
+    __slots__ = ("tick", "elapsed_ms", "spawned", "moved", "served", "stuck", "active", "queued")
+
+    def __init__(self, tick):
+        self.tick = tick
+        self.elapsed_ms = 0.0
+        self.spawned = 0
+        self.moved = 0
+        self.served = 0
+        self.stuck = 0  # Carrinhos sem caminho até um caixa neste tick
+        self.active = 0
+        self.queued = 0
+
+    def as_dict(self):
+        """Converte os contadores em dicionário."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Snapshot:
+    """Instantâneo do estado da simulação enviado aos observadores."""
+
+    __slots__ = ("tick", "carts", "forklifts", "queues", "stats")
+
+    def __init__(self, tick, carts, forklifts, queues, stats):
+        self.tick = tick
+        self.carts = carts  # Células (i, j) ocupadas por carrinhos
+        self.forklifts = forklifts  # Células (i, j) das empilhadeiras
+        self.queues = queues  # Carrinhos em cada caixa (fila + atendimento), na ordem dos caixas
+        self.stats = stats  # TickStats do último tick
+
+
+def poisson(rng, mean):
+    """Sorteia uma quantidade de chegadas com distribuição de Poisson (método de Knuth)."""
+    if mean <= 0:
+        return 0
+    count = 0
+    while mean > 30:  # Divide médias grandes para evitar underflow de exp(-mean)
+        count += poisson(rng, 30)
+        mean -= 30
+    limit = math.exp(-mean)
+    product = rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+class Simulation:
+    """Simulação de vários carrinhos indo aos caixas em um mercado com empilhadeiras."""
+
+    def __init__(self, layout, arrival_rate=1.0, service_time=5, max_carts=10000,
+                 forklift_interval=1, seed=0, history=1000):
+        """
+        Inicializa a simulação.
+
+        Args:
+            layout: MarketLayout com corredores, caixas, produtos e empilhadeiras
+            arrival_rate: Média de carrinhos que entram por tick (Poisson)
+            service_time: Média de ticks de atendimento por carrinho no caixa
+            max_carts: Carrinhos simultâneos no máximo; chegadas acima disso são recusadas
+            forklift_interval: A cada quantos ticks as empilhadeiras andam (0 = paradas)
+            seed: Semente do gerador de números aleatórios
+            history: Ticks guardados para as estatísticas
+        """
+        self.layout = layout
+        self.rows = layout.rows
+        self.cols = layout.cols
+        self.arrival_rate = arrival_rate
+        self.service_time = service_time
+        self.max_carts = max_carts
+        self.forklift_interval = forklift_interval
+        self.rng = random.Random(seed)
+        self.tick = 0
+
+        self.graph = layout.build_graph()
+        self.cashiers = list(layout.cashiers)
+        self._cashier_of = {cashier: index for index, cashier in enumerate(self.cashiers)}
+        self.routing_index = RoutingIndex(self.graph, self.cashiers)
+        self.graph.subscribe(self.routing_index)
+        self.forklifts = sorted(layout.forklifts)
+        self._spawn_cells = layout.reachable_cells()  # Sem bolsões isolados dos caixas
+
+        # Estado dos carrinhos em arrays; posições são ids de célula (i * cols + j)
+        self.position = array("i", [-1]) * max_carts
+        self.state = array("b", [FREE]) * max_carts
+        self.spawn_tick = array("i", [0]) * max_carts
+        self._free_slots = list(range(max_carts - 1, -1, -1))
+        self._walking = []  # Slots dos carrinhos andando
+        # Carrinhos em cada célula ("i": a fila de um caixa pode passar de 65 535 carrinhos)
+        self._cart_count = array("i", [0]) * (self.rows * self.cols)
+
+        # Caixas: fila de slots, carrinho em atendimento (-1 = livre) e ticks restantes
+        self.queues = [deque() for _ in self.cashiers]
+        self.serving = array("i", [-1]) * len(self.cashiers)
+        self.remaining = array("i", [0]) * len(self.cashiers)
+
+        self.history = deque(maxlen=history)
+        self.trip_ticks = deque(maxlen=history * 10)  # Ticks entre a entrada e o fim do atendimento
+        self.total_spawned = 0
+        self.total_served = 0
+        self.rejected = 0
+        self._listeners = []
+
+    # ------------------------------------------------------------------ observadores
+
+    def subscribe(self, listener):
+        """Registra um objeto com o método `simulation_snapshot(snapshot)`, chamado a cada tick."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Remove um objeto registrado com subscribe."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def snapshot(self):
+        """Monta o instantâneo do estado atual."""
+        cols = self.cols
+        position = self.position
+        carts = {divmod(position[slot], cols) for slot in self._walking}
+        carts.update(self.cashiers[index] for index, queue in enumerate(self.queues)
+                     if queue or self.serving[index] >= 0)
+        queues = [len(queue) + (self.serving[index] >= 0) for index, queue in enumerate(self.queues)]
+        stats = self.history[-1] if self.history else TickStats(self.tick)
+        return Snapshot(self.tick, carts, set(self.forklifts), queues, stats)
+
+    # ------------------------------------------------------------------ agentes
+
+    def _spawn(self, count, stats):
+        """Coloca novos carrinhos em células livres aleatórias com caminho até um caixa."""
+        rng = self.rng
+        cols = self.cols
+        graph = self.graph.graph
+        for _ in range(count):
+            if not self._free_slots:
+                self.rejected += 1
+                continue
+            cell = rng.choice(self._spawn_cells)
+            if cell not in graph:  # Empilhadeira parada ali
+                continue
+            slot = self._free_slots.pop()
+            cell_id = cell[0] * cols + cell[1]
+            self.position[slot] = cell_id
+            self.state[slot] = WALKING
+            self.spawn_tick[slot] = self.tick
+            self._cart_count[cell_id] += 1
+            self._walking.append(slot)
+            stats.spawned += 1
+        self.total_spawned += stats.spawned
+
+    def _move_forklifts(self):
+        """Move cada empilhadeira para uma célula vizinha livre, sem carrinhos e que não seja caixa."""
+        rows, cols = self.rows, self.cols
+        graph = self.graph
+        rng = self.rng
+        for index, (i, j) in enumerate(self.forklifts):
+            options = [cell for cell in ((i - 1, j), (i, j - 1), (i + 1, j), (i, j + 1))
+                       if 0 <= cell[0] < rows and 0 <= cell[1] < cols and cell in graph.graph
+                       and cell not in self._cashier_of and not self._cart_count[cell[0] * cols + cell[1]]]
+            if options:
+                new = rng.choice(options)
+                if graph.move_obstacle((i, j), new):
+                    self.forklifts[index] = new
+
+    def _move_carts(self, stats):
+        """Avança todos os carrinhos andando um passo em direção ao caixa mais próximo."""
+        cols = self.cols
+        next_hop = self.routing_index.next_hop
+        position = self.position
+        cart_count = self._cart_count
+        cashier_of = self._cashier_of
+        still_walking = []
+        for slot in self._walking:
+            cell_id = position[slot]
+            hop = next_hop.get(divmod(cell_id, cols))
+            if hop is None:
+                stats.stuck += 1
+                still_walking.append(slot)
+                continue
+            new_id = hop[0] * cols + hop[1]
+            cart_count[cell_id] -= 1
+            cart_count[new_id] += 1
+            position[slot] = new_id
+            stats.moved += 1
+            cashier = cashier_of.get(hop)
+            if cashier is None:
+                still_walking.append(slot)
+            else:
+                self.state[slot] = QUEUED
+                self.queues[cashier].append(slot)
+        self._walking = still_walking
+
+    def _serve(self, stats):
+        """Atende os carrinhos nos caixas e libera os que terminaram."""
+        rng = self.rng
+        for index, queue in enumerate(self.queues):
+            slot = self.serving[index]
+            if slot >= 0:
+                self.remaining[index] -= 1
+                if self.remaining[index] <= 0:
+                    self.trip_ticks.append(self.tick - self.spawn_tick[slot])
+                    self._cart_count[self.position[slot]] -= 1
+                    self.state[slot] = FREE
+                    self.position[slot] = -1
+                    self._free_slots.append(slot)
+                    self.serving[index] = -1
+                    stats.served += 1
+            if self.serving[index] < 0 and queue:
+                slot = queue.popleft()
+                self.state[slot] = SERVING
+                self.serving[index] = slot
+                self.remaining[index] = max(1, round(rng.expovariate(1 / self.service_time)))
+        self.total_served += stats.served
+
+    # ------------------------------------------------------------------ laço principal
+
+    def step(self):
+        """
+        Avança a simulação um tick.
+
+        Returns:
+            TickStats: Contadores do tick
+        """
+        start_time = time.perf_counter()
+        self.tick += 1
+        stats = TickStats(self.tick)
+        if self.forklift_interval and self.tick % self.forklift_interval == 0:
+            self._move_forklifts()
+        self._spawn(poisson(self.rng, self.arrival_rate), stats)
+        self._move_carts(stats)
+        self._serve(stats)
+        stats.active = self.max_carts - len(self._free_slots)
+        stats.queued = sum(len(queue) for queue in self.queues)
+        stats.elapsed_ms = (time.perf_counter() - start_time) * 1000
+        self.history.append(stats)
+        if self._listeners:
+            snapshot = self.snapshot()
+            for listener in list(self._listeners):
+                listener.simulation_snapshot(snapshot)
+        return stats
+
+    def run(self, ticks):
+        """Avança a simulação `ticks` vezes e retorna as estatísticas do último tick."""
+        stats = None
+        for _ in range(ticks):
+            stats = self.step()
+        return stats
+
+    def summary(self):
+        """
+        Estatísticas de vazão e latência na janela de ticks guardada.
+
+        Returns:
+            dict: Totais, atendimentos por tick, tempo de processamento por tick (ms) e
+            duração das viagens (ticks)
+        """
+        window = list(self.history)
+        latencies = [stats.elapsed_ms for stats in window]
+        served = sum(stats.served for stats in window)
+        trips = list(self.trip_ticks)
+        return {
+            "tick": self.tick,
+            "spawned": self.total_spawned,
+            "served": self.total_served,
+            "rejected": self.rejected,
+            "active": self.max_carts - len(self._free_slots),
+            "window_ticks": len(window),
+            "served_per_tick": served / len(window) if window else 0.0,
+            "stuck_per_tick": sum(stats.stuck for stats in window) / len(window) if window else 0.0,
+            "mean_queued": sum(stats.queued for stats in window) / len(window) if window else 0.0,
+            "tick_ms_mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "tick_ms_p50": percentile(latencies, 0.5),
+            "tick_ms_p95": percentile(latencies, 0.95),
+            "tick_ms_max": max(latencies, default=0.0),
+            "trip_ticks_mean": sum(trips) / len(trips) if trips else 0.0,
+            "trip_ticks_p95": percentile(trips, 0.95),
+        }
+
+
+def main(argv=None):
+    """Ponto de entrada de linha de comando: roda uma simulação e imprime o resumo em JSON."""
+    parser = argparse.ArgumentParser(prog="python -m src.simulation.engine",
+                                     description="Simulação do mercado sem interface gráfica.")
+    parser.add_argument("--size", type=int, default=100, help="Lado do grid quadrado")
+    parser.add_argument("--density", type=float, default=0.05, help="Fração de posições com produtos")
+    parser.add_argument("--forklifts", type=int, default=10)
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--arrival-rate", type=float, default=1.0, help="Carrinhos por tick")
+    parser.add_argument("--service-time", type=float, default=5, help="Ticks de atendimento (média)")
+    parser.add_argument("--max-carts", type=int, default=10000)
+    parser.add_argument("--forklift-interval", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    layout = MarketLayout.random(args.size, args.size, density=args.density, n_forklifts=args.forklifts,
+                                 rng=random.Random(args.seed))
+    simulation = Simulation(layout, args.arrival_rate, args.service_time, args.max_carts,
+                            args.forklift_interval, args.seed, history=args.ticks)
+    start_time = time.perf_counter()
+    simulation.run(args.ticks)
+    summary = simulation.summary()
+    summary["wall_s"] = round(time.perf_counter() - start_time, 3)
+    summary["ticks_per_s"] = round(args.ticks / summary["wall_s"], 1) if summary["wall_s"] else None
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+"""
+Módulo de simulação do mercado sem interface gráfica (muitos carrinhos, empilhadeiras e caixas).
+"""
@@ -0,0 +1,417 @@
+"""
+Simulação de eventos discretos das filas dos caixas.
+
+Em vez de avançar em ticks fixos como a Simulation, um heap (heapq) guarda os
+próximos eventos (chegada de um cliente, fim de um atendimento) e o relógio salta
+direto de um evento para o outro. Cada cliente chega com uma cesta de N itens; o
+tempo de atendimento é uma parte fixa mais um tempo por item, dividido pela
+velocidade do caixa.
+
+As estimativas correntes de cada caixa (tamanho da fila e espera esperada) ficam
+em QueueEstimates e são atualizadas a cada evento, de modo que o roteamento as lê
+em O(1): `estimates.wait_times` é o dicionário caixa -> espera aceito por
+astar/dijkstra, e `estimates.best_cashier(distâncias)` escolhe o caixa com menor
+caminhada + espera.
+
+No modo replay, as chegadas vêm de um log gravado (CSV com colunas time, items e,
+opcionalmente, cashier), lido como fluxo: só os atendimentos pendentes ficam em
+memória, e o dia inteiro é processado mais rápido que o tempo real (ou em uma
+velocidade fixa, com --speed).
+
+Uso:
+    python -m src.simulation.queues --cashiers 8 --customers 1000000 --arrival-rate 0.12
+    python -m src.simulation.queues --cashiers 8 --replay chegadas.csv --speed 600
+"""
+import argparse
+import csv
+import heapq
+import itertools
+import json
+import random
+import sys
+import time
+from array import array
+from collections import deque
+
+from src.utils.instrumentation import percentile
+
+# Tipos de evento; o tipo vem antes da sequência no heap para que fins de atendimento
+# sejam processados antes de chegadas no mesmo instante
+DEPARTURE, ARRIVAL = 0, 1
+
+
+class QueueEstimates:
+    """Estimativas correntes de fila e espera de cada caixa, com leitura O(1)."""
+
+    def __init__(self, cashiers, service_mean, smoothing=0.05, cost_per_time=1.0):
+        """
+        Inicializa as estimativas com as filas vazias.
+
+        Args:
+            cashiers: Lista de caixas (i, j)
+            service_mean: Tempo médio de atendimento inicial (antes de qualquer observação)
+            smoothing: Peso de cada novo atendimento na média móvel exponencial
+            cost_per_time: Conversão de tempo de espera para custo de rota (ex.: passos por segundo)
+        """
+        self.cashiers = list(cashiers)
+        self.index = {cashier: k for k, cashier in enumerate(self.cashiers)}
+        self.smoothing = smoothing
+        self.cost_per_time = cost_per_time
+        count = len(self.cashiers)
+        self.length = array("i", [0]) * count  # Clientes no caixa (fila + atendimento)
+        self.service_mean = array("d", [float(service_mean)]) * count
+        self.wait = array("d", [0.0]) * count  # Espera esperada de quem chegar agora
+        self.wait_times = {cashier: 0.0 for cashier in self.cashiers}  # Mesma espera, em custo de rota
+
+    def _refresh(self, k):
+        """Recalcula a espera esperada do caixa k (clientes à frente x atendimento médio)."""
+        wait = self.length[k] * self.service_mean[k]
+        self.wait[k] = wait
+        self.wait_times[self.cashiers[k]] = wait * self.cost_per_time
+
+    def observe_service(self, k, duration):
+        """Inclui a duração de um atendimento na média móvel do caixa k."""
+        self.service_mean[k] += self.smoothing * (duration - self.service_mean[k])
+        self._refresh(k)
+
+    def expected_wait(self, cashier):
+        """Espera esperada (em tempo) para quem entrar agora na fila do caixa."""
+        return self.wait[self.index[cashier]]
+
+    def queue_length(self, cashier):
+        """Clientes no caixa agora, contando o que está sendo atendido."""
+        return self.length[self.index[cashier]]
+
+    def best_cashier(self, distances):
+        """
+        Escolhe o caixa com menor custo de caminhada + espera.
+
+        Args:
+            distances: Dicionário caixa -> custo da caminhada (ex.: bfs_distances);
+                caixas ausentes são considerados inalcançáveis
+
+        Returns:
+            tuple: (caixa, custo total) ou (None, None) se nenhum for alcançável
+        """
+        wait_times = self.wait_times
+        best = None
+        best_total = None
+        for cashier, steps in distances.items():
+            total = steps + wait_times.get(cashier, 0.0)
+            if best_total is None or total < best_total:
+                best, best_total = cashier, total
+        return best, best_total
+
+
+class CashierQueueSimulator:
+    """Simulador de eventos discretos de chegadas, cestas e atendimentos nos caixas."""
+
+    def __init__(self, cashiers, arrival_rate=0.08, items_mean=12.0, base_service=20.0, time_per_item=2.5,
+                 speeds=None, policy="shortest_wait", seed=0, smoothing=0.05, cost_per_time=1.0, history=100000):
+        """
+        Inicializa o simulador com todos os caixas livres no instante 0.
+
+        Args:
+            cashiers: Lista de caixas (i, j)
+            arrival_rate: Clientes por unidade de tempo no modo sintético (Poisson)
+            items_mean: Média de itens por cesta (distribuição geométrica, mínimo 1)
+            base_service: Tempo fixo de cada atendimento (pagamento, sacolas)
+            time_per_item: Tempo de passar cada item
+            speeds: Velocidade relativa de cada caixa (padrão: todos 1.0)
+            policy: "shortest_wait" (menor espera estimada) ou "random", para chegadas sem caixa
+            seed: Semente do gerador de números aleatórios
+            smoothing: Peso de cada atendimento na média móvel das estimativas
+            cost_per_time: Conversão de espera para custo de rota em estimates.wait_times
+            history: Esperas guardadas para os percentis
+        """
+        if policy not in ("shortest_wait", "random"):
+            raise ValueError(f"Política desconhecida: {policy}.")
+        self.cashiers = list(cashiers)
+        count = len(self.cashiers)
+        self.arrival_rate = arrival_rate
+        self.items_mean = items_mean
+        self.base_service = base_service
+        self.time_per_item = time_per_item
+        self.speeds = list(speeds) if speeds is not None else [1.0] * count
+        if len(self.speeds) != count:
+            raise ValueError("Informe uma velocidade por caixa.")
+        self.policy = policy
+        self.rng = random.Random(seed)
+        self.estimates = QueueEstimates(self.cashiers, base_service + time_per_item * items_mean,
+                                        smoothing, cost_per_time)
+
+        self.now = 0.0
+        self.start_time = None  # Início do período simulado (primeira chegada ou início do run)
+        self._events = []  # Heap de (instante, tipo, sequência, caixa, duração ou itens)
+        self._sequence = itertools.count()
+        self.queues = [deque() for _ in self.cashiers]  # (chegada, duração) de quem espera
+        self.busy = bytearray(count)
+        self.busy_time = array("d", [0.0]) * count
+        self.served_by = array("i", [0]) * count
+        self.max_length = array("i", [0]) * count
+        self.waits = deque(maxlen=history)
+        self.events = 0
+        self.arrivals = 0
+        self.served = 0
+        self.total_wait = 0.0
+        self._next_arrival = None  # Instante da próxima chegada sintética
+
+    # ------------------------------------------------------------------ modelo
+
+    def basket_size(self):
+        """Sorteia o número de itens de uma cesta (geométrica com média items_mean)."""
+        return 1 + int(self.rng.expovariate(1.0 / max(self.items_mean - 0.5, 1e-9)))
+
+    def service_time(self, k, items):
+        """Tempo para atender uma cesta de `items` itens no caixa k."""
+        return (self.base_service + self.time_per_item * items) / self.speeds[k]
+
+    def choose_cashier(self):
+        """Caixa escolhido por um cliente que chega sem caixa definido."""
+        if self.policy == "random":
+            return self.rng.randrange(len(self.cashiers))
+        wait = self.estimates.wait
+        return min(range(len(wait)), key=wait.__getitem__)
+
+    def schedule_arrival(self, at, items=None, cashier=None):
+        """
+        Agenda a chegada de um cliente.
+
+        Args:
+            at: Instante da chegada (não pode ser anterior ao relógio atual)
+            items: Itens da cesta (padrão: sorteado)
+            cashier: Índice do caixa (None: escolhido pela política na chegada)
+        """
+        if at < self.now:
+            raise ValueError(f"Chegada em {at} anterior ao relógio ({self.now}).")
+        if cashier is not None and (not isinstance(cashier, int) or isinstance(cashier, bool)
+                                    or not 0 <= cashier < len(self.cashiers)):
+            raise ValueError(f"Caixa {cashier!r} inválido na chegada em {at}: "
+                             f"use um índice de 0 a {len(self.cashiers) - 1} ou None.")
+        if items is None:
+            items = self.basket_size()
+        if self.start_time is None:
+            self.start_time = at
+        heapq.heappush(self._events, (at, ARRIVAL, next(self._sequence), cashier, items))
+
+    # ------------------------------------------------------------------ eventos
+
+    def _start_service(self, k, duration):
+        heapq.heappush(self._events, (self.now + duration, DEPARTURE, next(self._sequence), k, duration))
+        self.busy_time[k] += duration
+
+    def _arrive(self, k, items):
+        if k is None:
+            k = self.choose_cashier()
+        duration = self.service_time(k, items)
+        self.arrivals += 1
+        estimates = self.estimates
+        estimates.length[k] += 1
+        if estimates.length[k] > self.max_length[k]:
+            self.max_length[k] = estimates.length[k]
+        if self.busy[k]:
+            self.queues[k].append((self.now, duration))
+        else:
+            self.busy[k] = 1
+            self.waits.append(0.0)
+            self._start_service(k, duration)
+        estimates._refresh(k)
+
+    def _depart(self, k, duration):
+        self.served += 1
+        self.served_by[k] += 1
+        estimates = self.estimates
+        estimates.length[k] -= 1
+        queue = self.queues[k]
+        if queue:
+            arrived, next_duration = queue.popleft()
+            wait = self.now - arrived
+            self.total_wait += wait
+            self.waits.append(wait)
+            self._start_service(k, next_duration)
+        else:
+            self.busy[k] = 0
+        estimates.observe_service(k, duration)
+
+    def step(self):
+        """
+        Processa o próximo evento do heap.
+
+        Returns:
+            bool: False se não havia eventos
+        """
+        if not self._events:
+            return False
+        at, kind, _, k, value = heapq.heappop(self._events)
+        self.now = at
+        self.events += 1
+        if kind == ARRIVAL:
+            self._arrive(k, value)
+        else:
+            self._depart(k, value)
+        return True
+
+    def run(self, until=None, customers=None):
+        """
+        Roda o modo sintético: chegadas de Poisson com taxa arrival_rate.
+
+        Args:
+            until: Instante em que a simulação para (padrão: sem limite)
+            customers: Chegadas geradas no máximo (padrão: sem limite)
+
+        Returns:
+            int: Eventos processados nesta chamada
+        """
+        if until is None and customers is None:
+            raise ValueError("Informe until ou customers.")
+        start_events = self.events
+        if self.start_time is None:
+            self.start_time = self.now
+        generated = 0
+        expovariate = self.rng.expovariate
+        rate = self.arrival_rate
+        if self._next_arrival is None:
+            self._next_arrival = self.now + expovariate(rate)
+        events = self._events
+        step = self.step
+        while True:
+            # Gera a próxima chegada só quando ela é o evento mais próximo: o heap fica pequeno
+            if customers is None or generated < customers:
+                at = self._next_arrival
+                if (until is None or at <= until) and (not events or at <= events[0][0]):
+                    self.schedule_arrival(at)
+                    generated += 1
+                    self._next_arrival = at + expovariate(rate)
+            if not events or (until is not None and events[0][0] > until):
+                break
+            step()
+        if until is not None:
+            self.now = max(self.now, until)
+        return self.events - start_events
+
+    def advance(self, until):
+        """Processa os eventos já agendados até o instante `until` (inclusive)."""
+        events = self._events
+        while events and events[0][0] <= until:
+            self.step()
+        self.now = max(self.now, until)
+
+    def replay(self, arrivals, speed=None, drain=True):
+        """
+        Consome um fluxo de chegadas gravadas, em ordem de tempo.
+
+        Args:
+            arrivals: Iterável de (instante, itens, índice do caixa ou None), ex.: read_arrival_log
+            speed: Tempo simulado por segundo real (padrão: o mais rápido possível)
+            drain: Ao fim do fluxo, atende todos os clientes restantes
+
+        Returns:
+            int: Eventos processados nesta chamada
+        """
+        start_events = self.events
+        wall_start = time.perf_counter()
+        sim_start = None
+        for at, items, cashier in arrivals:
+            if speed:
+                if sim_start is None:
+                    sim_start = at
+                delay = (at - sim_start) / speed - (time.perf_counter() - wall_start)
+                if delay > 0:
+                    time.sleep(delay)
+            self.advance(at)
+            self.schedule_arrival(at, items, cashier)
+        if drain:
+            while self.step():
+                pass
+        return self.events - start_events
+
+    # ------------------------------------------------------------------ resultados
+
+    def summary(self):
+        """Resumo das filas em dicionário serializável em JSON."""
+        waits = list(self.waits)
+        start = self.start_time if self.start_time is not None else self.now
+        # Um replay às 08:00 começa o relógio em 28800: as horas antes do início não contam como ociosas
+        elapsed = (self.now - start) or 1.0
+        return {
+            "time": round(self.now, 3),
+            "start": round(start, 3),
+            "events": self.events,
+            "arrivals": self.arrivals,
+            "served": self.served,
+            "in_system": sum(self.estimates.length),
+            "wait_mean": round(self.total_wait / self.served, 3) if self.served else 0.0,
+            "wait_p50": round(percentile(waits, 0.5), 3),
+            "wait_p95": round(percentile(waits, 0.95), 3),
+            "wait_max": round(max(waits, default=0.0), 3),
+            "cashiers": [{"cashier": list(cashier), "served": self.served_by[k],
+                          "utilization": round(min(1.0, self.busy_time[k] / elapsed), 3),
+                          "max_length": self.max_length[k], "length": self.estimates.length[k],
+                          "expected_wait": round(self.estimates.wait[k], 3)}
+                         for k, cashier in enumerate(self.cashiers)],
+        }
+
+
+def _parse_time(text):
+    """Converte segundos ("75.5") ou horário ("08:01:15") em segundos."""
+    if ":" in text:
+        seconds = 0.0
+        for part in text.split(":"):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    return float(text)
+
+
+def read_arrival_log(path):
+    """
+    Lê um log de chegadas como fluxo, uma linha por vez.
+
+    O CSV tem cabeçalho com as colunas time (segundos ou HH:MM:SS), items e,
+    opcionalmente, cashier (índice do caixa; vazio = escolhido pela política).
+
+    Yields:
+        tuple: (instante, itens, índice do caixa ou None)
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            cashier = (row.get("cashier") or "").strip()
+            yield _parse_time(row["time"].strip()), int(row["items"]), int(cashier) if cashier else None
+
+
+def main(argv=None):
+    """Ponto de entrada de linha de comando: simula ou reproduz um dia e imprime o resumo em JSON."""
+    parser = argparse.ArgumentParser(prog="python -m src.simulation.queues",
+                                     description="Simulação de eventos discretos das filas dos caixas.")
+    parser.add_argument("--cashiers", type=int, default=5, help="Quantidade de caixas")
+    parser.add_argument("--customers", type=int, default=100000, help="Clientes do modo sintético")
+    parser.add_argument("--arrival-rate", type=float, default=0.08, help="Clientes por segundo")
+    parser.add_argument("--items-mean", type=float, default=12.0)
+    parser.add_argument("--base-service", type=float, default=20.0, help="Segundos fixos por atendimento")
+    parser.add_argument("--time-per-item", type=float, default=2.5, help="Segundos por item")
+    parser.add_argument("--policy", choices=("shortest_wait", "random"), default="shortest_wait")
+    parser.add_argument("--replay", help="Log CSV de chegadas (time, items[, cashier]) a reproduzir")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="No replay, segundos simulados por segundo real (padrão: o mais rápido possível)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    cashiers = [(0, k) for k in range(args.cashiers)]
+    simulator = CashierQueueSimulator(cashiers, args.arrival_rate, args.items_mean, args.base_service,
+                                      args.time_per_item, policy=args.policy, seed=args.seed)
+    start_time = time.perf_counter()
+    if args.replay:
+        simulator.replay(read_arrival_log(args.replay), speed=args.speed)
+    else:
+        simulator.run(customers=args.customers)
+        while simulator.step():  # Atende quem ainda está na fila
+            pass
+    summary = simulator.summary()
+    summary["wall_s"] = round(time.perf_counter() - start_time, 3)
+    summary["events_per_s"] = round(simulator.events / summary["wall_s"]) if summary["wall_s"] else None
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
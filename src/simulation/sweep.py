@@ -0,0 +1,253 @@
+"""
+Varredura Monte Carlo de layouts para planejamento de capacidade.
+
+Sorteia milhares de layouts (produtos e empilhadeiras aleatórios sobre uma planta
+base, com as mesmas regras de generate_random_blocks) e posições de carrinho, e
+agrega os passos até o caixa mais próximo: média, p95, fração de carrinhos sem
+caminho e carga de cada caixa.
+
+Os cenários são distribuídos em blocos para um ProcessPoolExecutor. A planta base
+vai para cada processo uma única vez, como o buffer binário de CellLayout.to_bytes,
+e cada layout usa uma semente derivada apenas de (semente, índice do layout), de
+modo que o resultado não depende do número de processos nem da ordem dos blocos.
+Os agregados parciais são devolvidos à medida que os blocos terminam.
+
+Uso:
+    python -m src.simulation.sweep --size 30 --layouts 20000 --carts 20 --workers 4
+    python -m src.simulation.sweep --layout loja.sqm --layouts 5000 --products 40
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from src.data.grid_graph import GridGraph
+from src.data.layout import MarketLayout, sample_obstacles
+from src.data.layout_io import CASHIER, CellLayout, load_layout
+from src.algorithms.batch import distance_field
+
+
+class SweepStats:
+    """Agregado de uma varredura, que pode ser combinado com outros (merge)."""
+
+    __slots__ = ("layouts", "carts", "unreachable", "steps", "cashier_load")
+
+    def __init__(self, n_cashiers):
+        self.layouts = 0
+        self.carts = 0
+        self.unreachable = 0
+        self.steps = Counter()  # Passos -> quantidade de carrinhos (percentis exatos após merge)
+        self.cashier_load = [0] * n_cashiers  # Carrinhos atribuídos a cada caixa
+
+    def merge(self, other):
+        """Soma outro agregado a este."""
+        self.layouts += other.layouts
+        self.carts += other.carts
+        self.unreachable += other.unreachable
+        self.steps.update(other.steps)
+        for index, load in enumerate(other.cashier_load):
+            self.cashier_load[index] += load
+        return self
+
+    def mean_steps(self):
+        """Média de passos dos carrinhos que alcançam um caixa."""
+        reached = self.carts - self.unreachable
+        return sum(steps * count for steps, count in self.steps.items()) / reached if reached else 0.0
+
+    def percentile(self, fraction):
+        """Percentil (posição mais próxima) dos passos, a partir do histograma."""
+        reached = self.carts - self.unreachable
+        if not reached:
+            return 0
+        rank = max(1, int(round(fraction * reached)))
+        seen = 0
+        for steps in sorted(self.steps):
+            seen += self.steps[steps]
+            if seen >= rank:
+                return steps
+        return max(self.steps)
+
+    def as_dict(self, cashiers=None):
+        """Resumo em dicionário (caixas como "i,j" se a lista for informada)."""
+        total = sum(self.cashier_load)
+        if cashiers is not None:
+            load = {f"{i},{j}": count for (i, j), count in zip(cashiers, self.cashier_load)}
+        else:
+            load = list(self.cashier_load)
+        return {
+            "layouts": self.layouts,
+            "carts": self.carts,
+            "mean_steps": round(self.mean_steps(), 4),
+            "p50_steps": self.percentile(0.5),
+            "p95_steps": self.percentile(0.95),
+            "max_steps": max(self.steps, default=0),
+            "unreachable_share": round(self.unreachable / self.carts, 6) if self.carts else 0.0,
+            "cashier_load": load,
+            "cashier_share_max": round(max(self.cashier_load) / total, 6) if total else 0.0,
+        }
+
+
+class _Scenario:
+    """Planta base decodificada uma vez por processo e reutilizada em todos os blocos."""
+
+    def __init__(self, layout_bytes):
+        cells = CellLayout.from_bytes(layout_bytes)
+        layout = cells.to_market_layout()
+        self.rows = cells.rows
+        self.cols = cells.cols
+        self.cashiers = layout.cashiers
+        self.start = layout.start
+        # Produtos e empilhadeiras da planta ficam fixos; os sorteados se somam a eles
+        self.fixed = layout.obstacles()
+        self.occupancy = bytearray(cells.occupancy())
+        for i, j in self.cashiers:
+            self.occupancy[i * self.cols + j] = 1
+        self.free = layout.free_cells()
+        if not self.free or not self.cashiers:
+            raise ValueError("A planta base precisa de caixas e de células livres para os carrinhos.")
+
+    def run(self, first, count, carts_per_layout, n_products, n_forklifts, seed):
+        """Avalia os layouts first .. first + count - 1 e retorna o agregado."""
+        stats = SweepStats(len(self.cashiers))
+        rows, cols = self.rows, self.cols
+        for index in range(first, first + count):
+            rng = random.Random(f"{seed}:{index}")
+            products, forklifts = sample_obstacles(rows, cols, self.cashiers, self.fixed, self.start,
+                                                   n_products, n_forklifts, rng)
+            occupancy = bytearray(self.occupancy)
+            for i, j in products:
+                occupancy[i * cols + j] = 0
+            for i, j in forklifts:
+                occupancy[i * cols + j] = 0
+            graph = GridGraph.from_cells(rows, cols, occupancy)
+            _, _, dist, owner, _ = distance_field(graph, self.cashiers)
+
+            stats.layouts += 1
+            placed = 0
+            while placed < carts_per_layout:
+                i, j = rng.choice(self.free)
+                cell = i * cols + j
+                if not occupancy[cell]:
+                    continue  # Caiu em um produto ou empilhadeira sorteado
+                placed += 1
+                steps = int(dist[cell])
+                if steps < 0:
+                    stats.unreachable += 1
+                else:
+                    stats.steps[steps] += 1
+                    stats.cashier_load[int(owner[cell])] += 1
+            stats.carts += placed
+        return stats
+
+
+_worker_scenario = None
+
+
+def _init_worker(layout_bytes):
+    """Inicializador dos processos: decodifica a planta base uma única vez."""
+    global _worker_scenario
+    _worker_scenario = _Scenario(layout_bytes)
+
+
+def _run_chunk(first, count, carts_per_layout, n_products, n_forklifts, seed):
+    return _worker_scenario.run(first, count, carts_per_layout, n_products, n_forklifts, seed)
+
+
+def iter_sweep(layout, n_layouts, carts_per_layout=20, n_products=10, n_forklifts=2, seed=0,
+               workers=None, chunk_size=250):
+    """
+    Executa a varredura, devolvendo o agregado parcial a cada bloco concluído.
+
+    Args:
+        layout: Planta base (MarketLayout ou CellLayout)
+        n_layouts: Quantidade de layouts sorteados
+        carts_per_layout: Posições de carrinho sorteadas em cada layout
+        n_products: Produtos sorteados por layout
+        n_forklifts: Empilhadeiras sorteadas por layout
+        seed: Semente base; o layout k usa a semente "seed:k"
+        workers: Processos (padrão: os.cpu_count(); 0 ou 1 = no próprio processo)
+        chunk_size: Layouts por tarefa enviada a um processo
+
+    Yields:
+        SweepStats: Agregado acumulado até o momento (o mesmo objeto, atualizado)
+    """
+    if isinstance(layout, MarketLayout):
+        layout = CellLayout.from_market_layout(layout)
+    layout_bytes = layout.to_bytes()
+    n_cashiers = len(layout.positions(CASHIER))
+    chunks = [(first, min(chunk_size, n_layouts - first)) for first in range(0, n_layouts, chunk_size)]
+    total = SweepStats(n_cashiers)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        scenario = _Scenario(layout_bytes)
+        for first, count in chunks:
+            yield total.merge(scenario.run(first, count, carts_per_layout, n_products, n_forklifts, seed))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(layout_bytes,)) as pool:
+        pending = set()
+        chunks = iter(chunks)
+        # Mantém poucas tarefas em andamento para que os resultados cheguem aos poucos
+        for first, count in chunks:
+            pending.add(pool.submit(_run_chunk, first, count, carts_per_layout, n_products, n_forklifts, seed))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                total.merge(future.result())
+                following = next(chunks, None)
+                if following is not None:
+                    pending.add(pool.submit(_run_chunk, *following, carts_per_layout, n_products, n_forklifts,
+                                            seed))
+                yield total
+
+
+def run_sweep(layout, n_layouts, **options):
+    """Executa a varredura inteira e retorna o agregado final (ver iter_sweep)."""
+    total = None
+    for total in iter_sweep(layout, n_layouts, **options):
+        pass
+    return total
+
+
+def main(argv=None):
+    """Ponto de entrada de linha de comando: imprime o progresso e o resumo final em JSON."""
+    parser = argparse.ArgumentParser(prog="python -m src.simulation.sweep",
+                                     description="Varredura Monte Carlo de layouts do mercado.")
+    parser.add_argument("--layout", help="Planta base (.sqm, .csv ou ASCII); padrão: mercado gerado")
+    parser.add_argument("--size", type=int, default=11, help="Lado do mercado gerado (sem --layout)")
+    parser.add_argument("--layouts", type=int, default=10000)
+    parser.add_argument("--carts", type=int, default=20, help="Carrinhos sorteados por layout")
+    parser.add_argument("--products", type=int, default=10)
+    parser.add_argument("--forklifts", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=250)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    layout = load_layout(args.layout) if args.layout else CellLayout.from_market_layout(MarketLayout(args.size,
+                                                                                                      args.size))
+    cashiers = layout.positions(CASHIER)
+    start_time = time.perf_counter()
+    total = None
+    for total in iter_sweep(layout, args.layouts, args.carts, args.products, args.forklifts, args.seed,
+                            args.workers, args.chunk_size):
+        summary = total.as_dict()
+        print(f"{total.layouts}/{args.layouts} layouts: média {summary['mean_steps']:.2f}, "
+              f"p95 {summary['p95_steps']}, sem caminho {summary['unreachable_share']:.2%}", file=sys.stderr)
+    result = total.as_dict(cashiers) if total else {}
+    result["wall_s"] = round(time.perf_counter() - start_time, 3)
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+Instrumentação das buscas, da construção do grafo e do desenho.
+
+Os mecanismos de busca e o MarketApp informam ao coletor ativo (`ACTIVE`):
+    contadores   vértices expandidos, arestas relaxadas, inserções duplicadas na fila
+    picos        maior tamanho da fronteira (fila) observado
+    fases        durações com perf_counter_ns (ex.: "generate_graph", "route", "draw")
+    memória      opcional, com tracemalloc: alocação e pico de cada fase e instantâneos
+
+Desativado (o padrão), o custo é um teste de atributo por busca ou fase: os laços
+das buscas só recebem um get_neighbors contador quando a coleta está ativa.
+
+Uso:
+    from src.utils import instrumentation
+    instrumentation.enable(trace_memory=True)
+    ...
+    print(instrumentation.ACTIVE.summary())
+    instrumentation.ACTIVE.export_json("metricas.json")
+"""
+import json
+import time
+import tracemalloc
+from collections import Counter, deque
+
+
+def percentile(values, fraction):
+    """Percentil por posição mais próxima de uma sequência (0 se vazia)."""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+class _NullPhase:
+    """Contexto vazio devolvido por phase() quando a coleta está desativada."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Mede uma fase com perf_counter_ns (e a memória alocada, se habilitado).
+
+    O pico do tracemalloc é um só para o processo e cada fase o zera ao começar;
+    para que fases aninhadas (ex.: "routing_index.rebuild" dentro de
+    "generate_graph") não apaguem o pico da fase de fora, o pico atual é passado
+    para a fase de fora antes de zerar, e o pico da interna também ao terminar.
+    """
+
+    __slots__ = ("collector", "name", "started", "memory", "peak")
+
+    def __init__(self, collector, name):
+        self.collector = collector
+        self.name = name
+
+    def __enter__(self):
+        self.memory = None
+        if self.collector.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            stack = self.collector._memory_stack
+            if stack:
+                parent = stack[-1]
+                parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self.memory = self.peak = tracemalloc.get_traced_memory()[0]
+            stack.append(self)
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter_ns() - self.started
+        self.collector.record_phase(self.name, elapsed)
+        if self.memory is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self.peak)
+            stack = self.collector._memory_stack
+            if stack and stack[-1] is self:
+                stack.pop()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            self.collector.record_memory(self.name, current - self.memory, peak - self.memory)
+        return False
+
+
+class Instrumentation:
+    """Coletor de contadores, picos, tempos de fase e uso de memória."""
+
+    def __init__(self, enabled=False, trace_memory=False, max_samples=1000):
+        """
+        Inicializa o coletor.
+
+        Args:
+            enabled: Se a coleta começa ativa
+            trace_memory: Mede a memória das fases com tracemalloc (mais lento)
+            max_samples: Durações guardadas por fase (as mais recentes), para os percentis
+        """
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.max_samples = max_samples
+        self._memory_stack = []  # Fases abertas que medem memória, da mais externa à mais interna
+        self.reset()
+
+    def reset(self):
+        """Descarta tudo o que foi coletado."""
+        self.counters = Counter()
+        self.peaks = {}
+        self.phases = {}  # Nome -> deque com as durações em ns
+        self.phase_totals = Counter()  # Nome -> (execuções, ns) acumulados desde o reset
+        self.phase_counts = Counter()
+        self.memory = {}  # Nome -> {"calls", "allocated_kb", "peak_kb"} da última execução e máximos
+        self.snapshots = []
+
+    # ------------------------------------------------------------------ coleta
+
+    def count(self, name, amount=1):
+        """Soma `amount` ao contador `name`."""
+        if self.enabled:
+            self.counters[name] += amount
+
+    def observe_peak(self, name, value):
+        """Guarda o maior valor já observado para `name`."""
+        if self.enabled and value > self.peaks.get(name, -1):
+            self.peaks[name] = value
+
+    def phase(self, name):
+        """Contexto que mede a duração de uma fase (`with ACTIVE.phase("draw"): ...`)."""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def record_phase(self, name, elapsed_ns):
+        """Registra a duração de uma fase medida por fora."""
+        samples = self.phases.get(name)
+        if samples is None:
+            samples = self.phases[name] = deque(maxlen=self.max_samples)
+        samples.append(elapsed_ns)
+        self.phase_counts[name] += 1
+        self.phase_totals[name] += elapsed_ns
+
+    def record_memory(self, name, allocated, peak):
+        """Registra a memória alocada e o pico (em bytes) de uma fase."""
+        entry = self.memory.setdefault(name, {"calls": 0, "allocated_kb": 0.0, "peak_kb": 0.0,
+                                              "max_peak_kb": 0.0})
+        entry["calls"] += 1
+        entry["allocated_kb"] = round(allocated / 1024, 3)
+        entry["peak_kb"] = round(peak / 1024, 3)
+        entry["max_peak_kb"] = max(entry["max_peak_kb"], entry["peak_kb"])
+
+    def memory_snapshot(self, label, limit=10):
+        """Guarda as linhas de código que mais alocaram memória (requer trace_memory)."""
+        if not (self.enabled and self.trace_memory and tracemalloc.is_tracing()):
+            return None
+        statistics = tracemalloc.take_snapshot().statistics("lineno")[:limit]
+        snapshot = {"label": label, "top": [{"where": str(stat.traceback), "size_kb": round(stat.size / 1024, 3),
+                                             "count": stat.count} for stat in statistics]}
+        self.snapshots.append(snapshot)
+        return snapshot
+
+    def counting_neighbors(self, prefix, get_neighbors, frontier_size):
+        """
+        Envolve o get_neighbors de uma busca para contar expansões, arestas e o pico da fronteira.
+
+        Args:
+            prefix: Nome da busca usado nos contadores (ex.: "bfs" -> "bfs.expanded")
+            get_neighbors: Função original do grafo
+            frontier_size: Função sem argumentos com o tamanho atual da fila
+
+        Returns:
+            function: Função com a mesma assinatura de get_neighbors
+        """
+        counters = self.counters
+        peaks = self.peaks
+        expanded_key, edges_key, frontier_key = prefix + ".expanded", prefix + ".edges", prefix + ".frontier_peak"
+
+        def counted(vertex):
+            neighbors = get_neighbors(vertex)
+            counters[expanded_key] += 1
+            counters[edges_key] += len(neighbors)
+            size = frontier_size()
+            if size > peaks.get(frontier_key, -1):
+                peaks[frontier_key] = size
+            return neighbors
+
+        return counted
+
+    # ------------------------------------------------------------------ análise e exportação
+
+    def phase_summary(self, name):
+        """Execuções, tempo total e percentis (em ms) de uma fase."""
+        samples_ms = [elapsed / 1e6 for elapsed in self.phases.get(name, ())]
+        calls = self.phase_counts[name]
+        return {
+            "calls": calls,
+            "total_ms": round(self.phase_totals[name] / 1e6, 4),
+            "mean_ms": round(self.phase_totals[name] / 1e6 / calls, 4) if calls else 0.0,
+            "p50_ms": round(percentile(samples_ms, 0.5), 4),
+            "p95_ms": round(percentile(samples_ms, 0.95), 4),
+            "p99_ms": round(percentile(samples_ms, 0.99), 4),
+            "max_ms": round(max(samples_ms, default=0), 4),
+        }
+
+    def summary(self):
+        """Resumo de tudo o que foi coletado, em dicionário serializável em JSON."""
+        return {
+            "enabled": self.enabled,
+            "trace_memory": self.trace_memory,
+            "counters": dict(sorted(self.counters.items())),
+            "peaks": dict(sorted(self.peaks.items())),
+            "phases": {name: self.phase_summary(name) for name in sorted(self.phases)},
+            "memory": dict(sorted(self.memory.items())),
+            "snapshots": list(self.snapshots),
+        }
+
+    def export_json(self, path, extra=None):
+        """
+        Grava o resumo em JSON.
+
+        Args:
+            path: Arquivo de destino
+            extra: Dicionário opcional mesclado ao resumo (ex.: execuções do MarketApp)
+        """
+        data = self.summary()
+        if extra:
+            data.update(extra)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=2, ensure_ascii=False)
+            file.write("\n")
+
+
+# Coletor consultado pelas buscas e pelo MarketApp (desativado por padrão)
+ACTIVE = Instrumentation()
+
+
+def enable(trace_memory=False):
+    """Ativa a coleta no coletor global."""
+    ACTIVE.enabled = True
+    ACTIVE.trace_memory = trace_memory
+    return ACTIVE
+
+
+def disable():
+    """Desativa a coleta no coletor global (e o tracemalloc, se foi usado)."""
+    ACTIVE.enabled = False
+    if ACTIVE.trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    ACTIVE.trace_memory = False
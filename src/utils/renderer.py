@@ -0,0 +1,272 @@
+"""
+Renderizador do grid do mercado que reaproveita os itens do canvas.
+"""
+
+
+class GridRenderer:
+    """Desenha o grid no canvas em modo retido.
+
+    Cada posição visível da tela (slot) recebe um retângulo e um texto criados uma
+    única vez; depois disso, apenas os slots cujo tipo de célula mudou são
+    alterados com `itemconfig`. Somente a janela visível do grid (viewport) tem
+    itens, de modo que grids muito maiores que a tela custam o mesmo que o
+    tamanho da janela. Zoom e deslocamento apenas reconfiguram esses slots.
+    """
+
+    # Tipo da célula -> (preenchimento, contorno, espessura do contorno, texto)
+    STYLES = {
+        "floor": ("#E0E0E0", "#B0B0B0", 1, ""),
+        "corridor": ("#8B4513", "#B0B0B0", 1, ""),
+        "cart": ("#4CAF50", "#388E3C", 2, "🛒"),
+        "cashier": ("#2196F3", "#1976D2", 2, "💳"),
+        "product": ("#FF9800", "#F57C00", 2, "📦"),
+        "forklift": ("#B0BEC5", "#78909C", 2, "🚜"),
+    }
+    PATH_COLOR = "#FFC107"
+    MIN_CELL_SIZE = 4
+    MAX_CELL_SIZE = 80
+
+    def __init__(self, canvas, rows, cols, cell_size=40, margin=10, view_width=None, view_height=None):
+        """
+        Inicializa o renderizador sem criar itens; eles são criados no primeiro render.
+
+        Args:
+            canvas: Canvas do tkinter (ou objeto com a mesma interface)
+            rows: Número de linhas do grid
+            cols: Número de colunas do grid
+            cell_size: Tamanho de cada célula em pixels
+            margin: Margem entre a borda do canvas e o grid
+            view_width: Largura útil do viewport em pixels (padrão: grid inteiro)
+            view_height: Altura útil do viewport em pixels (padrão: grid inteiro)
+        """
+        self.canvas = canvas
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.margin = margin
+        self.view_width = view_width or cols * cell_size
+        self.view_height = view_height or rows * cell_size
+        self.origin = (0, 0)  # Célula exibida no canto superior esquerdo
+        self._slots = []  # (id do retângulo, id do texto) por slot
+        self._slot_kinds = []  # Tipo exibido em cada slot (None = ainda não configurado)
+        self._view_rows = 0
+        self._view_cols = 0
+        self._kind_of = None
+        self._path = None
+        self._path_upto = 0
+        self._path_items = {}  # índice do segmento -> id da linha
+        self.items_configured = 0  # Total de itemconfig feitos, útil para medir redesenhos
+
+    # ------------------------------------------------------------------ viewport
+
+    @property
+    def view_size(self):
+        """Número de (linhas, colunas) visíveis no viewport."""
+        return self._view_rows, self._view_cols
+
+    def _layout_slots(self):
+        """Cria, reposiciona ou remove slots para o tamanho de célula atual."""
+        size = self.cell_size
+        view_rows = min(self.rows, max(1, self.view_height // size))
+        view_cols = min(self.cols, max(1, self.view_width // size))
+        needed = view_rows * view_cols
+        canvas = self.canvas
+
+        while len(self._slots) > needed:
+            rect, text = self._slots.pop()
+            self._slot_kinds.pop()
+            canvas.delete(rect)
+            canvas.delete(text)
+        while len(self._slots) < needed:
+            rect = canvas.create_rectangle(0, 0, 0, 0, tags=("cell",))
+            text = canvas.create_text(0, 0, text="", tags=("cell",))
+            self._slots.append((rect, text))
+            self._slot_kinds.append(None)
+
+        font = ("Arial", max(1, size // 2))
+        for index, (rect, text) in enumerate(self._slots):
+            r, c = divmod(index, view_cols)
+            x1 = c * size + self.margin
+            y1 = r * size + self.margin
+            canvas.coords(rect, x1, y1, x1 + size, y1 + size)
+            canvas.coords(text, x1 + size / 2, y1 + size / 2)
+            canvas.itemconfig(text, font=font)
+            self._slot_kinds[index] = None  # Força reconfiguração no próximo render
+        self._view_rows = view_rows
+        self._view_cols = view_cols
+        self._clamp_origin()
+
+    def _clamp_origin(self):
+        """Mantém o viewport dentro dos limites do grid."""
+        i, j = self.origin
+        i = max(0, min(i, self.rows - self._view_rows))
+        j = max(0, min(j, self.cols - self._view_cols))
+        self.origin = (i, j)
+
+    def pan(self, d_rows, d_cols):
+        """Desloca o viewport em células e redesenha o que mudou.
+
+        Returns:
+            bool: True se o viewport se moveu
+        """
+        previous = self.origin
+        self.origin = (previous[0] + d_rows, previous[1] + d_cols)
+        self._clamp_origin()
+        if self.origin == previous:
+            return False
+        self.render()
+        self._redraw_path()
+        return True
+
+    def zoom(self, factor, anchor=None):
+        """Altera o tamanho das células mantendo a célula `anchor` (ou o centro) no lugar.
+
+        Args:
+            factor: Multiplicador do tamanho de célula (ex.: 1.25 ou 0.8)
+            anchor: Célula (i, j) que deve permanecer visível
+
+        Returns:
+            bool: True se o zoom mudou
+        """
+        size = int(round(self.cell_size * factor))
+        size = max(self.MIN_CELL_SIZE, min(self.MAX_CELL_SIZE, size))
+        if size == self.cell_size:
+            return False
+        if anchor is None:
+            anchor = (self.origin[0] + self._view_rows // 2, self.origin[1] + self._view_cols // 2)
+        self.cell_size = size
+        self._layout_slots()
+        self.origin = (anchor[0] - self._view_rows // 2, anchor[1] - self._view_cols // 2)
+        self._clamp_origin()
+        self.render()
+        self._redraw_path()
+        return True
+
+    def cell_at(self, x, y):
+        """Converte uma posição em pixels na célula (i, j) exibida ali, ou None."""
+        col = (x - self.margin) // self.cell_size
+        row = (y - self.margin) // self.cell_size
+        if 0 <= row < self._view_rows and 0 <= col < self._view_cols:
+            return int(row + self.origin[0]), int(col + self.origin[1])
+        return None
+
+    def _is_visible(self, cell):
+        """Indica se a célula está dentro do viewport."""
+        r = cell[0] - self.origin[0]
+        c = cell[1] - self.origin[1]
+        return 0 <= r < self._view_rows and 0 <= c < self._view_cols
+
+    def _pixel_center(self, cell):
+        """Centro em pixels de uma célula, mesmo que esteja fora do viewport."""
+        half = self.cell_size // 2
+        return ((cell[1] - self.origin[1]) * self.cell_size + half + self.margin,
+                (cell[0] - self.origin[0]) * self.cell_size + half + self.margin)
+
+    def cell_center(self, cell):
+        """Centro em pixels de uma célula, ou None se ela estiver fora do viewport."""
+        return self._pixel_center(cell) if self._is_visible(cell) else None
+
+    # ------------------------------------------------------------------ células
+
+    def _apply(self, index, kind):
+        """Reconfigura um slot apenas se o tipo exibido mudou."""
+        if self._slot_kinds[index] == kind:
+            return
+        fill, outline, width, text = self.STYLES[kind]
+        rect, text_id = self._slots[index]
+        previous = self._slot_kinds[index]
+        if previous is None or self.STYLES[previous][:3] != (fill, outline, width):
+            self.canvas.itemconfig(rect, fill=fill, outline=outline, width=width)
+            self.items_configured += 1
+        if previous is None or self.STYLES[previous][3] != text:
+            self.canvas.itemconfig(text_id, text=text)
+            self.items_configured += 1
+        self._slot_kinds[index] = kind
+
+    def render(self, kind_of=None):
+        """
+        Atualiza todos os slots visíveis, alterando só os que mudaram.
+
+        Args:
+            kind_of: Função (i, j) -> tipo da célula (chave de STYLES); se omitida,
+                usa a última informada
+        """
+        if kind_of is not None:
+            self._kind_of = kind_of
+        if not self._slots:
+            self._layout_slots()
+        kind_of = self._kind_of
+        origin_i, origin_j = self.origin
+        view_cols = self._view_cols
+        for index in range(len(self._slots)):
+            r, c = divmod(index, view_cols)
+            self._apply(index, kind_of((origin_i + r, origin_j + c)))
+
+    def update_cells(self, cells, kind_of=None):
+        """
+        Atualiza apenas as células informadas (ex.: posição antiga e nova do carrinho).
+
+        Args:
+            cells: Células (i, j) que podem ter mudado
+            kind_of: Função (i, j) -> tipo da célula; se omitida, usa a última informada
+        """
+        if kind_of is not None:
+            self._kind_of = kind_of
+        if not self._slots:
+            self.render()
+            return
+        origin_i, origin_j = self.origin
+        for i, j in cells:
+            r = i - origin_i
+            c = j - origin_j
+            if 0 <= r < self._view_rows and 0 <= c < self._view_cols:
+                self._apply(r * self._view_cols + c, self._kind_of((i, j)))
+
+    # ------------------------------------------------------------------ caminho
+
+    def _segment_item(self, index):
+        """Cria a linha do segmento index do caminho, se algum extremo estiver visível."""
+        start, end = self._path[index], self._path[index + 1]
+        if not (self._is_visible(start) or self._is_visible(end)):
+            return
+        width = max(1, self.cell_size // 10)
+        self._path_items[index] = self.canvas.create_line(*self._pixel_center(start), *self._pixel_center(end),
+                                                          fill=self.PATH_COLOR, width=width, tags=("path",))
+
+    def set_path(self, path, upto):
+        """
+        Exibe os primeiros `upto` segmentos do caminho.
+
+        Se o caminho é o mesmo já exibido e apenas avançou, só os novos segmentos
+        são criados (usado na animação passo a passo).
+
+        Args:
+            path: Lista de células do caminho
+            upto: Quantidade de segmentos a exibir
+        """
+        if not path:
+            self.clear_path()
+            return
+        upto = min(upto, len(path) - 1)
+        if path is not self._path or upto < self._path_upto:
+            self.clear_path()
+            self._path = path
+        for index in range(self._path_upto, upto):
+            self._segment_item(index)
+        self._path_upto = upto
+
+    def clear_path(self):
+        """Remove o caminho exibido."""
+        for item in self._path_items.values():
+            self.canvas.delete(item)
+        self._path_items = {}
+        self._path = None
+        self._path_upto = 0
+
+    def _redraw_path(self):
+        """Recria as linhas visíveis do caminho após zoom ou deslocamento."""
+        path, upto = self._path, self._path_upto
+        if path is None:
+            return
+        self.clear_path()
+        self.set_path(path, upto)
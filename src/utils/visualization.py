@@ -2,40 +2,76 @@
 Módulo para visualização do mercado e caminhos.
 """
 import tkinter as tk
+from tkinter import filedialog
 import random
 import time
+from collections import deque
 from src.data.market_graph import MarketGraph
-from src.algorithms.bfs import bfs
+from src.data.layout import MarketLayout, sample_connected_obstacles
+from src.data.connectivity import ConnectivityIndex
+from src.algorithms.routing_index import RoutingIndex
+from src.algorithms.route_cache import RouteCache
+from src.algorithms.dstar_lite import DStarLite
+from src.simulation.engine import Simulation
+from src.utils.renderer import GridRenderer
+from src.utils import instrumentation
+from src.utils.instrumentation import percentile
 
 class MarketApp:
     """Classe que gerencia a interface gráfica e a simulação do mercado."""
     
-    def __init__(self, root):
+    def __init__(self, root, layout=None):
         """
         Inicializa a aplicação com janela, canvas e botões.
         
         Args:
             root: Janela principal do tkinter
+            layout: MarketLayout opcional (ex.: carregado com load_layout); padrão é o mercado 11x11
         """
         self.root = root
         self.root.title("Mercado Inteligente - Navegação Otimizada")
-        self.cell_size = 40
-        self.grid_size = (11, 11)
-        self.start = (0, 0)  # Apenas um carrinho
-        self.cashiers = [(10, 1), (10, 3), (10, 5), (10, 7), (10, 9)]
-        self.blocked = []  # Produtos (📦)
-        self.forklifts = []  # Empilhadeiras (🚜)
+        self.max_view_px = 600  # Tamanho máximo do viewport do canvas, em pixels
+        self.max_performance_results = 1000  # Execuções guardadas para a análise de desempenho
+        self.bulk_update_threshold = 64  # Acima disso, o índice de rotas é reconstruído em vez de reparado
+        if layout is None:
+            layout = MarketLayout(11, 11)
+        self.layout = layout
+        self.grid_size = (layout.rows, layout.cols)
+        # Células de 40px no mercado padrão; menores para que lojas grandes caibam melhor na tela
+        self.cell_size = max(GridRenderer.MIN_CELL_SIZE, min(40, self.max_view_px // max(self.grid_size)))
+        self.start = layout.start  # Apenas um carrinho
+        self.cashiers = list(layout.cashiers)  # Padrão: [(10, 1), (10, 3), ..., (10, 9)]
+        self.cashier_cells = set(self.cashiers)  # Para testes de pertinência O(1)
+        self.blocked = set()  # Produtos (📦)
+        self.forklifts = set()  # Empilhadeiras (🚜)
         self.path = None  # Caminho do carrinho
         self.current_step = 0
         self.is_animating = False  # Controle para animação
-        self.corridor_positions = [(i, j) for i in range(2, 8) for j in (2, 5, 8)]
-        # Lista para armazenar resultados de desempenho (agora apenas para BFS)
-        self.performance_results = []
+        self.planner = None  # Replanejamento incremental (D* Lite) usado durante a animação
+        # Simulação de muitos clientes; a janela apenas exibe os instantâneos que ela publica
+        self.simulation = None
+        self.snapshot = None
+        self.simulation_arrival_rate = 0.3  # Carrinhos por tick
+        self.simulation_service_time = 4  # Ticks de atendimento (média)
+        self.ticks_per_frame = 1
+        self.frame_interval_ms = 100
+        self.corridor_positions = set(layout.corridors)  # Padrão: colunas 2, 5, 8, linhas 2 a 7
+        # Resultados de desempenho recentes (agora apenas para BFS), com caminhos compactos
+        self.performance_results = deque(maxlen=self.max_performance_results)
+        # Contadores e tempos de fase informados pelas buscas, pelo grafo e pelo desenho
+        # (só coletados se instrumentation.enable() foi chamado, como faz o main.py)
+        self.instrumentation = instrumentation.ACTIVE
+        # Cache de rotas por (início, caixas, versão do layout)
+        self.route_cache = RouteCache(self.grid_size[1], maxsize=256)
 
         # Configura a interface gráfica
         self._setup_ui()
         # Inicializa o grafo e bloqueios
         self.graph = MarketGraph()
+        # Campo de distâncias a partir dos caixas, reconstruído quando o layout muda
+        self.routing_index = RoutingIndex(self.graph, self.cashiers)
+        self.connectivity = None  # Componentes ligados aos caixas (union-find), criado em generate_graph
+        self.generate_graph()
         self.reset()
 
     def _setup_ui(self):
@@ -44,15 +80,23 @@ class MarketApp:
         main_frame = tk.Frame(self.root, bg="#F5F6F5")
         main_frame.pack(padx=10, pady=10)
 
-        # Canvas for the grid
-        canvas_width = self.grid_size[1] * self.cell_size + 20
-        canvas_height = self.grid_size[0] * self.cell_size + 20
-        self.canvas = tk.Canvas(main_frame, width=canvas_width, height=canvas_height,
+        # Canvas for the grid (limitado a max_view_px; grids maiores usam zoom e deslocamento)
+        view_width = min(self.grid_size[1] * self.cell_size, self.max_view_px)
+        view_height = min(self.grid_size[0] * self.cell_size, self.max_view_px)
+        self.canvas = tk.Canvas(main_frame, width=view_width + 20, height=view_height + 20,
                                 bg="#FFFFFF", highlightthickness=2, highlightbackground="#4CAF50")
         self.canvas.pack(pady=10)
+        self.renderer = GridRenderer(self.canvas, self.grid_size[0], self.grid_size[1], self.cell_size,
+                                     margin=10, view_width=view_width, view_height=view_height)
         
         # Adicionar captura de clique no canvas para mover o carrinho
         self.canvas.bind("<Button-1>", self.move_cart)
+        # Zoom com a roda do mouse e deslocamento com as setas do teclado
+        self.canvas.bind("<MouseWheel>", self.on_zoom)
+        self.canvas.bind("<Button-4>", self.on_zoom)
+        self.canvas.bind("<Button-5>", self.on_zoom)
+        for key, delta in (("<Up>", (-1, 0)), ("<Down>", (1, 0)), ("<Left>", (0, -1)), ("<Right>", (0, 1))):
+            self.root.bind(key, lambda event, d=delta: self.renderer.pan(*d))
 
         # Frame for buttons
         btn_frame = tk.Frame(main_frame, bg="#F5F6F5")
@@ -61,12 +105,17 @@ class MarketApp:
             ("Navegar com BFS", self.run_bfs, "#4CAF50", "white"),
             ("Adicionar Produtos", self.generate_random_blocks, "#FF9800", "white"),
             ("Mover Carrinho (Aleatório)", self.move_cart_random, "#9C27B0", "white"),
+            ("Simular Clientes", self.toggle_simulation, "#00897B", "white"),
             ("Resetar Mercado", self.reset, "#F44336", "white"),
             ("Mostrar Análise de Desempenho", self.show_performance_analysis, "#607D8B", "white")
         ]
         for text, command, bg, fg in buttons:
             tk.Button(btn_frame, text=text, command=command, bg=bg, fg=fg,
                       font=("Arial", 10, "bold"), relief="flat").pack(side=tk.LEFT, padx=5, pady=5)
+        # Empilhadeiras andam a cada passo da animação; o carrinho recalcula a rota se for bloqueado
+        self.moving_forklifts = tk.BooleanVar(value=False)
+        tk.Checkbutton(btn_frame, text="Empilhadeiras em Movimento", variable=self.moving_forklifts,
+                       bg="#F5F6F5", font=("Arial", 10)).pack(side=tk.LEFT, padx=5, pady=5)
 
         # Status label
         self.result_label = tk.Label(main_frame, text="Bem-vindo ao Mercado Inteligente!", 
@@ -74,85 +123,135 @@ class MarketApp:
         self.result_label.pack(pady=5)
 
     def generate_graph(self):
-        """Cria o grafo do mercado com base no grid e bloqueios, excluindo corredores marrons."""
-        self.graph = MarketGraph()
+        """Cria o grafo do mercado com base no grid e bloqueios, excluindo corredores marrons.
+
+        Usado apenas na construção inicial; mudanças posteriores de obstáculos usam
+        block_cell, unblock_cell e move_obstacle, que alteram só as células afetadas.
+        """
+        with self.instrumentation.phase("generate_graph"):
+            rows, cols = self.grid_size
+            obstacles = self.corridor_positions | self.blocked | self.forklifts
+            self.graph = MarketGraph.from_grid(rows, cols, obstacles)
+            self.graph.subscribe(self.routing_index)
+            self.routing_index.sync(self.graph, self.cashiers)
+            self.connectivity = ConnectivityIndex.from_graph(self.graph, self.cashiers, self.grid_size)
+            self.graph.subscribe(self.connectivity)
+
+    def _set_obstacles(self, blocked, forklifts):
+        """Troca produtos e empilhadeiras bloqueando/liberando apenas as células que mudaram."""
+        old_cells = self.blocked | self.forklifts
+        new_cells = set(blocked) | set(forklifts)
+        # Muitas mudanças de uma vez: mais barato reconstruir o índice uma vez do que repará-lo célula a célula
+        bulk = len(old_cells ^ new_cells) > self.bulk_update_threshold
+        if bulk:
+            self.graph.unsubscribe(self.routing_index)
+            self._detach_planner()  # Recriado no próximo passo da animação
+        for cell in old_cells - new_cells:
+            self.graph.unblock_cell(cell)
+        for cell in new_cells - old_cells:
+            self.graph.block_cell(cell)
+        if bulk:
+            self.graph.subscribe(self.routing_index)
+            self.routing_index.sync()
+        self.blocked = set(blocked)
+        self.forklifts = set(forklifts)
+
+    def move_forklift(self, old, new):
+        """Move uma empilhadeira para uma célula vizinha livre com custo O(1) no grafo.
+
+        Args:
+            old: Posição atual da empilhadeira
+            new: Nova posição
+
+        Returns:
+            bool: True se a empilhadeira foi movida
+        """
+        if old not in self.forklifts or new in (self.start, self._cart_cell()) or new in self.cashier_cells:
+            return False
+        if not self.graph.move_obstacle(old, new):
+            return False
+        self.forklifts.discard(old)
+        self.forklifts.add(new)
+        return True
+
+    def step_forklifts(self):
+        """Move cada empilhadeira para uma célula vizinha livre aleatória (se houver).
+
+        Returns:
+            list: Células que mudaram, para redesenho
+        """
         rows, cols = self.grid_size
-        # Define os corredores marrons (colunas 2, 5, 8, linhas 2 a 7)
-        corridor_positions = [(i, j) for i in range(2, 8) for j in (2, 5, 8)]
-
-        for i in range(rows):
-            for j in range(cols):
-                vertex = (i, j)
-                # Exclui vértices que estão nos corredores marrons, bloqueados ou com empilhadeiras
-                if vertex in corridor_positions or vertex in self.blocked or vertex in self.forklifts:
-                    continue
-                # Adiciona arestas para baixo
-                if i < rows - 1:
-                    next_vertex = (i + 1, j)
-                    if next_vertex not in corridor_positions and next_vertex not in self.blocked and next_vertex not in self.forklifts:
-                        self.graph.add_edge(vertex, next_vertex)
-                # Adiciona arestas para a direita
-                if j < cols - 1:
-                    next_vertex = (i, j + 1)
-                    if next_vertex not in corridor_positions and next_vertex not in self.blocked and next_vertex not in self.forklifts:
-                        self.graph.add_edge(vertex, next_vertex)
+        cart = self._cart_cell()
+        changed = []
+        for old in sorted(self.forklifts):
+            i, j = old
+            options = [cell for cell in ((i - 1, j), (i, j - 1), (i + 1, j), (i, j + 1))
+                       if 0 <= cell[0] < rows and 0 <= cell[1] < cols
+                       and cell in self.graph.graph and cell not in (cart, self.start)
+                       and cell not in self.cashier_cells]
+            if options:
+                new = random.choice(options)
+                if self.move_forklift(old, new):
+                    changed.extend((old, new))
+        return changed
+
+    def _cart_cell(self):
+        """Posição atual do carrinho: o passo da animação em andamento, ou o início."""
+        if self.is_animating and self.path:
+            return self.path[self.current_step]
+        return self.start
+
+    def _detach_planner(self):
+        """Deixa de atualizar o planejador incremental."""
+        if self.planner is not None:
+            self.planner.graph.unsubscribe(self.planner)
+            self.planner = None
+
+    def _replan(self):
+        """Atualiza o restante do caminho com D* Lite a partir da posição atual do carrinho.
+
+        O planejador guarda seu estado entre os passos e recebe as mudanças do grafo
+        como ouvinte, então cada passo repara apenas o que as empilhadeiras alteraram.
+
+        Returns:
+            bool: False se não há mais caminho até um caixa
+        """
+        position = self.path[self.current_step]
+        if self.planner is None or self.planner.graph is not self.graph:
+            self._detach_planner()
+            self.planner = DStarLite(self.graph, self.cashiers, position)
+            self.graph.subscribe(self.planner)
+        self.planner.move_to(position)
+        path, cashier = self.planner.route()
+        if path is None:
+            return False
+        remaining = self.path[self.current_step:]
+        # Troca a rota só se a atual foi bloqueada ou ficou mais longa que a nova
+        if len(path) < len(remaining) or any(cell in self.graph.obstacles for cell in remaining):
+            self.path = self.path[:self.current_step] + path
+            self.result_label.config(text=f"Rota recalculada: {len(path) - 1} passos até o caixa {cashier}")
+        return True
 
     def generate_random_blocks(self):
-        """Gera 10 produtos (📦) e 2 empilhadeiras (🚜), evitando início, caixas, suas adjacências e corredores."""
-        self.blocked = []
-        self.forklifts = []
-
-        # Define posições adjacentes aos caixas (espaço de segurança)
-        forbidden_positions = set()
-        for cashier in self.cashiers:
-            i, j = cashier
-            adjacents = [
-                (i-1, j) if i > 0 else None,  # Cima
-                (i+1, j) if i < self.grid_size[0] - 1 else None,  # Baixo
-                (i, j-1) if j > 0 else None,  # Esquerda
-                (i, j+1) if j < self.grid_size[1] - 1 else None  # Direita
-            ]
-            for pos in adjacents:
-                if pos:
-                    forbidden_positions.add(pos)
-
-        # Adiciona os próprios caixas e o carrinho às posições proibidas
-        forbidden_positions.update(self.cashiers)
-        forbidden_positions.add(self.start)
-
-        # Define os corredores (colunas 2, 5, 8, linhas 2 a 7) como posições proibidas para produtos e empilhadeiras
-        corridor_positions = [(i, j) for i in range(2, 8) for j in (2, 5, 8)]
-
-        # Gera posições possíveis para produtos e empilhadeiras (excluindo corredores)
-        possible_positions = [(i, j) for i in range(self.grid_size[0]) for j in range(self.grid_size[1])
-                             if (i, j) not in forbidden_positions and (i, j) not in corridor_positions]
-
-        # Gera 10 produtos (📦)
-        if len(possible_positions) >= 12:  # 10 produtos + 2 empilhadeiras
-            self.blocked = random.sample(possible_positions, 10)
-            # Atualiza posições possíveis removendo os produtos já colocados
-            possible_for_forklifts = [(i, j) for i in range(self.grid_size[0]) for j in range(self.grid_size[1])
-                                      if (i, j) not in forbidden_positions and (i, j) not in self.blocked and (i, j) not in corridor_positions]
-            # Gera 2 empilhadeiras (🚜) fora dos corredores
-            if len(possible_for_forklifts) >= 2:
-                self.forklifts = random.sample(possible_for_forklifts, 2)
+        """Gera 10 produtos (📦) e 2 empilhadeiras (🚜), evitando início, caixas, suas adjacências e corredores.
 
-        self.generate_graph()
+        Nenhum obstáculo é colocado onde isolaria do resto da loja uma célula que alcança um caixa.
+        """
+        rows, cols = self.grid_size
+        blocked, forklifts = sample_connected_obstacles(rows, cols, self.cashiers, self.corridor_positions,
+                                                        self.start, n_products=10, n_forklifts=2)
+        self._set_obstacles(blocked, forklifts)
         self.draw_market()
         self.result_label.config(text="Produtos e empilhadeiras adicionados!")
         print("Produtos e empilhadeiras adicionados!")
 
     def move_cart_random(self):
-        """Move o carrinho para uma posição aleatória que não seja bloqueada, empilhadeira ou um caixa."""
-        corridor_positions = [(i, j) for i in range(2, 8) for j in (2, 5, 8)]
-        possible = [(i, j) for i in range(self.grid_size[0]) for j in range(self.grid_size[1])
-                    if (i, j) not in self.blocked 
-                    and (i, j) not in self.forklifts 
-                    and (i, j) not in self.cashiers
-                    and (i, j) not in self.corridor_positions]
+        """Move o carrinho para uma posição aleatória livre, fora dos caixas, com caminho até algum caixa."""
+        possible = self.connectivity.reachable_cells()
         if possible:
+            previous = self.start
             self.start = random.choice(possible)
-            self.draw_market()
+            self.renderer.update_cells((previous, self.start))
             self.result_label.config(text=f"Carrinho movido para {self.start}!")
             print(f"Carrinho movido para {self.start}!")
         else:
@@ -161,89 +260,151 @@ class MarketApp:
 
     def move_cart(self, event):
         """Move o carrinho para a posição clicada se esta for válida."""
-        col = (event.x - 10) // self.cell_size
-        row = (event.y - 10) // self.cell_size
+        position = self.renderer.cell_at(event.x, event.y)
         
-        if 0 <= row < self.grid_size[0] and 0 <= col < self.grid_size[1]:
-            position = (row, col)
-            if position not in self.blocked and position not in self.forklifts and position not in self.cashiers:
+        if position is not None:
+            if position not in self.blocked and position not in self.forklifts and position not in self.cashier_cells:
+                previous = self.start
                 self.start = position
                 self.path = None
-                self.draw_market()
+                self.renderer.clear_path()
+                self.renderer.update_cells((previous, position))
                 self.result_label.config(text=f"Carrinho movido para {position}!")
                 print(f"Carrinho movido para {position}!")
             else:
                 self.result_label.config(text="Não é possível mover para essa posição!")
                 print("Não é possível mover para essa posição!")
 
-    def draw_market(self):
-        """Desenha o grid do mercado no canvas com tema de supermercado, corredores e paredes entre caixas."""
-        self.canvas.delete("all")
+    def cell_kind(self, cell):
+        """Retorna o tipo de uma célula para o renderizador (chave de GridRenderer.STYLES)."""
+        if self.snapshot is not None:
+            return self._snapshot_kind(cell)
+        if cell == self.start:
+            return "cart"
+        if cell in self.cashier_cells:
+            return "cashier"
+        if cell in self.blocked:
+            return "product"
+        if cell in self.forklifts:
+            return "forklift"
+        if cell in self.corridor_positions:
+            return "corridor"
+        return "floor"
+
+    def _snapshot_kind(self, cell):
+        """Tipo de uma célula durante a simulação, a partir do último instantâneo."""
+        if cell in self.cashier_cells:
+            return "cashier"
+        if cell in self.snapshot.carts:
+            return "cart"
+        if cell in self.snapshot.forklifts:
+            return "forklift"
+        if cell in self.blocked:
+            return "product"
+        if cell in self.corridor_positions:
+            return "corridor"
+        return "floor"
+
+    def toggle_simulation(self):
+        """Inicia ou para a simulação de muitos clientes com o layout atual."""
+        if self.simulation is not None:
+            self.stop_simulation()
+            return
         rows, cols = self.grid_size
-        for i in range(rows):
-            for j in range(cols):
-                x1, y1 = j * self.cell_size + 10, i * self.cell_size + 10
-                x2, y2 = x1 + self.cell_size, y1 + self.cell_size
-                # Define corredores (colunas 2, 5, 8 com 6 blocos de altura)
-                if (j == 2 or j == 5 or j == 8) and 2 <= i <= 7:
-                    fill_color = "#8B4513"  # Marrom para corredores
-                else:
-                    fill_color = "#E0E0E0"  # Cinza claro para áreas externas
-                if (i, j) == self.start:
-                    # Desenha o carrinho
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill="#4CAF50", outline="#388E3C", width=2)
-                    self.canvas.create_text((x1 + x2) / 2, (y1 + y2) / 2, text="🛒", font=("Arial", 20))
-                elif (i, j) in self.cashiers:
-                    # Desenha o caixa
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill="#2196F3", outline="#1976D2", width=2)
-                    self.canvas.create_text((x1 + x2) / 2, (y1 + y2) / 2, text="💳", font=("Arial", 20))
-                elif (i, j) in self.blocked:
-                    # Desenha produtos
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill="#FF9800", outline="#F57C00", width=2)
-                    self.canvas.create_text((x1 + x2) / 2, (y1 + y2) / 2, text="📦", font=("Arial", 20))
-                elif (i, j) in self.forklifts:
-                    # Desenha empilhadeira
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill="#B0BEC5", outline="#78909C", width=2)
-                    self.canvas.create_text((x1 + x2) / 2, (y1 + y2) / 2, text="🚜", font=("Arial", 20))
-                else:
-                    # Desenha chão do corredor ou área externa
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill_color, outline="#B0B0B0", width=1)
-
-        # Desenha o caminho, se existir
-        if self.path and self.current_step < len(self.path) - 1:
-            for i in range(self.current_step + 1):
-                if i > 0:  # Não desenha a linha do início
-                    prev = self.path[i - 1]
-                    curr = self.path[i]
-                    x1 = prev[1] * self.cell_size + self.cell_size // 2 + 10
-                    y1 = prev[0] * self.cell_size + self.cell_size // 2 + 10
-                    x2 = curr[1] * self.cell_size + self.cell_size // 2 + 10
-                    y2 = curr[0] * self.cell_size + self.cell_size // 2 + 10
-                    self.canvas.create_line(x1, y1, x2, y2, fill="#FFC107", width=4)
+        layout = MarketLayout(rows, cols, cashiers=self.cashiers, corridors=self.corridor_positions, start=self.start)
+        layout.products = set(self.blocked)
+        layout.forklifts = set(self.forklifts)
+        self.path = None
+        self.renderer.clear_path()
+        self.simulation = Simulation(layout, arrival_rate=self.simulation_arrival_rate,
+                                     service_time=self.simulation_service_time, seed=random.randrange(2 ** 32))
+        self.simulation.subscribe(self)
+        self.snapshot = self.simulation.snapshot()
+        self.draw_market()
+        self.result_label.config(text="Simulação iniciada!")
+        print("Simulação iniciada!")
+        self._simulation_frame()
+
+    def stop_simulation(self):
+        """Para a simulação e volta a exibir o carrinho e os obstáculos da janela."""
+        if self.simulation is None:
+            return
+        self.simulation.unsubscribe(self)
+        summary = self.simulation.summary()
+        self.simulation = None
+        self.snapshot = None
+        self.draw_market()
+        msg = (f"Simulação encerrada no tick {summary['tick']}: {summary['served']} atendidos, "
+               f"{summary['tick_ms_mean']:.2f}ms por tick")
+        self.result_label.config(text=msg)
+        print(msg)
+
+    def _simulation_frame(self):
+        """Avança a simulação alguns ticks por quadro enquanto ela estiver ativa."""
+        if self.simulation is None:
+            return
+        self.simulation.run(self.ticks_per_frame)
+        self.root.after(self.frame_interval_ms, self._simulation_frame)
+
+    def simulation_snapshot(self, snapshot):
+        """Recebe um instantâneo da simulação e redesenha só as células que mudaram."""
+        previous = self.snapshot
+        self.snapshot = snapshot
+        changed = (previous.carts ^ snapshot.carts) | (previous.forklifts ^ snapshot.forklifts)
+        self.renderer.update_cells(changed)
+        stats = snapshot.stats
+        self.result_label.config(text=f"Tick {snapshot.tick}: {stats.active} carrinhos, {stats.queued} na fila, "
+                                      f"{self.simulation.total_served} atendidos, {stats.elapsed_ms:.2f}ms")
+
+    def draw_market(self):
+        """Desenha o grid do mercado no canvas, reconfigurando apenas as células que mudaram."""
+        with self.instrumentation.phase("draw"):
+            self.renderer.render(self.cell_kind)
+
+            # Desenha o caminho, se existir
+            if self.path and self.current_step < len(self.path) - 1:
+                self.renderer.set_path(self.path, self.current_step)
+            else:
+                self.renderer.clear_path()
+
+    def on_zoom(self, event):
+        """Aproxima ou afasta o grid em torno da célula sob o mouse."""
+        zoom_in = getattr(event, "delta", 0) > 0 or getattr(event, "num", None) == 4
+        self.renderer.zoom(1.25 if zoom_in else 0.8, anchor=self.renderer.cell_at(event.x, event.y))
 
     def animate_path(self):
         """Anima o caminho desenhando passo a passo até o final."""
         if self.path and self.current_step < len(self.path) - 1:
             self.is_animating = True  # Indica que a animação está em andamento
-            prev = self.path[self.current_step]
-            curr = self.path[self.current_step + 1]
-            x1 = prev[1] * self.cell_size + self.cell_size // 2 + 10
-            y1 = prev[0] * self.cell_size + self.cell_size // 2 + 10
-            x2 = curr[1] * self.cell_size + self.cell_size // 2 + 10
-            y2 = curr[0] * self.cell_size + self.cell_size // 2 + 10
-            self.canvas.create_line(x1, y1, x2, y2, fill="#FFC107", width=4)
+            if self.moving_forklifts.get():
+                self.renderer.update_cells(self.step_forklifts())
+                if not self._replan():
+                    self.result_label.config(text="Caminho bloqueado por uma empilhadeira!")
+                    self._finish_animation()
+                    return
             self.current_step += 1
+            self.renderer.set_path(self.path, self.current_step)
             self.root.after(200, self.animate_path)
         else:
-            self.current_step = 0  # Reinicia para a próxima animação
-            self.is_animating = False  # Indica que a animação terminou
+            self._finish_animation()
+
+    def _finish_animation(self):
+        """Encerra a animação e o replanejamento incremental."""
+        self.current_step = 0  # Reinicia para a próxima animação
+        self.is_animating = False  # Indica que a animação terminou
+        self._detach_planner()
 
     def run_bfs(self):
-        """Executa a busca em largura."""
+        """Executa a busca em largura (reversa, a partir dos caixas) e segue o caminho até o caixa mais próximo."""
         print("Iniciando BFS...")
-        start_time = time.time()
-        self.path, cashier = bfs(self.graph, self.start, set(self.cashiers))
-        elapsed = (time.time() - start_time) * 1000
+        start_time = time.perf_counter_ns()
+        self.routing_index.sync(self.graph, self.cashiers)
+        self.path, cashier = self.route_cache.get_or_compute(
+            self.start, self.cashiers, self.graph.version, lambda: self.routing_index.route(self.start))
+        elapsed_ns = time.perf_counter_ns() - start_time
+        elapsed = elapsed_ns / 1e6
+        if self.instrumentation.enabled:
+            self.instrumentation.record_phase("route", elapsed_ns)
         
         if self.path:
             steps = len(self.path) - 1
@@ -257,7 +418,7 @@ class MarketApp:
                 "time_ms": elapsed,
                 "start": self.start,
                 "cashier": cashier,
-                "path": self.path
+                "path": self.route_cache.encode(self.path)
             })
             self.current_step = 0
             self.animate_path()
@@ -266,6 +427,45 @@ class MarketApp:
             print(msg)
             self.result_label.config(text=msg)
 
+    def _cache_summary(self):
+        """Resumo dos contadores do cache de rotas, para dimensioná-lo."""
+        stats = self.route_cache.stats()
+        return (f"Cache de Rotas: {stats['hits']} acertos, {stats['misses']} falhas, "
+                f"{stats['evictions']} remoções, {stats['invalidations']} invalidações, "
+                f"{stats['size']}/{stats['maxsize']} entradas ({stats['hit_rate']:.0%} de acerto)")
+
+    def _instrumentation_summary(self):
+        """Linhas com os tempos de fase (percentis) e os contadores das buscas."""
+        if not self.instrumentation.enabled:
+            return ["Instrumentação desativada (fases e contadores não coletados)."]
+        lines = ["Fases (ms):"]
+        for name in sorted(self.instrumentation.phases):
+            phase = self.instrumentation.phase_summary(name)
+            lines.append(f"  {name}: {phase['calls']} execuções, p50 {phase['p50_ms']:.3f}, "
+                         f"p95 {phase['p95_ms']:.3f}, p99 {phase['p99_ms']:.3f}, máx {phase['max_ms']:.3f}")
+        lines.append("Contadores:")
+        for name, value in sorted(self.instrumentation.counters.items()):
+            lines.append(f"  {name}: {value}")
+        for name, value in sorted(self.instrumentation.peaks.items()):
+            lines.append(f"  {name}: {value}")
+        for name, memory in sorted(self.instrumentation.memory.items()):
+            lines.append(f"  memória {name}: {memory['allocated_kb']:.1f} KB alocados, "
+                         f"pico {memory['peak_kb']:.1f} KB")
+        return lines
+
+    def export_performance(self, path=None):
+        """Exporta as execuções e a instrumentação em JSON (pergunta o arquivo se path não for dado)."""
+        if path is None:
+            path = filedialog.asksaveasfilename(parent=self.root, defaultextension=".json",
+                                                filetypes=[("JSON", "*.json")], initialfile="desempenho.json")
+            if not path:
+                return None
+        runs = [{"algorithm": r["algorithm"], "steps": r["steps"], "time_ms": round(r["time_ms"], 4),
+                 "start": list(r["start"]), "cashier": list(r["cashier"])} for r in self.performance_results]
+        self.instrumentation.export_json(path, {"runs": runs, "route_cache": self.route_cache.stats()})
+        self.result_label.config(text=f"Desempenho exportado para {path}")
+        return path
+
     def show_performance_analysis(self):
         """Exibe uma análise de desempenho para BFS."""
         if not self.performance_results:
@@ -273,16 +473,21 @@ class MarketApp:
             print("Nenhum resultado de desempenho disponível!")
             return
 
-        # Calcula médias para BFS
+        # Média e percentis (janela das últimas max_performance_results execuções)
         bfs_results = self.performance_results
-        bfs_avg_steps = sum(r["steps"] for r in bfs_results) / len(bfs_results) if bfs_results else 0
-        bfs_avg_time = sum(r["time_ms"] for r in bfs_results) / len(bfs_results) if bfs_results else 0
+        times = [r["time_ms"] for r in bfs_results]
+        steps = [r["steps"] for r in bfs_results]
+        bfs_avg_steps = sum(steps) / len(steps)
+        bfs_avg_time = sum(times) / len(times)
 
         # Monta a mensagem de análise
         analysis_msg = (
             "Análise de Desempenho (BFS):\n"
             f"Média de Passos: {bfs_avg_steps:.2f}, Média de Tempo: {bfs_avg_time:.2f}ms\n"
-            f"Total de Execuções: {len(bfs_results)}"
+            f"Tempo p50/p95/p99: {percentile(times, 0.5):.2f}/{percentile(times, 0.95):.2f}/"
+            f"{percentile(times, 0.99):.2f}ms, Passos p50/p95: {percentile(steps, 0.5)}/{percentile(steps, 0.95)}\n"
+            f"Total de Execuções: {len(bfs_results)}\n"
+            f"{self._cache_summary()}"
         )
 
         # Exibe no terminal
@@ -296,24 +501,31 @@ class MarketApp:
         details_window.title("Detalhes de Desempenho (BFS)")
         details_text = tk.Text(details_window, height=20, width=80)
         details_text.pack(padx=10, pady=10)
+        tk.Button(details_window, text="Exportar JSON", command=self.export_performance,
+                  bg="#607D8B", fg="white", font=("Arial", 10, "bold"), relief="flat").pack(pady=(10, 0))
+        details_text.insert(tk.END, self._cache_summary() + "\n\n")
+        details_text.insert(tk.END, "\n".join(self._instrumentation_summary()) + "\n\n")
         details_text.insert(tk.END, "Detalhes de Cada Execução (BFS):\n\n")
         for i, result in enumerate(self.performance_results, 1):
             details_text.insert(tk.END, f"Execução {i}:\n")
             details_text.insert(tk.END, f"  Início: {result['start']}, Caixa: {result['cashier']}\n")
             details_text.insert(tk.END, f"  Passos: {result['steps']}, Tempo: {result['time_ms']:.2f}ms\n")
-            details_text.insert(tk.END, f"  Caminho: {result['path']}\n\n")
+            details_text.insert(tk.END, f"  Caminho: {self.route_cache.decode(result['path'])}\n\n")
         details_text.config(state=tk.DISABLED)
 
     def reset(self):
-        """Reseta o mercado, removendo bloqueios e recriando o grafo."""
-        self.start = (0, 0)
-        self.blocked = []
-        self.forklifts = []
+        """Reseta o mercado, voltando aos obstáculos do layout inicial (nenhum no mercado padrão)."""
+        if self.simulation is not None:
+            self.simulation.unsubscribe(self)
+            self.simulation = None
+            self.snapshot = None
+        self.start = self.layout.start
+        self._set_obstacles(self.layout.products, self.layout.forklifts)
         self.path = None
         self.current_step = 0
         self.is_animating = False  # Reseta o controle de animação
-        self.performance_results = []  # Limpa os resultados de desempenho
-        self.generate_graph()
+        self._detach_planner()
+        self.performance_results.clear()  # Limpa os resultados de desempenho
         self.draw_market()
         self.result_label.config(text="Mercado resetado! Pronto para nova navegação.")
         print("Mercado resetado!")
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Testes para o roteamento em lote de vários carrinhos.
+"""
+import unittest
+import random
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.market_graph import MarketGraph
+from src.data.grid_graph import GridGraph
+from src.algorithms.bfs import bfs
+from src.algorithms import batch
+from src.algorithms.batch import batch_route
+
+
+class TestBatchRoute(unittest.TestCase):
+    """Classe de teste para batch_route."""
+
+    def backends(self):
+        """Backends disponíveis neste ambiente (NumPy é opcional)."""
+        return [False, True] if batch.np is not None else [False]
+
+    def assert_matches_bfs(self, graph, cashiers, starts, **kwargs):
+        """Compara o resultado em lote com um BFS por carrinho."""
+        for use_numpy in self.backends():
+            routes = batch_route(graph, starts, cashiers, use_numpy=use_numpy, **kwargs)
+            self.assertEqual(len(routes), len(starts))
+            for k, start in enumerate(starts):
+                path, _ = bfs(graph, start, cashiers)
+                if path is None:
+                    self.assertEqual(routes.steps[k], -1)
+                    self.assertIsNone(routes.target(k))
+                    continue
+                self.assertEqual(routes.steps[k], len(path) - 1)
+                target = routes.target(k)
+                self.assertEqual(bfs(graph, start, [target])[0].__len__(), len(path))
+                if len(path) > 1:
+                    move = routes.next_move(k)
+                    self.assertIn(move, graph.get_neighbors(start))
+                    self.assertEqual(routes.steps[k] - 1, len(bfs(graph, move, [target])[0]) - 1)
+                else:
+                    self.assertIsNone(routes.next_move(k))
+
+    def test_three_by_three_grid(self):
+        """Testa os mesmos cenários do BFS no grid 3x3 dos testes existentes."""
+        graph = MarketGraph()
+        for i in range(3):
+            for j in range(2):
+                graph.add_edge((i, j), (i, j + 1))
+                graph.add_edge((j, i), (j + 1, i))
+        routes = batch_route(graph, [(0, 0), (2, 2), (0, 2)], [(1, 1), (2, 2)])
+        self.assertEqual(list(routes.steps), [2, 0, 2])
+        self.assertEqual([routes.target(k) for k in range(3)], [(1, 1), (2, 2), (1, 1)])
+        self.assertIsNone(routes.next_move(1))
+        self.assert_matches_bfs(graph, [(2, 2)], [(0, 0), (1, 2)])
+
+    def test_market_layout(self):
+        """Testa o layout padrão 11x11 com corredores e obstáculos aleatórios."""
+        rng = random.Random(1)
+        corridors = {(i, j) for i in range(2, 8) for j in (2, 5, 8)}
+        blocked = {(rng.randrange(11), rng.randrange(11)) for _ in range(15)}
+        cashiers = [(10, 1), (10, 3), (10, 5), (10, 7), (10, 9)]
+        graph = MarketGraph.from_grid(11, 11, (corridors | blocked) - set(cashiers))
+        starts = [(i, j) for i in range(11) for j in range(11)]
+        self.assert_matches_bfs(graph, cashiers, starts)
+
+    def test_grid_graph_and_out_of_bounds(self):
+        """Testa o uso com GridGraph e carrinhos fora do grid ou em células bloqueadas."""
+        grid = GridGraph(4, 4, blocked={(1, 0), (1, 1), (1, 2), (1, 3)})
+        routes = batch_route(grid, [(0, 0), (3, 0), (9, 9), (1, 1)], [(3, 3)])
+        self.assertEqual(list(routes.steps), [-1, 3, -1, -1])
+        self.assertEqual(routes.next_move(1), (3, 1))
+        with self.assertRaises(ValueError):
+            batch_route(GridGraph(2, 2, connectivity=8), [(0, 0)], [(1, 1)])
+
+    def test_numpy_is_opt_in(self):
+        """Testa que o padrão é a BFS em Python mesmo com NumPy instalado (a frente de onda é mais lenta)."""
+        grid = GridGraph(3, 3)
+        saved, batch.np = batch.np, object()  # Qualquer uso do "NumPy" aqui falharia
+        try:
+            routes = batch_route(grid, [(0, 0)], [(2, 2)])
+        finally:
+            batch.np = saved
+        self.assertEqual(list(routes.steps), [4])
+        self.assertEqual(routes.steps.typecode, "i")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Testes para a suíte de benchmark sem interface gráfica.
+"""
+import unittest
+import subprocess
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from src.benchmark import run_suite, to_csv, compare
+
+
+class TestBenchmark(unittest.TestCase):
+    """Classe de teste para src.benchmark."""
+
+    def test_run_suite_records(self):
+        """Testa se todos os mecanismos são medidos e retornam os mesmos passos."""
+        records = run_suite([11], [0.1], queries=5, warmup=0, repeat=1)
+        builds = [r["name"] for r in records if r["kind"] == "build"]
+        searches = [r for r in records if r["kind"] == "search"]
+        self.assertEqual(builds, ["market_graph", "grid_graph"])
+        self.assertEqual(len(searches), 6)
+        self.assertEqual(len({r["total_steps"] for r in searches}), 1)
+        self.assertTrue(to_csv(records).startswith("rows,cols,density,kind,name"))
+
+    def test_compare_detects_regressions(self):
+        """Testa a detecção de regressões de tempo e de resultado."""
+        baseline = run_suite([11], [0.1], engines=["bfs"], queries=3, warmup=0, repeat=1)
+        current = [dict(record) for record in baseline]
+        self.assertEqual(compare(current, baseline, 1.5), [])
+        current[-1]["median_ms"] = baseline[-1]["median_ms"] * 2 + 1
+        current[-1]["total_steps"] += 1
+        self.assertEqual(len(compare(current, baseline, 1.5)), 2)
+        with self.assertRaises(ValueError):
+            run_suite([11], [0.1], engines=["desconhecido"])
+
+    def test_core_does_not_import_tkinter(self):
+        """Testa se importar o núcleo de roteamento não carrega o tkinter."""
+        code = ("import sys; import src.benchmark, src.algorithms.weighted, src.data.grid_graph; "
+                "sys.exit('tkinter' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT)
+        self.assertEqual(result.returncode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
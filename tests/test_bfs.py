@@ -9,7 +9,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.data.market_graph import MarketGraph
-from src.algorithms.bfs import bfs
+from src.algorithms.bfs import bfs, bfs_nearest_goals, bfs_distances
 
 
 class TestBFS(unittest.TestCase):
@@ -69,6 +69,40 @@ class TestBFS(unittest.TestCase):
         self.assertIsNone(path)
         self.assertIsNone(goal)
 
+    def test_bfs_start_is_goal(self):
+        """Testa se o BFS retorna o próprio início quando ele já é um objetivo."""
+        path, goal = bfs(self.graph, (1, 1), {(1, 1), (2, 2)})
+
+        self.assertEqual(path, [(1, 1)])
+        self.assertEqual(goal, (1, 1))
+
+    def test_bfs_path_is_connected(self):
+        """Testa se cada passo do caminho reconstruído segue uma aresta do grafo."""
+        path, _ = bfs(self.graph, (0, 0), [(2, 2)])
+
+        for current, following in zip(path, path[1:]):
+            self.assertIn(following, self.graph.get_neighbors(current))
+
+    def test_bfs_nearest_goals_early_exit(self):
+        """Testa se o modo multiobjetivo retorna os objetivos em ordem de distância."""
+        goals = {(2, 2), (0, 1), (1, 1)}
+
+        results = bfs_nearest_goals(self.graph, (0, 0), goals, limit=2)
+        self.assertEqual([goal for _, goal in results], [(0, 1), (1, 1)])
+        self.assertEqual([len(path) - 1 for path, _ in results], [1, 2])
+
+        results = bfs_nearest_goals(self.graph, (0, 0), goals)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[-1][1], (2, 2))
+
+    def test_bfs_distances(self):
+        """Testa o cálculo das distâncias até todos os objetivos alcançáveis."""
+        self.graph.add_vertex((5, 5))  # Vértice isolado, inalcançável
+
+        distances = bfs_distances(self.graph, (0, 0), {(1, 1), (2, 2), (0, 2), (5, 5)})
+
+        self.assertEqual(distances, {(1, 1): 2, (2, 2): 4, (0, 2): 2})
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
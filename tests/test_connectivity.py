@@ -0,0 +1,139 @@
+"""
+Testes para o índice de conectividade (union-find) e o sorteio de obstáculos conectado.
+"""
+import unittest
+import random
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.connectivity import ConnectivityIndex, safe_to_block
+from src.data.grid_graph import GridGraph
+from src.data.layout import (MarketLayout, default_cashiers, default_corridors, forbidden_positions,
+                             sample_connected_obstacles, sample_obstacles)
+from src.data.market_graph import MarketGraph
+from src.algorithms.bfs import bfs
+
+
+def occupancy(rows, cols, blocked):
+    cells = bytearray(b"\x01") * (rows * cols)
+    for i, j in blocked:
+        cells[i * cols + j] = 0
+    return cells
+
+
+class TestConnectivityIndex(unittest.TestCase):
+    """Classe de teste para o ConnectivityIndex."""
+
+    def test_safe_to_block(self):
+        """Testa a condição local: cortar um corredor de largura 1 não é seguro, a ponta é."""
+        # Linha 1 livre entre paredes nas linhas 0 e 2
+        cells = occupancy(3, 5, [(0, j) for j in range(5)] + [(2, j) for j in range(5)])
+        self.assertFalse(safe_to_block(cells, 3, 5, 1 * 5 + 2))
+        self.assertTrue(safe_to_block(cells, 3, 5, 1 * 5 + 0))
+        open_cells = occupancy(3, 3, [])
+        self.assertTrue(safe_to_block(open_cells, 3, 3, 4))
+
+    def test_isolated_pocket(self):
+        """Testa que um bolsão cercado não alcança o caixa até que a parede seja aberta."""
+        wall = [(2, 0), (2, 1), (2, 2), (1, 2), (0, 2)]
+        index = ConnectivityIndex(5, 5, occupancy(5, 5, wall), [(4, 4)])
+        self.assertFalse(index.reaches_cashier((0, 0)))
+        self.assertTrue(index.reaches_cashier((0, 4)))
+        self.assertFalse(index.connected((0, 0), (4, 4)))
+        self.assertEqual(sorted(index.unreachable_cells()), [(0, 0), (0, 1), (1, 0), (1, 1)])
+        self.assertNotIn((4, 4), index.reachable_cells())
+
+        self.assertTrue(index.unblock((1, 2)))
+        self.assertTrue(index.reaches_cashier((0, 0)))
+        self.assertEqual(index.rebuilds, 1)  # Liberar é só uma união
+        self.assertTrue(index.block((1, 2)))
+        self.assertFalse(index.reaches_cashier((0, 0)))
+        self.assertEqual(index.rebuilds, 2)  # Bloqueio que separa força a reconstrução
+        self.assertFalse(index.block((1, 2)))
+        self.assertFalse(index.reaches_cashier((9, 9)))
+
+    def test_incremental_changes_match_rebuild(self):
+        """Testa que bloqueios e liberações aleatórios dão o mesmo resultado que um índice novo."""
+        rng = random.Random(3)
+        rows, cols = 12, 14
+        cashiers = [(11, 1), (11, 7), (11, 12)]
+        index = ConnectivityIndex(rows, cols, occupancy(rows, cols, []), cashiers)
+        cells = [(i, j) for i in range(rows) for j in range(cols) if (i, j) not in cashiers]
+        for step in range(600):
+            cell = rng.choice(cells)
+            if index.is_free(cell):
+                index.block(cell)
+            else:
+                index.unblock(cell)
+            if step % 7 == 0:
+                fresh = ConnectivityIndex(rows, cols, index.cells, cashiers)
+                self.assertEqual(index.reachable_cells(), fresh.reachable_cells())
+        self.assertLess(index.rebuilds, 600 // 7 + 2)
+
+    def test_listens_to_market_graph(self):
+        """Testa o índice criado de um MarketGraph e atualizado como ouvinte."""
+        graph = MarketGraph.from_grid(5, 5, {(2, 0), (2, 1), (2, 2), (2, 3)})
+        index = ConnectivityIndex.from_graph(graph, [(4, 0)])
+        graph.subscribe(index)
+        self.assertTrue(index.reaches_cashier((0, 0)))
+        graph.block_cell((2, 4))
+        self.assertFalse(index.reaches_cashier((0, 0)))
+        self.assertEqual(bfs(graph, (0, 0), [(4, 0)]), (None, None))
+        graph.unblock_cell((2, 4))
+        self.assertTrue(index.reaches_cashier((0, 0)))
+        grid_index = ConnectivityIndex.from_graph(GridGraph(5, 5, blocked={(2, 0), (2, 1)}), [(4, 0)])
+        self.assertTrue(grid_index.reaches_cashier((0, 0)))
+
+
+class TestConnectedSampler(unittest.TestCase):
+    """Classe de teste para sample_connected_obstacles."""
+
+    def assert_keeps_reachability(self, rows, cols, products, forklifts):
+        cashiers = default_cashiers(rows, cols)
+        corridors = default_corridors(rows, cols)
+        base = ConnectivityIndex(rows, cols, occupancy(rows, cols, corridors), cashiers)
+        placed = set(products) | set(forklifts)
+        after = ConnectivityIndex(rows, cols, occupancy(rows, cols, corridors | placed), cashiers)
+        expected = [cell for cell in base.reachable_cells() if cell not in placed]
+        self.assertEqual(after.reachable_cells(), expected)
+
+    def test_modes_keep_cashiers_reachable(self):
+        """Testa que os dois modos respeitam as posições proibidas e não isolam células."""
+        rows, cols = 20, 20
+        cashiers = default_cashiers(rows, cols)
+        corridors = default_corridors(rows, cols)
+        forbidden = forbidden_positions(rows, cols, cashiers, corridors, (0, 0))
+        rng = random.Random(1)
+        for mode, n_products in (("repair", 100), ("reject", 15)):
+            for _ in range(5):
+                products, forklifts = sample_connected_obstacles(rows, cols, cashiers, corridors, (0, 0),
+                                                                 n_products, 2, rng, mode=mode)
+                self.assertEqual(len(products), n_products)
+                self.assertEqual(len(forklifts), 2)
+                self.assertFalse(set(products) & set(forklifts))
+                self.assertFalse((set(products) | set(forklifts)) & forbidden)
+                self.assert_keeps_reachability(rows, cols, products, forklifts)
+        with self.assertRaises(ValueError):
+            sample_connected_obstacles(rows, cols, cashiers, corridors, (0, 0), mode="outro")
+
+    def test_dense_layout_has_no_pockets(self):
+        """Testa que, na densidade em que o sorteio simples isola células, o conectado não isola."""
+        rng = random.Random(0)
+        layout = MarketLayout(40, 40)
+        products, forklifts = sample_obstacles(40, 40, layout.cashiers, layout.corridors, layout.start,
+                                               500, 2, rng)
+        layout.products = set(products)
+        self.assertTrue(ConnectivityIndex.from_layout(layout).unreachable_cells())
+
+        connected = MarketLayout.random(40, 40, density=0.4, rng=random.Random(0), connected=True)
+        self.assertGreater(len(connected.products), 400)
+        self.assertEqual(ConnectivityIndex.from_layout(connected, include_forklifts=False).unreachable_cells(), [])
+        self.assertEqual(len(connected.reachable_cells()), len(connected.free_cells()))
+        self.assertEqual(sample_connected_obstacles(2, 2, [(1, 1)], set(), (0, 0)), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Testes para o replanejamento incremental (D* Lite).
+"""
+import unittest
+import random
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.market_graph import MarketGraph
+from src.algorithms.bfs import bfs
+from src.algorithms.dstar_lite import DStarLite
+
+
+class TestDStarLite(unittest.TestCase):
+    """Classe de teste para o D* Lite."""
+
+    def setUp(self):
+        """Configura um grid 6x6 com dois caixas e um planejador inscrito no grafo."""
+        self.graph = MarketGraph.from_grid(6, 6)
+        self.cashiers = [(5, 0), (5, 5)]
+        self.planner = DStarLite(self.graph, self.cashiers, (0, 2))
+        self.graph.subscribe(self.planner)
+
+    def test_initial_route(self):
+        """Testa se a primeira rota tem o mesmo tamanho da rota do BFS."""
+        path, cashier = self.planner.route()
+        expected, _ = bfs(self.graph, (0, 2), self.cashiers)
+        self.assertEqual(len(path), len(expected))
+        self.assertEqual(path[0], (0, 2))
+        self.assertEqual(path[-1], cashier)
+
+    def test_reuses_route_while_nothing_changes(self):
+        """Testa que andar pelo caminho sem mudanças no grafo não expande vértices."""
+        path, _ = self.planner.route()
+        expanded = self.planner.expanded
+        self.planner.move_to(path[1])
+        self.assertEqual(self.planner.route()[0], path[1:])
+        self.assertEqual(self.planner.expanded, expanded)
+
+    def test_reroutes_when_path_is_blocked(self):
+        """Testa o desvio quando uma célula do caminho é bloqueada."""
+        path, _ = self.planner.route()
+        self.planner.move_to(path[1])
+        self.graph.block_cell(path[3])
+        new_path, cashier = self.planner.route()
+        self.assertNotIn(path[3], new_path)
+        self.assertEqual(new_path[0], path[1])
+        self.assertEqual(len(new_path), len(bfs(self.graph, path[1], self.cashiers)[0]))
+        self.assertIn(cashier, self.cashiers)
+
+    def test_no_route_and_recovery(self):
+        """Testa a ausência de caminho e a volta dele quando a célula é liberada."""
+        for j in range(6):
+            self.graph.block_cell((3, j))
+        self.assertEqual(self.planner.route(), (None, None))
+        self.assertIsNone(self.planner.next_step())
+        self.graph.unblock_cell((3, 4))
+        path, cashier = self.planner.route()
+        self.assertIn((3, 4), path)
+        self.assertEqual(cashier, (5, 5))
+
+    def test_cashier_blocked_and_unblocked(self):
+        """Testa que um caixa bloqueado e depois liberado volta a ser destino."""
+        graph = MarketGraph.from_grid(4, 4, set())
+        planner = DStarLite(graph, [(3, 3)], (0, 0))
+        graph.subscribe(planner)
+        graph.block_cell((3, 3))
+        self.assertEqual(planner.route(), (None, None))
+        graph.unblock_cell((3, 3))
+        path, cashier = planner.route()
+        self.assertEqual(cashier, (3, 3))
+        self.assertEqual(len(path), len(bfs(graph, (0, 0), [(3, 3)])[0]))
+
+    def test_missed_changes_rebuild(self):
+        """Testa que mudanças feitas sem o planejador inscrito forçam um recálculo correto."""
+        self.planner.route()
+        self.graph.unsubscribe(self.planner)
+        self.graph.block_cell((1, 2))
+        self.graph.subscribe(self.planner)
+        self.graph.block_cell((2, 2))
+        path, _ = self.planner.route()
+        self.assertEqual(len(path), len(bfs(self.graph, (0, 2), self.cashiers)[0]))
+
+    def test_matches_bfs_with_moving_obstacles(self):
+        """Testa que, com obstáculos mudando a cada passo, as rotas têm o tamanho das do BFS."""
+        rng = random.Random(3)
+        for _ in range(30):
+            rows, cols = rng.randint(3, 12), rng.randint(3, 12)
+            cashiers = [(rows - 1, j) for j in range(0, cols, 3)]
+            obstacles = {(i, j) for i in range(rows - 1) for j in range(cols) if rng.random() < 0.25}
+            graph = MarketGraph.from_grid(rows, cols, obstacles)
+            start = rng.choice([v for v in graph.get_vertices() if v not in cashiers])
+            planner = DStarLite(graph, cashiers, start)
+            graph.subscribe(planner)
+            for _ in range(20):
+                for _ in range(rng.randint(0, 3)):
+                    cell = (rng.randrange(rows - 1), rng.randrange(cols))
+                    if cell == planner.start:
+                        continue
+                    if cell in graph.obstacles:
+                        graph.unblock_cell(cell)
+                    else:
+                        graph.block_cell(cell)
+                path, _ = planner.route()
+                expected, _ = bfs(graph, planner.start, cashiers)
+                if expected is None:
+                    self.assertIsNone(path)
+                    break
+                self.assertEqual(len(path), len(expected))
+                for current, following in zip(path, path[1:]):
+                    self.assertIn(following, graph.get_neighbors(current))
+                if len(path) == 1:
+                    break
+                planner.move_to(path[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Testes para o grafo compacto em grid.
+"""
+import unittest
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.market_graph import MarketGraph
+from src.data.grid_graph import GridGraph
+from src.algorithms.bfs import bfs
+
+
+class TestGridGraph(unittest.TestCase):
+    """Classe de teste para o GridGraph."""
+
+    def setUp(self):
+        """Configura o mesmo grid 4x4 com obstáculos nas duas representações."""
+        self.blocked = {(1, 1), (1, 2), (2, 1)}
+        self.grid = GridGraph(4, 4, blocked=self.blocked)
+        self.market = MarketGraph()
+        for i in range(4):
+            for j in range(4):
+                if (i, j) in self.blocked:
+                    continue
+                if i < 3 and (i + 1, j) not in self.blocked:
+                    self.market.add_edge((i, j), (i + 1, j))
+                if j < 3 and (i, j + 1) not in self.blocked:
+                    self.market.add_edge((i, j), (i, j + 1))
+
+    def test_neighbors_match_market_graph(self):
+        """Testa se os vizinhos implícitos são os mesmos (e na mesma ordem) do MarketGraph."""
+        for vertex in self.market.get_vertices():
+            self.assertEqual(self.grid.get_neighbors(vertex), self.market.get_neighbors(vertex))
+            self.assertEqual(self.grid[vertex], self.market.graph[vertex])
+
+    def test_vertices_and_membership(self):
+        """Testa get_vertices, `in` e len ignorando células bloqueadas."""
+        self.assertEqual(len(self.grid), 13)
+        self.assertEqual(sorted(self.grid.get_vertices()), sorted(self.market.get_vertices()))
+        self.assertNotIn((1, 1), self.grid)
+        self.assertNotIn((4, 0), self.grid)
+        self.assertEqual(self.grid.get_neighbors((1, 1)), [])
+        with self.assertRaises(KeyError):
+            self.grid[(1, 1)]
+
+    def test_bfs_on_grid_graph(self):
+        """Testa se o BFS produz o mesmo resultado nos dois grafos."""
+        goals = {(3, 3), (2, 2)}
+        self.assertEqual(bfs(self.grid, (0, 0), goals), bfs(self.market, (0, 0), goals))
+
+    def test_block_and_unblock(self):
+        """Testa se bloquear e liberar células atualiza vizinhos e versão."""
+        self.grid.block((0, 1))
+        self.assertNotIn((0, 1), self.grid.get_neighbors((0, 0)))
+        self.grid.unblock((1, 1))
+        self.assertIn((1, 1), self.grid.get_neighbors((1, 0)))
+        self.assertEqual(self.grid.version, 2)
+
+    def test_eight_connectivity_without_corner_cutting(self):
+        """Testa as diagonais no modo 8-conectado, sem atravessar quinas bloqueadas."""
+        grid = GridGraph(3, 3, connectivity=8, blocked={(0, 1)})
+        neighbors = set(grid.get_neighbors((1, 1)))
+        self.assertEqual(neighbors, {(1, 0), (2, 1), (1, 2), (2, 0), (2, 2)})
+        path, _ = bfs(grid, (2, 0), {(0, 2)})
+        self.assertEqual(len(path) - 1, 3)
+
+    def test_invalid_arguments(self):
+        """Testa a validação de conectividade e de vértices fora do grid."""
+        with self.assertRaises(ValueError):
+            GridGraph(3, 3, connectivity=6)
+        with self.assertRaises(ValueError):
+            self.grid.block((9, 9))
+        with self.assertRaises(ValueError):
+            GridGraph.from_cells(2, 2, b"\x01\x01\x01")
+
+
+if __name__ == '__main__':
+    unittest.main()
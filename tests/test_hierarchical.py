@@ -0,0 +1,128 @@
+"""
+Testes para o roteamento hierárquico (HPA*).
+"""
+import unittest
+import random
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.grid_graph import GridGraph
+from src.data.market_graph import MarketGraph
+from src.algorithms.bfs import bfs
+from src.algorithms.hierarchical import HierarchicalRouter
+
+
+class TestHierarchicalRouter(unittest.TestCase):
+    """Classe de teste para o HierarchicalRouter."""
+
+    def assertValidPath(self, graph, path, start, goals):
+        """Verifica que o caminho começa no início, termina em um objetivo e só usa movimentos válidos."""
+        self.assertEqual(path[0], start)
+        self.assertIn(path[-1], goals)
+        for current, following in zip(path, path[1:]):
+            self.assertIn(following, graph.get_neighbors(current))
+
+    def test_open_grid_route(self):
+        """Testa uma rota longa em um grid aberto, com o mesmo tamanho da do BFS."""
+        graph = GridGraph(40, 40)
+        router = HierarchicalRouter.from_graph(graph, 8)
+        path, goal = router.route((0, 0), [(39, 39)])
+        self.assertEqual(goal, (39, 39))
+        self.assertValidPath(graph, path, (0, 0), [(39, 39)])
+        self.assertEqual(len(path) - 1, 78)
+
+    def test_matches_bfs_reachability(self):
+        """Testa, em grids aleatórios com mudanças, que há rota exatamente quando o BFS encontra uma."""
+        rng = random.Random(5)
+        for _ in range(150):
+            rows, cols = rng.randint(1, 24), rng.randint(1, 24)
+            graph = GridGraph(rows, cols)
+            for _ in range(int(rows * cols * rng.random() * 0.4)):
+                graph.cells[rng.randrange(rows * cols)] = 0
+            router = HierarchicalRouter.from_graph(graph, rng.randint(2, 7))
+            for _ in range(4):
+                cell = (rng.randrange(rows), rng.randrange(cols))
+                if graph.is_open(cell):
+                    graph.block(cell)
+                    router.block(cell)
+                else:
+                    graph.unblock(cell)
+                    router.unblock(cell)
+                start = (rng.randrange(rows), rng.randrange(cols))
+                goals = [(rng.randrange(rows), rng.randrange(cols)) for _ in range(3)]
+                expected = bfs(graph, start, goals)[0] if graph.is_open(start) else None
+                path, goal = router.route(start, goals)
+                self.assertEqual(path is None, expected is None)
+                if path is not None:
+                    self.assertValidPath(graph, path, start, goals)
+                    self.assertEqual(path[-1], goal)
+                    self.assertGreaterEqual(len(path), len(expected))
+
+    def test_nearest_cashier_market_graph(self):
+        """Testa o caixa escolhido em um MarketGraph com uma parede e o acompanhamento das mudanças."""
+        graph = MarketGraph.from_grid(12, 12, {(6, j) for j in range(11)})
+        router = HierarchicalRouter.from_graph(graph, 4, grid_size=(12, 12))
+        graph.subscribe(router)
+        cashiers = [(11, 0), (11, 11)]
+        path, cashier = router.route((0, 0), cashiers)
+        self.assertEqual(cashier, (11, 11))
+        self.assertValidPath(graph, path, (0, 0), cashiers)
+
+        graph.block_cell((6, 11))
+        self.assertEqual(router.route((0, 0), cashiers), (None, None))
+        graph.unblock_cell((6, 0))
+        path, cashier = router.route((0, 0), cashiers)
+        self.assertEqual(cashier, (11, 0))
+        self.assertIn((6, 0), path)
+        self.assertValidPath(graph, path, (0, 0), cashiers)
+
+    def test_change_recomputes_only_its_cluster(self):
+        """Testa que bloquear uma célula no interior de um bloco recalcula só a tabela daquele bloco."""
+        graph = GridGraph(32, 32)
+        router = HierarchicalRouter.from_graph(graph, 8)
+        router.route((0, 0), [(31, 31)])
+        built = router.clusters_built
+        router.block((11, 11))  # Interior do bloco (1, 1): nenhuma entrada muda
+        path, _ = router.route((0, 0), [(31, 31)])
+        self.assertNotIn((11, 11), path)
+        self.assertLessEqual(router.clusters_built - built, 1)
+
+        built = router.clusters_built
+        router.block((15, 12))  # Borda sul do bloco (1, 1): o bloco de baixo também muda
+        router.route((0, 0), [(31, 31)])
+        self.assertLessEqual(router.clusters_built - built, 2)
+
+    def test_multi_floor_with_lifts(self):
+        """Testa uma rota que só existe passando por outro andar."""
+        ground, upper = GridGraph(10, 10), GridGraph(10, 10)
+        for j in range(10):
+            ground.block((5, j))
+        router = HierarchicalRouter([ground, upper], 4, lifts=[((0, 0, 9), (1, 0, 9)),
+                                                                ((1, 9, 9), (0, 9, 9), 3)])
+        path, cashier = router.route((0, 0, 0), [(0, 9, 0)])
+        self.assertEqual(cashier, (0, 9, 0))
+        self.assertEqual(path[0], (0, 0, 0))
+        self.assertIn((1, 0, 9), path)
+        self.assertIn((0, 9, 9), path)
+        for (fa, ia, ja), (fb, ib, jb) in zip(path, path[1:]):
+            if fa == fb:
+                self.assertEqual(abs(ia - ib) + abs(ja - jb), 1)
+                self.assertTrue(router.floors[fb].is_open((ib, jb)))
+
+        # Sem o elevador de descida, não há caminho
+        router.block((1, 9, 9))
+        self.assertEqual(router.route((0, 0, 0), [(0, 9, 0)]), (None, None))
+
+    def test_invalid_arguments(self):
+        """Testa a rejeição de grids 8-conectados e de ligações fora da loja."""
+        with self.assertRaises(ValueError):
+            HierarchicalRouter([GridGraph(5, 5, connectivity=8)])
+        with self.assertRaises(ValueError):
+            HierarchicalRouter([GridGraph(5, 5)], lifts=[((0, 0, 0), (1, 0, 0))])
+
+
+if __name__ == "__main__":
+    unittest.main()
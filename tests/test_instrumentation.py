@@ -0,0 +1,130 @@
+"""
+Testes para a instrumentação das buscas.
+"""
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.grid_graph import GridGraph
+from src.data.market_graph import MarketGraph
+from src.algorithms.bfs import bfs
+from src.algorithms.weighted import astar, dijkstra
+from src.algorithms.jps import jps
+from src.algorithms.routing_index import RoutingIndex
+from src.utils import instrumentation
+from src.utils.instrumentation import Instrumentation, percentile
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Classe de teste para o coletor de instrumentação."""
+
+    def setUp(self):
+        """Começa cada teste com o coletor global limpo e desativado."""
+        instrumentation.disable()
+        instrumentation.ACTIVE.reset()
+        self.probe = instrumentation.ACTIVE
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.ACTIVE.reset()
+
+    def test_disabled_collects_nothing(self):
+        """Testa que, desativado, nenhuma busca ou fase deixa registros."""
+        graph = MarketGraph.from_grid(6, 6)
+        bfs(graph, (0, 0), [(5, 5)])
+        astar(graph, (0, 0), [(5, 5)])
+        with self.probe.phase("draw"):
+            pass
+        self.probe.count("x")
+        summary = self.probe.summary()
+        self.assertEqual(summary["counters"], {})
+        self.assertEqual(summary["phases"], {})
+        self.assertEqual(summary["peaks"], {})
+
+    def test_search_counters(self):
+        """Testa os contadores de expansões, arestas, fronteira e duplicatas das buscas."""
+        instrumentation.enable()
+        graph = MarketGraph.from_grid(6, 6)
+        bfs(graph, (0, 0), [(5, 5)])
+        counters = self.probe.counters
+        self.assertEqual(counters["bfs.searches"], 1)
+        self.assertGreater(counters["bfs.expanded"], 0)
+        self.assertGreaterEqual(counters["bfs.edges"], counters["bfs.expanded"])
+        self.assertGreater(self.probe.peaks["bfs.frontier_peak"], 0)
+
+        # Custos diferentes forçam o Dijkstra a diminuir prioridades já inseridas
+        costs = {(0, j): 5 for j in range(1, 6)}
+        costs[(1, 0)] = 5
+        dijkstra(graph, (0, 0), [(0, 5)], cell_costs=costs)
+        self.assertGreater(counters["dijkstra.expanded"], 0)
+        self.assertIn("dijkstra.duplicates", counters)
+        astar(graph, (0, 0), [(5, 5)])
+        self.assertEqual(counters["astar.searches"], 1)
+        jps(GridGraph(6, 6), (0, 0), [(5, 5)])
+        self.assertGreater(counters["jps.expanded"], 0)
+
+        RoutingIndex(graph, [(5, 5)])
+        self.assertEqual(counters["routing_index.expanded"], 36)
+        self.assertEqual(self.probe.phase_summary("routing_index.rebuild")["calls"], 1)
+
+    def test_phase_percentiles_and_window(self):
+        """Testa os percentis das fases e o limite de amostras guardadas."""
+        probe = Instrumentation(enabled=True, max_samples=10)
+        for elapsed_ms in range(1, 101):
+            probe.record_phase("route", elapsed_ms * 1_000_000)
+        summary = probe.phase_summary("route")
+        self.assertEqual(summary["calls"], 100)
+        self.assertAlmostEqual(summary["total_ms"], 5050)
+        self.assertEqual(summary["max_ms"], 100)
+        self.assertEqual(summary["p50_ms"], 95)  # Só as 10 amostras mais recentes (91 a 100)
+        self.assertEqual(percentile([3, 1, 2], 0.5), 2)
+        self.assertEqual(percentile([], 0.99), 0)
+
+    def test_memory_and_json_export(self):
+        """Testa a medição de memória com tracemalloc e a exportação em JSON."""
+        instrumentation.enable(trace_memory=True)
+        with self.probe.phase("generate_graph"):
+            data = [bytearray(1024) for _ in range(64)]
+        self.assertEqual(len(data), 64)
+        self.assertGreater(self.probe.memory["generate_graph"]["peak_kb"], 32)
+        self.assertIsNotNone(self.probe.memory_snapshot("depois"))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metricas.json")
+            self.probe.export_json(path, {"runs": [{"steps": 3}]})
+            with open(path, encoding="utf-8") as file:
+                exported = json.load(file)
+        self.assertEqual(exported["phases"]["generate_graph"]["calls"], 1)
+        self.assertEqual(exported["runs"], [{"steps": 3}])
+        self.assertEqual(exported["snapshots"][0]["label"], "depois")
+
+    def test_nested_phases_keep_outer_peak(self):
+        """Testa que uma fase aninhada não apaga o pico de memória da fase de fora."""
+        instrumentation.enable(trace_memory=True)
+        with self.probe.phase("generate_graph"):
+            data = bytearray(4 * 1024 * 1024)
+            del data
+            with self.probe.phase("routing_index.rebuild"):
+                small = bytearray(1024)
+        self.assertEqual(len(small), 1024)
+        self.assertGreater(self.probe.memory["generate_graph"]["peak_kb"], 4096)
+        self.assertLess(self.probe.memory["routing_index.rebuild"]["peak_kb"], 1024)
+
+        # Pico dentro de uma fase interna, seguida de outra que zera o pico de novo
+        with self.probe.phase("draw"):
+            with self.probe.phase("route"):
+                data = bytearray(4 * 1024 * 1024)
+                del data
+            with self.probe.phase("route"):
+                pass
+        self.assertGreater(self.probe.memory["draw"]["peak_kb"], 4096)
+        self.assertEqual(self.probe._memory_stack, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Testes para o Jump Point Search.
+"""
+import unittest
+import random
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.grid_graph import GridGraph
+from src.data.market_graph import MarketGraph
+from src.algorithms.bfs import bfs
+from src.algorithms.jps import _padded_occupancy, jps, jps_search
+
+
+class TestJPS(unittest.TestCase):
+    """Classe de teste para o Jump Point Search."""
+
+    def assertValidPath(self, graph, path, start, goals):
+        """Verifica que o caminho começa no início, termina em um objetivo e só usa movimentos válidos."""
+        self.assertEqual(path[0], start)
+        self.assertIn(path[-1], goals)
+        for current, following in zip(path, path[1:]):
+            self.assertIn(following, graph.get_neighbors(current))
+
+    def test_open_grid(self):
+        """Testa que em um grid aberto o caminho é reto e poucos nós são expandidos."""
+        graph = GridGraph(50, 50)
+        path, goal, expanded = jps_search(graph, (0, 0), [(49, 49)])
+        self.assertEqual(goal, (49, 49))
+        self.assertEqual(len(path) - 1, 98)
+        self.assertValidPath(graph, path, (0, 0), [(49, 49)])
+        self.assertLess(expanded, 10)
+
+    def test_market_graph_with_wall(self):
+        """Testa o desvio de uma parede usando um MarketGraph em grid."""
+        graph = MarketGraph.from_grid(5, 5, {(2, 0), (2, 1), (2, 2), (2, 3)})
+        path, goal = jps(graph, (0, 0), [(4, 0)])
+        self.assertEqual(goal, (4, 0))
+        self.assertEqual(len(path) - 1, 12)
+        self.assertValidPath(graph, path, (0, 0), [(4, 0)])
+
+    def test_unreachable_and_invalid(self):
+        """Testa objetivos inalcançáveis, início bloqueado e início igual ao objetivo."""
+        graph = GridGraph(3, 3, blocked={(1, 0), (1, 1), (1, 2)})
+        self.assertEqual(jps(graph, (0, 0), [(2, 2)]), (None, None))
+        self.assertEqual(jps(graph, (1, 1), [(0, 0)]), (None, None))
+        self.assertEqual(jps(graph, (2, 2), [(2, 2)]), ([(2, 2)], (2, 2)))
+
+    def test_rejects_8_connected(self):
+        """Testa que grids 8-conectados são recusados."""
+        with self.assertRaises(ValueError):
+            jps(GridGraph(3, 3, connectivity=8), (0, 0), [(2, 2)])
+
+    def test_matches_bfs_on_random_grids(self):
+        """Testa que o JPS encontra caminhos com o mesmo número de passos do BFS."""
+        rng = random.Random(7)
+        for _ in range(300):
+            rows, cols = rng.randint(1, 12), rng.randint(1, 12)
+            density = rng.random() * 0.5
+            blocked = {(i, j) for i in range(rows) for j in range(cols) if rng.random() < density}
+            free = [(i, j) for i in range(rows) for j in range(cols) if (i, j) not in blocked]
+            if not free:
+                continue
+            graph = GridGraph(rows, cols, blocked=blocked)
+            start = rng.choice(free)
+            goals = rng.sample(free, min(len(free), rng.randint(1, 4)))
+            expected, _ = bfs(graph, start, goals)
+            path, goal = jps(graph, start, goals)
+            if expected is None:
+                self.assertIsNone(path)
+                continue
+            self.assertEqual(len(path), len(expected))
+            self.assertValidPath(graph, path, start, goals)
+            self.assertEqual(goal, path[-1])
+
+    def test_occupancy_reused_until_layout_changes(self):
+        """Testa que a ocupação é reaproveitada entre consultas e refeita quando o layout muda."""
+        for graph in (GridGraph(6, 6), MarketGraph.from_grid(6, 6)):
+            first = _padded_occupancy(graph)
+            self.assertIs(_padded_occupancy(graph), first)
+            path, _ = jps(graph, (0, 0), [(5, 0)])
+            self.assertEqual(len(path) - 1, 5)
+            for j in range(5):
+                if isinstance(graph, GridGraph):
+                    graph.block((2, j))
+                else:
+                    graph.block_cell((2, j))
+            self.assertIsNot(_padded_occupancy(graph), first)
+            path, _ = jps(graph, (0, 0), [(5, 0)])
+            self.assertEqual(len(path) - 1, 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
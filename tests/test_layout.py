@@ -0,0 +1,53 @@
+"""
+Testes para as regras de layout do mercado.
+"""
+import unittest
+import random
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.layout import (MarketLayout, default_cashiers, default_corridors,
+                             forbidden_positions, sample_obstacles)
+
+
+class TestLayout(unittest.TestCase):
+    """Classe de teste para o gerador de layouts."""
+
+    def test_defaults_match_original_market(self):
+        """Testa se os padrões reproduzem o mercado 11x11 do MarketApp."""
+        self.assertEqual(default_cashiers(11, 11), [(10, 1), (10, 3), (10, 5), (10, 7), (10, 9)])
+        self.assertEqual(default_corridors(11, 11), {(i, j) for i in range(2, 8) for j in (2, 5, 8)})
+
+    def test_sample_obstacles_respects_forbidden_positions(self):
+        """Testa se produtos e empilhadeiras evitam caixas, suas adjacências, carrinho e corredores."""
+        cashiers = default_cashiers(11, 11)
+        corridors = default_corridors(11, 11)
+        forbidden = forbidden_positions(11, 11, cashiers, corridors, (0, 0))
+        rng = random.Random(5)
+        for _ in range(20):
+            products, forklifts = sample_obstacles(11, 11, cashiers, corridors, (0, 0), rng=rng)
+            self.assertEqual(len(products), 10)
+            self.assertEqual(len(forklifts), 2)
+            self.assertFalse(set(products) & set(forklifts))
+            self.assertFalse((set(products) | set(forklifts)) & forbidden)
+
+    def test_sample_obstacles_without_space(self):
+        """Testa se nenhum obstáculo é colocado quando não há espaço suficiente."""
+        self.assertEqual(sample_obstacles(2, 2, [(1, 1)], set(), (0, 0)), ([], []))
+
+    def test_random_layout_density(self):
+        """Testa a densidade de produtos e a construção dos grafos."""
+        layout = MarketLayout.random(40, 40, density=0.25, rng=random.Random(0))
+        allowed = 40 * 40 - len(forbidden_positions(40, 40, layout.cashiers, layout.corridors, layout.start))
+        self.assertEqual(len(layout.products), int((allowed - 2) * 0.25))
+        graph = layout.build_graph()
+        grid = layout.build_grid_graph()
+        self.assertEqual(sorted(graph.get_vertices()), sorted(grid.get_vertices()))
+        self.assertNotIn(layout.start, layout.obstacles())
+
+
+if __name__ == '__main__':
+    unittest.main()
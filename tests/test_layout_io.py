@@ -0,0 +1,87 @@
+"""
+Testes para a leitura e gravação de layouts de loja.
+"""
+import unittest
+import os
+import random
+import sys
+import tempfile
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.layout import MarketLayout
+from src.data.layout_io import CellLayout, load_layout, save_layout, CASHIER, PRODUCT
+
+MAP = """
+S..#.
+.P.#.
+...F.
+C.C..
+"""
+
+
+class TestLayoutIO(unittest.TestCase):
+    """Classe de teste para os formatos ASCII, CSV e binário."""
+
+    def setUp(self):
+        """Cria um diretório temporário para os arquivos."""
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_parse_ascii(self):
+        """Testa a leitura do mapa ASCII e a conversão para MarketLayout."""
+        cells = CellLayout.from_ascii(MAP)
+        self.assertEqual((cells.rows, cells.cols), (4, 5))
+        self.assertEqual(cells.positions(CASHIER), [(3, 0), (3, 2)])
+        self.assertEqual(cells.positions(PRODUCT), [(1, 1)])
+        layout = cells.to_market_layout()
+        self.assertEqual(layout.start, (0, 0))
+        self.assertEqual(layout.corridors, {(0, 3), (1, 3)})
+        self.assertEqual(layout.forklifts, {(2, 3)})
+
+    def test_round_trip_all_formats(self):
+        """Testa se salvar e carregar em cada formato preserva o layout."""
+        layout = MarketLayout.random(30, 40, density=0.2, rng=random.Random(2))
+        expected = CellLayout.from_market_layout(layout)
+        for name in ("loja.txt", "loja.csv", "loja.sqm"):
+            save_layout(layout, self.path(name))
+            loaded = load_layout(self.path(name))
+            self.assertEqual(loaded, expected, name)
+            converted = loaded.to_market_layout()
+            self.assertEqual(converted.obstacles(), layout.obstacles())
+            self.assertEqual(sorted(converted.cashiers), sorted(layout.cashiers))
+            self.assertEqual(converted.start, layout.start)
+
+    def test_graphs_built_from_cells(self):
+        """Testa se os grafos construídos do array de células equivalem aos do MarketLayout."""
+        layout = MarketLayout.random(20, 20, density=0.3, rng=random.Random(4))
+        cells = CellLayout.from_market_layout(layout)
+        self.assertEqual(sorted(cells.to_grid_graph().get_vertices()),
+                         sorted(layout.build_grid_graph().get_vertices()))
+        self.assertEqual(cells.to_market_graph().graph, layout.build_graph().graph)
+
+    def test_invalid_inputs(self):
+        """Testa mensagens de erro para mapas e arquivos binários inválidos."""
+        with self.assertRaises(ValueError):
+            CellLayout.from_ascii("..\n...\n")
+        with self.assertRaises(ValueError):
+            CellLayout.from_ascii("..X\n")
+        with self.assertRaises(ValueError):
+            CellLayout.from_bytes(b"XXXX" + bytes(12))
+        data = CellLayout.from_ascii(MAP).to_bytes()
+        with self.assertRaises(ValueError):
+            CellLayout.from_bytes(data[:-1])
+        with open(self.path("vazio.sqm"), "wb"):
+            pass
+        with self.assertRaises(ValueError):
+            load_layout(self.path("vazio.sqm"))
+
+
+if __name__ == '__main__':
+    unittest.main()
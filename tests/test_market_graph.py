@@ -0,0 +1,92 @@
+"""
+Testes para as operações incrementais do MarketGraph.
+"""
+import unittest
+import random
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.market_graph import MarketGraph
+from src.algorithms.routing_index import RoutingIndex
+
+
+def adjacency_sets(graph):
+    """Converte o grafo em {vértice: conjunto de vizinhos} para comparação sem ordem."""
+    return {vertex: set(neighbors) for vertex, neighbors in graph.graph.items()}
+
+
+class TestMarketGraph(unittest.TestCase):
+    """Classe de teste para as operações de bloqueio do MarketGraph."""
+
+    def setUp(self):
+        """Configura um grid 5x5 com um corredor."""
+        self.corridor = {(1, 2), (2, 2), (3, 2)}
+        self.graph = MarketGraph.from_grid(5, 5, self.corridor)
+
+    def test_from_grid(self):
+        """Testa se from_grid cria só as células livres, ligadas nas 4 direções."""
+        self.assertEqual(len(self.graph.get_vertices()), 22)
+        self.assertNotIn((2, 2), self.graph.graph)
+        self.assertEqual(self.graph.get_neighbors((2, 1)), [(1, 1), (2, 0), (3, 1)])
+        self.assertEqual(self.graph.obstacles, self.corridor)
+
+    def test_block_and_unblock_cell(self):
+        """Testa se bloquear e liberar uma célula restaura exatamente o grafo original."""
+        original = adjacency_sets(self.graph)
+        version = self.graph.version
+
+        self.assertTrue(self.graph.block_cell((0, 0)))
+        self.assertEqual(self.graph.version, version + 1)  # Uma versão por mudança notificada
+        self.assertFalse(self.graph.block_cell((0, 0)))
+        self.assertNotIn((0, 0), self.graph.graph)
+        self.assertNotIn((0, 0), self.graph.get_neighbors((0, 1)))
+
+        self.assertTrue(self.graph.unblock_cell((0, 0)))
+        self.assertFalse(self.graph.unblock_cell((0, 0)))
+        self.assertEqual(adjacency_sets(self.graph), original)
+        self.assertGreater(self.graph.version, version)
+
+    def test_move_obstacle(self):
+        """Testa se mover um obstáculo equivale a reconstruir o grafo com a nova posição."""
+        self.graph.block_cell((4, 0))
+        self.assertTrue(self.graph.move_obstacle((4, 0), (4, 1)))
+        self.assertFalse(self.graph.move_obstacle((4, 0), (4, 3)))
+        self.assertFalse(self.graph.move_obstacle((4, 1), (2, 2)))
+        expected = MarketGraph.from_grid(5, 5, self.corridor | {(4, 1)})
+        self.assertEqual(adjacency_sets(self.graph), adjacency_sets(expected))
+
+    def test_unblock_requires_grid(self):
+        """Testa se liberar células exige um grafo criado com from_grid."""
+        graph = MarketGraph()
+        graph.add_edge((0, 0), (0, 1))
+        graph.block_cell((0, 1))
+        with self.assertRaises(ValueError):
+            graph.unblock_cell((0, 1))
+        self.assertIn((0, 1), graph.obstacles)
+
+    def test_listeners_keep_index_current(self):
+        """Testa se um RoutingIndex inscrito acompanha as mudanças sem reconstruções completas."""
+        cashiers = [(4, 1), (4, 3)]
+        index = RoutingIndex(self.graph, cashiers)
+        self.graph.subscribe(index)
+        rng = random.Random(7)
+        obstacle = (0, 0)
+        self.graph.block_cell(obstacle)
+        for _ in range(30):
+            i, j = obstacle
+            options = [cell for cell in ((i - 1, j), (i, j - 1), (i + 1, j), (i, j + 1))
+                       if cell in self.graph.graph and cell not in cashiers]
+            if not options:
+                break
+            new = rng.choice(options)
+            self.graph.move_obstacle(obstacle, new)
+            obstacle = new
+            self.assertFalse(index.sync())
+            self.assertEqual(index.distance, RoutingIndex(self.graph, cashiers).distance)
+
+
+if __name__ == '__main__':
+    unittest.main()
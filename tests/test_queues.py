@@ -0,0 +1,131 @@
+"""
+Testes para o simulador de eventos discretos das filas dos caixas.
+"""
+import unittest
+import os
+import sys
+import tempfile
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.market_graph import MarketGraph
+from src.algorithms.bfs import bfs_distances
+from src.algorithms.weighted import astar
+from src.simulation.queues import CashierQueueSimulator, read_arrival_log
+
+
+class TestCashierQueueSimulator(unittest.TestCase):
+    """Classe de teste para o CashierQueueSimulator e as QueueEstimates."""
+
+    def test_single_cashier_waits(self):
+        """Testa esperas e estimativas com chegadas e atendimentos conhecidos."""
+        # Atendimento = 10 + 1 por item: 20 para cestas de 10 itens
+        simulator = CashierQueueSimulator([(4, 0)], base_service=10, time_per_item=1, items_mean=10)
+        for at in (0, 5, 6):
+            simulator.schedule_arrival(at, items=10)
+        simulator.advance(6)
+        estimates = simulator.estimates
+        self.assertEqual(estimates.queue_length((4, 0)), 3)
+        self.assertEqual(estimates.expected_wait((4, 0)), 60)
+        while simulator.step():
+            pass
+        self.assertEqual(simulator.now, 60)
+        self.assertEqual(simulator.served, 3)
+        self.assertEqual(list(simulator.waits), [0.0, 15.0, 34.0])
+        self.assertEqual(estimates.queue_length((4, 0)), 0)
+        self.assertEqual(estimates.wait_times, {(4, 0): 0.0})
+        with self.assertRaises(ValueError):
+            simulator.schedule_arrival(10)
+
+    def test_estimates_feed_routing(self):
+        """Testa que a espera estimada desvia a rota para o caixa mais distante e livre."""
+        graph = MarketGraph.from_grid(5, 5)
+        near, far = (4, 0), (4, 4)
+        simulator = CashierQueueSimulator([near, far], base_service=10, time_per_item=0, cost_per_time=0.5)
+        for _ in range(3):
+            simulator.schedule_arrival(0, items=1, cashier=0)
+        simulator.advance(0)
+        estimates = simulator.estimates
+        self.assertEqual(estimates.wait_times[near], 15)  # 3 clientes x 10 s x 0,5 passo/s
+
+        path, cashier, total = astar(graph, (4, 1), [near, far], wait_times=estimates.wait_times)
+        self.assertEqual(cashier, far)
+        self.assertEqual(total, 3)
+        distances = bfs_distances(graph, (4, 1), [near, far])
+        self.assertEqual(estimates.best_cashier(distances), (far, 3))
+        self.assertEqual(estimates.best_cashier({}), (None, None))
+
+    def test_synthetic_run(self):
+        """Testa o modo sintético: todos atendidos e a política de menor espera melhor que a aleatória."""
+        waits = {}
+        for policy in ("shortest_wait", "random"):
+            simulator = CashierQueueSimulator([(9, j) for j in range(4)], arrival_rate=0.07,
+                                              speeds=[1.0, 1.0, 0.8, 1.2], policy=policy, seed=2)
+            simulator.run(customers=5000)
+            while simulator.step():
+                pass
+            summary = simulator.summary()
+            self.assertEqual(summary["events"], 10000)
+            self.assertEqual(summary["served"], 5000)
+            self.assertEqual(summary["in_system"], 0)
+            self.assertTrue(all(0 < cashier["utilization"] < 1 for cashier in summary["cashiers"]))
+            waits[policy] = summary["wait_mean"]
+        self.assertLess(waits["shortest_wait"], waits["random"])
+
+        simulator = CashierQueueSimulator([(0, 0)], seed=1)
+        simulator.run(until=1000)
+        self.assertEqual(simulator.now, 1000)
+        self.assertGreater(simulator.arrivals, 0)
+        with self.assertRaises(ValueError):
+            CashierQueueSimulator([(0, 0)], policy="outra")
+
+    def test_departure_before_arrival_at_same_instant(self):
+        """Testa que o fim de um atendimento é processado antes de uma chegada no mesmo instante."""
+        simulator = CashierQueueSimulator([(4, 0)], base_service=10, time_per_item=1)
+        simulator.schedule_arrival(0, items=10)
+        simulator.schedule_arrival(20, items=10)  # Agendada antes de existir a saída em 20
+        while simulator.step():
+            pass
+        self.assertEqual(simulator.max_length.tolist(), [1])  # Quem chega em 20 encontra o caixa livre
+        self.assertEqual(list(simulator.waits), [0.0, 0.0])
+        self.assertEqual(simulator.now, 40)
+
+    def test_replay_log(self):
+        """Testa o replay de um log CSV (segundos ou horário, caixa opcional) lido como fluxo."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "chegadas.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("time,items,cashier\n08:00:00,10,0\n08:00:05,10,0\n08:00:06,10,\n")
+            arrivals = read_arrival_log(path)
+            self.assertEqual(next(arrivals), (28800.0, 10, 0))
+            simulator = CashierQueueSimulator([(4, 0), (4, 2)], base_service=10, time_per_item=1)
+            simulator.advance(28800)
+            events = simulator.replay(read_arrival_log(path), speed=1e6)
+        self.assertEqual(events, 6)
+        self.assertEqual(simulator.served_by.tolist(), [2, 1])  # O terceiro cliente escolhe o caixa livre
+        self.assertEqual(list(simulator.waits), [0.0, 0.0, 15.0])
+
+    def test_replay_utilization_with_clock_time(self):
+        """Testa que a utilização de um dia em horário (08:00) é medida a partir da primeira chegada."""
+        simulator = CashierQueueSimulator([(4, 0)], base_service=10, time_per_item=1)
+        simulator.replay([(28800.0, 10, 0), (28805.0, 10, 0), (28806.0, 10, None)])
+        summary = simulator.summary()
+        self.assertEqual(summary["start"], 28800)
+        self.assertEqual(summary["time"], 28860)
+        self.assertEqual(summary["cashiers"][0]["utilization"], 1.0)  # 60 s ocupados em 60 s de dia
+
+    def test_invalid_cashier_index(self):
+        """Testa que índices de caixa fora da faixa (inclusive negativos) são recusados no replay."""
+        simulator = CashierQueueSimulator([(4, 0), (4, 2)])
+        for cashier in (2, 7, -1, -2, True, 1.0):
+            with self.assertRaises(ValueError):
+                simulator.schedule_arrival(0, items=3, cashier=cashier)
+        with self.assertRaises(ValueError):
+            simulator.replay([(0, 3, 1), (5, 3, 7)])
+        self.assertEqual(simulator.arrivals, 1)
+        self.assertEqual(simulator.served_by.tolist(), [0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Testes para o renderizador retido do grid.
+"""
+import unittest
+import itertools
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.renderer import GridRenderer
+
+
+class RecordingCanvas:
+    """Canvas mínimo que registra as chamadas feitas pelo renderizador."""
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.items = {}
+        self.configured = []
+
+    def _create(self, kind, *coords, **options):
+        item = next(self._ids)
+        self.items[item] = (kind, coords, options)
+        return item
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", *coords, **options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", *coords, **options)
+
+    def create_line(self, *coords, **options):
+        return self._create("line", *coords, **options)
+
+    def coords(self, item, *coords):
+        kind, _, options = self.items[item]
+        self.items[item] = (kind, coords, options)
+
+    def itemconfig(self, item, **options):
+        self.configured.append((item, options))
+        self.items[item][2].update(options)
+
+    def delete(self, item):
+        del self.items[item]
+
+    def count(self, kind):
+        return sum(1 for value in self.items.values() if value[0] == kind)
+
+
+class TestGridRenderer(unittest.TestCase):
+    """Classe de teste para o GridRenderer."""
+
+    def setUp(self):
+        """Configura um grid 11x11 com um carrinho e um caixa."""
+        self.canvas = RecordingCanvas()
+        self.renderer = GridRenderer(self.canvas, 11, 11, cell_size=40)
+        self.cart = (0, 0)
+        self.renderer.render(self.kind_of)
+
+    def kind_of(self, cell):
+        if cell == self.cart:
+            return "cart"
+        if cell == (10, 1):
+            return "cashier"
+        return "floor"
+
+    def test_items_created_once(self):
+        """Testa se os itens são criados uma vez e um redesenho sem mudanças não altera nada."""
+        self.assertEqual(self.canvas.count("rectangle"), 121)
+        self.assertEqual(self.canvas.count("text"), 121)
+        self.canvas.configured.clear()
+        self.renderer.render()
+        self.assertEqual(self.canvas.configured, [])
+        self.assertEqual(self.canvas.count("rectangle"), 121)
+
+    def test_only_dirty_cells_are_updated(self):
+        """Testa se mover o carrinho reconfigura apenas as duas células envolvidas."""
+        self.canvas.configured.clear()
+        previous, self.cart = self.cart, (5, 5)
+        self.renderer.update_cells((previous, self.cart))
+        self.assertEqual(len(self.canvas.configured), 4)  # retângulo e texto de cada célula
+        self.canvas.configured.clear()
+        self.renderer.render()
+        self.assertEqual(self.canvas.configured, [])
+
+    def test_viewport_culling_and_pan(self):
+        """Testa se um grid grande cria itens apenas para o viewport e se o pan remapeia células."""
+        canvas = RecordingCanvas()
+        renderer = GridRenderer(canvas, 500, 500, cell_size=20, view_width=400, view_height=300)
+        renderer.render(lambda cell: "cart" if cell == (100, 100) else "floor")
+        self.assertEqual(renderer.view_size, (15, 20))
+        self.assertEqual(canvas.count("rectangle"), 300)
+        self.assertEqual(renderer.cell_at(15, 15), (0, 0))
+
+        self.assertTrue(renderer.pan(95, 95))
+        self.assertEqual(renderer.cell_at(15 + 5 * 20, 15 + 5 * 20), (100, 100))
+        self.assertEqual(canvas.count("rectangle"), 300)
+        self.assertTrue(renderer.pan(-1000, -1000))
+        self.assertFalse(renderer.pan(-1, 0))
+        self.assertEqual(renderer.origin, (0, 0))
+
+    def test_zoom_keeps_anchor_visible(self):
+        """Testa se o zoom ajusta a quantidade de slots e mantém a âncora no viewport."""
+        canvas = RecordingCanvas()
+        renderer = GridRenderer(canvas, 100, 100, cell_size=10, view_width=200, view_height=200)
+        renderer.render(lambda cell: "floor")
+        self.assertTrue(renderer.zoom(2, anchor=(50, 50)))
+        self.assertEqual(renderer.view_size, (10, 10))
+        self.assertEqual(canvas.count("rectangle"), 100)
+        self.assertIsNotNone(renderer.cell_center((50, 50)))
+
+    def test_path_overlay_is_incremental(self):
+        """Testa se avançar a animação cria só os novos segmentos do caminho."""
+        path = [(0, 0), (1, 0), (2, 0), (3, 0)]
+        self.renderer.set_path(path, 1)
+        self.assertEqual(self.canvas.count("line"), 1)
+        first_line = next(item for item, value in self.canvas.items.items() if value[0] == "line")
+        self.renderer.set_path(path, 3)
+        self.assertEqual(self.canvas.count("line"), 3)
+        self.assertIn(first_line, self.canvas.items)
+        self.renderer.clear_path()
+        self.assertEqual(self.canvas.count("line"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
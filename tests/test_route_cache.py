@@ -0,0 +1,78 @@
+"""
+Testes para o cache LRU de rotas.
+"""
+import unittest
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.market_graph import MarketGraph
+from src.algorithms.bfs import bfs
+from src.algorithms.route_cache import RouteCache
+
+
+class TestRouteCache(unittest.TestCase):
+    """Classe de teste para o RouteCache."""
+
+    def setUp(self):
+        """Configura um grid 5x5 e um cache pequeno."""
+        self.graph = MarketGraph.from_grid(5, 5)
+        self.goals = {(4, 1), (4, 3)}
+        self.cache = RouteCache(cols=5, maxsize=2)
+        self.computed = 0
+
+    def route(self, start):
+        """Consulta o cache, contando quantas buscas foram realmente feitas."""
+        def compute():
+            self.computed += 1
+            return bfs(self.graph, start, self.goals)
+        return self.cache.get_or_compute(start, self.goals, self.graph.version, compute)
+
+    def test_hit_returns_same_route(self):
+        """Testa se a segunda consulta é respondida pelo cache com o mesmo caminho."""
+        first = self.route((0, 0))
+        second = self.route((0, 0))
+        self.assertEqual(first, second)
+        self.assertEqual(self.computed, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_lru_eviction(self):
+        """Testa se a rota menos usada recentemente é removida quando o cache enche."""
+        self.route((0, 0))
+        self.route((0, 4))
+        self.route((0, 0))  # (0, 0) passa a ser a mais recente
+        self.route((2, 2))  # remove (0, 4)
+        self.assertEqual(self.cache.evictions, 1)
+        self.route((0, 0))
+        self.assertEqual(self.computed, 3)
+        self.route((0, 4))
+        self.assertEqual(self.computed, 4)
+
+    def test_layout_change_invalidates(self):
+        """Testa se mudar o layout ou os caixas impede o uso de rotas antigas."""
+        self.route((0, 0))
+        self.graph.block_cell((1, 0))
+        path, _ = self.route((0, 0))
+        self.assertEqual(self.computed, 2)
+        self.assertNotIn((1, 0), path)
+        self.assertEqual(self.cache.invalidations, 1)
+        self.goals = {(4, 0)}
+        self.route((0, 0))
+        self.assertEqual(self.computed, 3)
+
+    def test_compact_storage_and_missing_route(self):
+        """Testa a codificação por ids e o cache de consultas sem caminho."""
+        cells = self.cache.encode([(0, 0), (1, 0), (1, 1)])
+        self.assertEqual(list(cells), [0, 5, 6])
+        self.assertEqual(self.cache.decode(cells), [(0, 0), (1, 0), (1, 1)])
+        self.goals = {(9, 9)}
+        self.assertEqual(self.route((0, 0)), (None, None))
+        self.assertEqual(self.route((0, 0)), (None, None))
+        self.assertEqual(self.computed, 1)
+        self.assertEqual(self.cache.stats()["hit_rate"], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Testes para o índice de rotas pré-calculado a partir dos caixas.
+"""
+import unittest
+import random
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.market_graph import MarketGraph
+from src.algorithms.bfs import bfs
+from src.algorithms.routing_index import RoutingIndex
+
+
+def build_grid(rows, cols, blocked=()):
+    """Cria um MarketGraph em grid, 4-conectado, sem os vértices bloqueados."""
+    graph = MarketGraph()
+    for i in range(rows):
+        for j in range(cols):
+            if (i, j) in blocked:
+                continue
+            graph.add_vertex((i, j))
+            if i < rows - 1 and (i + 1, j) not in blocked:
+                graph.add_edge((i, j), (i + 1, j))
+            if j < cols - 1 and (i, j + 1) not in blocked:
+                graph.add_edge((i, j), (i, j + 1))
+    return graph
+
+
+def reconnect(graph, vertex, rows, cols):
+    """Reinsere vertex no grafo ligando-o aos vizinhos livres do grid."""
+    graph.add_vertex(vertex)
+    i, j = vertex
+    for neighbor in ((i - 1, j), (i, j - 1), (i + 1, j), (i, j + 1)):
+        if 0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols and neighbor in graph.graph:
+            graph.add_edge(vertex, neighbor)
+
+
+class TestRoutingIndex(unittest.TestCase):
+    """Classe de teste para o RoutingIndex."""
+
+    def setUp(self):
+        """Configura um grid 6x6 com caixas na última linha."""
+        self.graph = build_grid(6, 6, blocked={(2, 1), (2, 2), (2, 3)})
+        self.cashiers = [(5, 1), (5, 4)]
+        self.index = RoutingIndex(self.graph, self.cashiers)
+
+    def assert_matches_bfs(self, index, graph, cashiers):
+        """Verifica se todas as distâncias e rotas do índice coincidem com o BFS."""
+        for vertex in graph.get_vertices():
+            path, cashier = bfs(graph, vertex, cashiers)
+            route, target = index.route(vertex)
+            if path is None:
+                self.assertIsNone(route)
+                continue
+            self.assertEqual(len(route), len(path))
+            self.assertEqual(index.steps_to_cashier(vertex), len(path) - 1)
+            self.assertEqual(route[-1], target)
+            self.assertIn(target, cashiers)
+            for current, following in zip(route, route[1:]):
+                self.assertIn(following, graph.get_neighbors(current))
+
+    def test_route_matches_bfs(self):
+        """Testa se as rotas do índice têm o mesmo número de passos do BFS."""
+        self.assert_matches_bfs(self.index, self.graph, self.cashiers)
+
+    def test_nearest_cashier(self):
+        """Testa a consulta O(1) do caixa mais próximo."""
+        self.assertEqual(self.index.nearest_cashier((4, 0)), (5, 1))
+        self.assertEqual(self.index.nearest_cashier((4, 5)), (5, 4))
+        self.assertIsNone(self.index.nearest_cashier((2, 2)))
+
+    def test_rebuild_on_layout_change(self):
+        """Testa se o índice é reconstruído quando o grafo ou os caixas mudam."""
+        self.assertFalse(self.index.sync())
+        self.graph.add_edge((0, 0), (5, 5))
+        self.assertTrue(self.index.sync())
+        self.assertEqual(self.index.steps_to_cashier((0, 0)), 2)
+        self.assertTrue(self.index.sync(cashiers=[(0, 5)]))
+        self.assertEqual(self.index.nearest_cashier((5, 1)), (0, 5))
+
+    def test_local_repair_matches_rebuild(self):
+        """Testa se reparos locais após bloquear/liberar células equivalem a reconstruir."""
+        rng = random.Random(42)
+        rows, cols = 8, 8
+        cashiers = [(7, 1), (7, 4), (7, 6)]
+        graph = build_grid(rows, cols)
+        index = RoutingIndex(graph, cashiers)
+        blocked = set()
+        for _ in range(60):
+            vertex = (rng.randrange(rows), rng.randrange(cols))
+            if vertex in cashiers:
+                continue
+            if vertex in blocked:
+                blocked.discard(vertex)
+                reconnect(graph, vertex, rows, cols)
+                index.cell_unblocked(vertex)
+            else:
+                blocked.add(vertex)
+                neighbors = graph.remove_vertex(vertex)
+                index.cell_blocked(vertex, neighbors)
+            self.assertFalse(index.sync())
+            self.assertEqual(index.distance, RoutingIndex(graph, cashiers).distance)
+        self.assert_matches_bfs(index, graph, cashiers)
+
+
+if __name__ == '__main__':
+    unittest.main()
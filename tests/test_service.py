@@ -0,0 +1,176 @@
+"""
+Testes para o serviço local de rotas (asyncio).
+"""
+import unittest
+import asyncio
+import json
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.layout import MarketLayout
+from src.data.market_graph import MarketGraph
+from src.algorithms.bfs import bfs
+from src.service.server import RouteServer, RouteService
+
+
+class TestRouteService(unittest.IsolatedAsyncioTestCase):
+    """Classe de teste para o RouteService e o RouteServer."""
+
+    def setUp(self):
+        """Configura um mercado 11x11 padrão, sem obstáculos aleatórios."""
+        self.layout = MarketLayout(11, 11)
+        self.graph = self.layout.build_graph()
+        self.service = RouteService.from_layout(self.layout)
+
+    def tearDown(self):
+        self.service.close()
+
+    async def test_identical_queries_are_coalesced(self):
+        """Testa que consultas idênticas simultâneas geram um único cálculo."""
+        results = await asyncio.gather(*(self.service.route((0, 0)) for _ in range(20)))
+        self.assertEqual(len({(version, tuple(path)) for version, path, _ in results}), 1)
+        self.assertEqual(self.service.stats["queries"], 20)
+        self.assertEqual(self.service.stats["coalesced"], 19)
+        self.assertEqual(self.service.stats["computations"], 1)
+
+    async def test_queries_in_same_window_share_one_field(self):
+        """Testa que inícios diferentes na mesma janela são resolvidos com um só campo, como o BFS."""
+        starts = self.layout.free_cells()[:15]
+        results = await asyncio.gather(*(self.service.route(start) for start in starts))
+        self.assertEqual(self.service.stats["batches"], 1)
+        self.assertEqual(self.service.stats["computations"], 1)
+        for start, (version, path, cashier) in zip(starts, results):
+            expected, _ = bfs(self.graph, start, self.layout.cashiers)
+            self.assertEqual(version, 0)
+            self.assertEqual(path[0], start)
+            self.assertEqual(path[-1], cashier)
+            self.assertEqual(len(path), len(expected))
+
+    async def test_engines_agree(self):
+        """Testa que os mecanismos individuais encontram rotas do mesmo tamanho do campo."""
+        _, path, _ = await self.service.route((0, 0))
+        for engine in ("bfs", "astar", "jps"):
+            _, other, _ = await self.service.route((0, 0), engine=engine)
+            self.assertEqual(len(other), len(path))
+        with self.assertRaises(ValueError):
+            await self.service.route((0, 0), engine="desconhecido")
+
+    async def test_versioned_atomic_update(self):
+        """Testa a criação de versões, a verificação de versão esperada e a atualização tudo-ou-nada."""
+        _, path, _ = await self.service.route((0, 0))
+        version = await self.service.update(block=[path[2]], expected_version=0)
+        self.assertEqual(version, 1)
+        new_version, new_path, _ = await self.service.route((0, 0))
+        self.assertEqual(new_version, 1)
+        self.assertNotIn(path[2], new_path)
+
+        with self.assertRaises(ValueError):
+            await self.service.update(block=[(0, 10)], expected_version=0)
+        with self.assertRaises(ValueError):
+            await self.service.update(block=[(0, 10), (99, 99)])
+        with self.assertRaises(ValueError):
+            await self.service.update(block=[self.layout.cashiers[0]])
+        self.assertEqual(self.service.version, 1)
+        _, path_after, _ = await self.service.route((0, 10))  # (0, 10) continua livre
+        self.assertIsNotNone(path_after)
+
+    async def test_inflight_queries_keep_their_version(self):
+        """Testa que uma consulta feita antes da atualização responde com a versão antiga."""
+        _, expected, _ = await self.service.route((0, 0))
+        query = asyncio.ensure_future(self.service.route((0, 0)))
+        await asyncio.sleep(0)
+        await self.service.update(block=[expected[1]])
+        version, path, _ = await query
+        self.assertEqual(version, 0)
+        self.assertEqual(path, expected)
+        version, path, _ = await self.service.route((0, 0))
+        self.assertEqual(version, 1)
+        self.assertNotIn(expected[1], path)
+
+    async def test_wraps_market_graph(self):
+        """Testa o serviço criado diretamente de um MarketGraph."""
+        graph = MarketGraph.from_grid(5, 5, {(2, 0), (2, 1), (2, 2), (2, 3)})
+        service = RouteService(graph, [(4, 0)], grid_size=(5, 5))
+        try:
+            _, path, cashier = await service.route((0, 0))
+            self.assertEqual(cashier, (4, 0))
+            self.assertEqual(len(path) - 1, 12)
+        finally:
+            service.close()
+
+    async def test_tcp_protocol(self):
+        """Testa o protocolo JSON por linha em localhost, incluindo erros."""
+        server = RouteServer(self.service, port=0)
+        await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        try:
+            requests = [
+                {"id": 1, "op": "route", "start": [0, 0]},
+                {"id": 2, "op": "route", "start": [0, 0], "engine": "jps"},
+                {"id": 3, "op": "route"},
+                {"id": 4, "op": "voar"},
+                {"id": 5, "op": "stats"},
+                {"id": 6, "op": "layout", "ascii": 5},
+                {"id": 7, "op": "route", "start": [1.5, 0]},
+                {"id": 8, "op": "route", "start": [True, 0]},
+            ]
+            for request in requests:
+                writer.write(json.dumps(request).encode() + b"\n")
+            writer.write(b"isto nao e json\n")
+            await writer.drain()
+            responses = {}
+            for _ in range(len(requests) + 1):
+                response = json.loads(await asyncio.wait_for(reader.readline(), 5))
+                responses[response["id"]] = response
+        finally:
+            writer.close()
+            await server.close()
+
+        self.assertEqual(responses[1]["version"], 0)
+        self.assertEqual(responses[1]["path"][0], [0, 0])
+        self.assertEqual(responses[1]["steps"], responses[2]["steps"])
+        self.assertIn("start", responses[3]["error"])
+        self.assertIn("error", responses[4])
+        self.assertIn("queries", responses[5])
+        self.assertIn("error", responses[None])
+        self.assertIn("ascii", responses[6]["error"])
+        self.assertIn("inválida", responses[7]["error"])
+        self.assertIn("inválida", responses[8]["error"])
+
+    async def test_large_layout_and_oversized_lines(self):
+        """Testa plantas maiores que 64 KiB e que uma linha acima do limite recebe erro sem derrubar a conexão."""
+        server = RouteServer(self.service, port=0)
+        await server.start()
+        small = RouteServer(self.service, port=0, limit=1024)
+        await small.start()
+        ascii_map = "\n".join("." * 299 + "C" for _ in range(300))
+        layout_request = json.dumps({"id": 1, "op": "layout", "ascii": ascii_map}).encode() + b"\n"
+        self.assertGreater(len(layout_request), 64 * 1024)
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            writer.write(layout_request)
+            await writer.drain()
+            response = json.loads(await asyncio.wait_for(reader.readline(), 10))
+            self.assertEqual(response, {"id": 1, "version": 1})
+            writer.close()
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", small.port)
+            writer.write(layout_request + b'{"id": 2, "op": "stats"}\n')
+            await writer.drain()
+            first = json.loads(await asyncio.wait_for(reader.readline(), 10))
+            second = json.loads(await asyncio.wait_for(reader.readline(), 10))
+            writer.close()
+        finally:
+            await server.close()
+            await small.close()
+        self.assertIsNone(first["id"])
+        self.assertIn("limite", first["error"])
+        self.assertEqual(second["id"], 2)
+        self.assertEqual(second["version"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
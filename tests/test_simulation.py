@@ -0,0 +1,114 @@
+"""
+Testes para o núcleo de simulação sem interface gráfica.
+"""
+import unittest
+import random
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.layout import MarketLayout
+from src.simulation.engine import Simulation, TickStats, percentile, poisson, QUEUED, SERVING, FREE
+
+
+class RecordingViewer:
+    """Observador que guarda os instantâneos recebidos."""
+
+    def __init__(self):
+        self.snapshots = []
+
+    def simulation_snapshot(self, snapshot):
+        self.snapshots.append(snapshot)
+
+
+class TestSimulation(unittest.TestCase):
+    """Classe de teste para a simulação."""
+
+    def setUp(self):
+        """Configura um mercado 11x11 padrão com duas empilhadeiras."""
+        self.layout = MarketLayout.random(11, 11, density=0.05, n_forklifts=2, rng=random.Random(1))
+
+    def test_carts_are_served(self):
+        """Testa que carrinhos entram, chegam aos caixas e são atendidos."""
+        simulation = Simulation(self.layout, arrival_rate=0.5, service_time=2, seed=3)
+        simulation.run(300)
+        summary = simulation.summary()
+        self.assertGreater(summary["served"], 50)
+        self.assertEqual(summary["tick"], 300)
+        self.assertEqual(summary["spawned"], summary["served"] + summary["active"])
+        self.assertGreater(summary["trip_ticks_mean"], 0)
+        self.assertGreaterEqual(summary["tick_ms_p95"], summary["tick_ms_p50"])
+
+    def test_state_is_consistent(self):
+        """Testa contagens por célula, filas e que empilhadeiras nunca ocupam carrinhos."""
+        simulation = Simulation(self.layout, arrival_rate=1.0, service_time=3, max_carts=40, seed=5)
+        for _ in range(200):
+            simulation.step()
+            counts = [0] * (simulation.rows * simulation.cols)
+            for slot in range(simulation.max_carts):
+                if simulation.state[slot] != FREE:
+                    counts[simulation.position[slot]] += 1
+            self.assertEqual(counts, list(simulation._cart_count))
+            for i, j in simulation.forklifts:
+                self.assertEqual(counts[i * simulation.cols + j], 0)
+                self.assertNotIn((i, j), simulation.graph.graph)
+            for index, queue in enumerate(simulation.queues):
+                for slot in queue:
+                    self.assertEqual(simulation.state[slot], QUEUED)
+                if simulation.serving[index] >= 0:
+                    self.assertEqual(simulation.state[simulation.serving[index]], SERVING)
+        self.assertLessEqual(simulation.summary()["active"], 40)
+
+    def test_many_carts_on_one_cell(self):
+        """Testa a contagem por célula acima de 65 535 carrinhos (fila longa em um caixa)."""
+        carts = 70000
+        simulation = Simulation(self.layout, arrival_rate=0, max_carts=carts, forklift_interval=0)
+        cashier = simulation.cashiers[0]
+        start = next(cell for cell in simulation._spawn_cells
+                     if simulation.routing_index.next_hop.get(cell) == cashier)
+        simulation._spawn_cells = [start]
+        simulation._spawn(carts, TickStats(0))
+        self.assertEqual(simulation._cart_count[start[0] * simulation.cols + start[1]], carts)
+        simulation.step()
+        self.assertEqual(simulation._cart_count[cashier[0] * simulation.cols + cashier[1]], carts)
+        self.assertEqual(sum(len(queue) for queue in simulation.queues), carts - 1)
+
+    def test_deterministic_with_seed(self):
+        """Testa que a mesma semente gera a mesma simulação."""
+        first = Simulation(self.layout, arrival_rate=0.7, seed=9)
+        second = Simulation(self.layout, arrival_rate=0.7, seed=9)
+        first.run(100)
+        second.run(100)
+        self.assertEqual(first.forklifts, second.forklifts)
+        self.assertEqual(list(first.position), list(second.position))
+        self.assertEqual(first.total_served, second.total_served)
+
+    def test_snapshots(self):
+        """Testa que observadores recebem um instantâneo por tick até cancelarem a inscrição."""
+        simulation = Simulation(self.layout, arrival_rate=1.0, seed=2)
+        viewer = RecordingViewer()
+        simulation.subscribe(viewer)
+        simulation.run(5)
+        forklifts = set(simulation.forklifts)
+        simulation.unsubscribe(viewer)
+        simulation.run(5)
+        self.assertEqual([snapshot.tick for snapshot in viewer.snapshots], [1, 2, 3, 4, 5])
+        last = viewer.snapshots[-1]
+        self.assertEqual(last.forklifts, forklifts)
+        self.assertEqual(len(last.queues), len(self.layout.cashiers))
+        self.assertEqual(last.stats.tick, 5)
+
+    def test_helpers(self):
+        """Testa o percentil e a média das chegadas de Poisson."""
+        self.assertEqual(percentile([], 0.95), 0)
+        self.assertEqual(percentile(list(range(1, 101)), 0.95), 95)
+        rng = random.Random(0)
+        for mean in (0.5, 4, 70):
+            samples = [poisson(rng, mean) for _ in range(3000)]
+            self.assertAlmostEqual(sum(samples) / len(samples), mean, delta=mean * 0.1 + 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Testes para a varredura Monte Carlo de layouts.
+"""
+import unittest
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.layout import MarketLayout
+from src.data.layout_io import CellLayout
+from src.simulation.sweep import SweepStats, iter_sweep, run_sweep
+
+
+class TestSweep(unittest.TestCase):
+    """Classe de teste para a varredura de layouts."""
+
+    def setUp(self):
+        """Usa o mercado padrão 11x11 como planta base."""
+        self.layout = MarketLayout(11, 11)
+
+    def test_serial_sweep(self):
+        """Testa os totais e o resumo de uma varredura no próprio processo."""
+        stats = run_sweep(self.layout, 60, carts_per_layout=10, workers=1, chunk_size=25)
+        self.assertEqual(stats.layouts, 60)
+        self.assertEqual(stats.carts, 600)
+        self.assertEqual(sum(stats.cashier_load) + stats.unreachable, 600)
+        summary = stats.as_dict(self.layout.cashiers)
+        self.assertLessEqual(summary["p50_steps"], summary["p95_steps"])
+        self.assertLessEqual(summary["p95_steps"], summary["max_steps"])
+        self.assertEqual(len(summary["cashier_load"]), 5)
+
+    def test_results_do_not_depend_on_chunks_or_workers(self):
+        """Testa que sementes por layout tornam o resultado independente da divisão do trabalho."""
+        serial = run_sweep(self.layout, 40, carts_per_layout=5, workers=1, chunk_size=40)
+        chunked = run_sweep(self.layout, 40, carts_per_layout=5, workers=1, chunk_size=7)
+        pooled = run_sweep(CellLayout.from_market_layout(self.layout), 40, carts_per_layout=5,
+                           workers=2, chunk_size=9)
+        for other in (chunked, pooled):
+            self.assertEqual(other.as_dict(), serial.as_dict())
+            self.assertEqual(other.steps, serial.steps)
+
+    def test_streams_partial_results(self):
+        """Testa que o agregado é devolvido a cada bloco concluído."""
+        counts = [stats.layouts for stats in iter_sweep(self.layout, 50, carts_per_layout=2, workers=1,
+                                                        chunk_size=20)]
+        self.assertEqual(counts, [20, 40, 50])
+
+    def test_stats_percentiles(self):
+        """Testa média e percentis calculados a partir do histograma."""
+        stats = SweepStats(2)
+        stats.carts = 11
+        stats.unreachable = 1
+        stats.steps.update({1: 5, 10: 5})
+        self.assertEqual(stats.mean_steps(), 5.5)
+        self.assertEqual(stats.percentile(0.5), 1)
+        self.assertEqual(stats.percentile(0.95), 10)
+        other = SweepStats(2)
+        other.carts = 1
+        other.steps[3] = 1
+        other.cashier_load = [1, 0]
+        stats.merge(other)
+        self.assertEqual(stats.carts, 12)
+        self.assertEqual(stats.cashier_load, [1, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Testes para a busca ponderada (Dijkstra/A*) com tempo de espera nos caixas.
+"""
+import unittest
+import random
+import sys
+import os
+
+# Adiciona o diretório raiz do projeto ao caminho Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.data.market_graph import MarketGraph
+from src.algorithms.bfs import bfs
+from src.algorithms.weighted import LazyPriorityQueue, dijkstra, astar, manhattan_heuristic
+
+
+class TestWeighted(unittest.TestCase):
+    """Classe de teste para Dijkstra, A* e a fila de prioridade."""
+
+    def setUp(self):
+        """Configura um grid 5x5 com dois caixas na última linha."""
+        self.graph = MarketGraph.from_grid(5, 5, {(2, 1), (2, 2), (2, 3)})
+        self.cashiers = [(4, 0), (4, 4)]
+
+    def test_lazy_priority_queue(self):
+        """Testa a redução de prioridade e o descarte de entradas obsoletas."""
+        queue = LazyPriorityQueue()
+        self.assertTrue(queue.push("a", 5))
+        self.assertTrue(queue.push("b", 3))
+        self.assertTrue(queue.push("a", 1))
+        self.assertFalse(queue.push("b", 4))
+        self.assertEqual(len(queue), 2)
+        self.assertEqual(queue.pop(), ("a", 1))
+        self.assertFalse(queue.push("a", 0))
+        self.assertEqual(queue.pop(), ("b", 3))
+        self.assertFalse(queue)
+        with self.assertRaises(IndexError):
+            queue.pop()
+
+    def test_uniform_costs_match_bfs(self):
+        """Testa se, sem custos nem filas, os passos são os mesmos do BFS."""
+        for vertex in self.graph.get_vertices():
+            path, _ = bfs(self.graph, vertex, self.cashiers)
+            for search in (dijkstra, astar):
+                route, cashier, total = search(self.graph, vertex, self.cashiers)
+                self.assertEqual(total, len(path) - 1)
+                self.assertEqual(len(route), len(path))
+                self.assertEqual(route[-1], cashier)
+
+    def test_wait_time_changes_target(self):
+        """Testa se uma fila longa no caixa mais próximo faz a rota escolher outro caixa."""
+        start = (3, 0)
+        _, cashier, total = dijkstra(self.graph, start, self.cashiers)
+        self.assertEqual((cashier, total), ((4, 0), 1))
+
+        waits = {(4, 0): 10, (4, 4): 2}
+        for search in (dijkstra, astar):
+            path, cashier, total = search(self.graph, start, self.cashiers, wait_times=waits)
+            self.assertEqual(cashier, (4, 4))
+            self.assertEqual(total, 5 + 2)
+            self.assertEqual(path[0], start)
+
+    def test_cell_costs_avoid_congestion(self):
+        """Testa se corredores congestionados são contornados quando compensa."""
+        costs = {(1, 0): 20, (3, 0): 20}
+        path, cashier, total = astar(self.graph, (0, 0), [(4, 0)], cell_costs=costs)
+        self.assertNotIn((1, 0), path)
+        self.assertEqual(total, dijkstra(self.graph, (0, 0), [(4, 0)], cell_costs=costs)[2])
+
+    def test_random_costs_astar_matches_dijkstra(self):
+        """Testa se o A* encontra o mesmo custo ótimo do Dijkstra com custos aleatórios."""
+        rng = random.Random(3)
+        graph = MarketGraph.from_grid(12, 12, {(rng.randrange(12), rng.randrange(12)) for _ in range(25)})
+        vertices = graph.get_vertices()
+        costs = {vertex: rng.choice((0.5, 1, 2, 5)) for vertex in vertices}
+        goals = rng.sample(vertices, 3)
+        waits = {goal: rng.randrange(10) for goal in goals}
+        for start in rng.sample(vertices, 20):
+            expected = dijkstra(graph, start, goals, costs, waits)[2]
+            self.assertEqual(astar(graph, start, goals, costs, waits)[2], expected)
+
+    def test_heuristic_is_admissible(self):
+        """Testa se a heurística nunca supera o custo real."""
+        waits = {(4, 0): 3, (4, 4): 0}
+        heuristic = manhattan_heuristic(self.cashiers, waits)
+        for vertex in self.graph.get_vertices():
+            _, _, total = dijkstra(self.graph, vertex, self.cashiers, wait_times=waits)
+            self.assertLessEqual(heuristic(vertex), total)
+
+    def test_unreachable(self):
+        """Testa o retorno quando nenhum caixa é alcançável."""
+        self.assertEqual(astar(self.graph, (0, 0), [(9, 9)]), (None, None, None))
+        self.assertEqual(dijkstra(self.graph, (0, 0), []), (None, None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()